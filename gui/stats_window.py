@@ -3,8 +3,13 @@
 """
 
 import os
+import re
 import ast
+import codecs
+import bisect
 import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import pandas as pd
 import matplotlib.pyplot as plt
 # Используем Agg backend для совместимости
@@ -14,15 +19,34 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import numpy as np
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                               QPushButton, QLabel, QTabWidget, QTableWidget,
-                               QTableWidgetItem, QTextEdit)
-from PySide6.QtCore import Qt, QThread, Signal
+                               QPushButton, QLabel, QTabWidget, QTableView,
+                               QHeaderView, QTextEdit)
+from PySide6.QtCore import Qt, QThread, Signal, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QFont
 
 from utils import read_gitignore, is_ignored
 
 IGNORED_DIRS = {'.git', '__pycache__', '.idea', '.vscode', '.venv', '.eggs'}
 
+# Минимальное количество файлов, при котором разбор импортов выносится в процессы
+PARALLEL_MIN_FILES = 64
+
+# Количество файлов в одной задаче рабочего процесса
+PARALLEL_CHUNK_SIZE = 64
+
+# Строки импорта (в начале строки или после ';' / ':'): группа 1 - модуль from, группа 2 - имена import
+IMPORT_RE = re.compile(
+    rb'(?:^|[;:])[ \t]*(?:from(?:[ \t]+|(?=\.))([^ \t\r\n]+)[ \t]+import\b|import[ \t]+([^\r\n#;]+))',
+    re.M
+)
+
+# Ограничители многострочных строк: импорт внутри них (пример в docstring) требует AST
+TRIPLE_QUOTE_RE = re.compile(rb'"""|\'\'\'')
+
+# Перечисления PySide6 разрешаются медленно, а data() вызывается для каждой ячейки
+_DISPLAY_ROLE = Qt.DisplayRole
+_HORIZONTAL = Qt.Horizontal
+
 
 # =========================
 # СТАНДАРТНЫЕ ФУНКЦИИ ДЛЯ ИМПОРТА
@@ -66,10 +90,154 @@ def analyze_project_structure(directory, task_queue):
     task_queue.put(('project_stats', structure))
 
 
-def parse_python_files(projects_dir, export=True, max_files=5000, max_depth=6):
-    """Парсинг Python файлов - функция для импорта из main.py"""
+def _dotted_top_level(name):
+    """Первый сегмент точечного имени модуля или None, если имя некорректно"""
+    parts = name.split('.')
+    if all(part.isidentifier() for part in parts):
+        return parts[0]
+    return None
+
+
+def _triple_quoted_spans(data):
+    """Отсортированные границы (начало, конец) многострочных строк файла"""
+    starts, ends = [], []
+    opened = None
+    for match in TRIPLE_QUOTE_RE.finditer(data):
+        if opened is None:
+            opened = match.group()
+            starts.append(match.start())
+        elif match.group() == opened:
+            opened = None
+            ends.append(match.end())
+    if opened is not None:
+        ends.append(len(data))
+    return starts, ends
+
+
+def _regex_top_level_imports(data, errors='strict'):
+    """
+    Импорты файла по строкам IMPORT_RE без построения AST
+    
+    Возвращает None, если найденная строка импорта не разбирается
+    (например, текст внутри строкового литерала или комментария) - тогда нужен AST.
+    """
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+    
+    libs = set()
+    spans = None
+    for match in IMPORT_RE.finditer(data):
+        if spans is None:
+            spans = _triple_quoted_spans(data)
+        starts, ends = spans
+        i = bisect.bisect_right(starts, match.start()) - 1
+        if i >= 0 and match.start() < ends[i]:
+            return None
+        
+        # Совпадение после ':' или ';' может оказаться в комментарии или строке
+        line_start = data.rfind(b'\n', 0, match.start()) + 1
+        prefix = data[line_start:match.start()]
+        if b'#' in prefix or prefix.count(b'"') % 2 or prefix.count(b"'") % 2:
+            return None
+        
+        module, names = match.groups()
+        if module is not None:
+            module = module.decode('utf-8', errors).lstrip('.')
+            if not module:
+                # Относительный импорт "from . import x" модуль не указывает
+                continue
+            lib = _dotted_top_level(module)
+            if lib is None:
+                return None
+            libs.add(lib)
+            continue
+        
+        for item in names.split(b','):
+            tokens = item.decode('utf-8', errors).split()
+            if len(tokens) == 3 and tokens[1] == 'as' and tokens[2].isidentifier():
+                tokens = tokens[:1]
+            if len(tokens) != 1:
+                return None
+            lib = _dotted_top_level(tokens[0])
+            if lib is None:
+                return None
+            libs.add(lib)
+    return libs
+
+
+def _file_top_level_imports(file_path, errors='strict', identifiers_only=False, strict=False):
+    """
+    Имена верхнего уровня модулей, импортируемых файлом (пусто при ошибке чтения/разбора)
+    
+    По умолчанию импорты ищутся регулярным выражением по строкам, а AST строится
+    только для сомнительных файлов; strict=True всегда использует AST.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if errors == 'strict':
+            data.decode('utf-8')
+    except Exception:
+        return set()
+    
+    if not strict:
+        libs = _regex_top_level_imports(data, errors)
+        if libs is not None:
+            return libs
+    
+    libs = set()
+    try:
+        tree = ast.parse(data.decode('utf-8', errors), filename=file_path)
+    except Exception:
+        return libs
+    
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            lib = name.split('.')[0]
+            if not identifiers_only or (lib and lib.isidentifier()):
+                libs.add(lib)
+    return libs
+
+
+def _imports_chunk(file_paths, errors, identifiers_only, strict):
+    """Задача рабочего процесса: импорты группы файлов"""
+    return [_file_top_level_imports(path, errors, identifiers_only, strict) for path in file_paths]
+
+
+def _collect_imports(file_paths, errors='strict', identifiers_only=False, strict=False):
+    """
+    Импорты файлов в исходном порядке
+    
+    Разбор AST ограничен GIL, поэтому большие наборы файлов делятся на группы
+    и разбираются в пуле процессов; при недоступности пула - последовательно.
+    """
+    workers = os.cpu_count() or 1
+    if len(file_paths) >= PARALLEL_MIN_FILES and workers > 1:
+        chunks = [file_paths[i:i + PARALLEL_CHUNK_SIZE]
+                  for i in range(0, len(file_paths), PARALLEL_CHUNK_SIZE)]
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                results = executor.map(_imports_chunk, chunks, repeat(errors),
+                                       repeat(identifiers_only), repeat(strict))
+                return [libs for chunk in results for libs in chunk]
+        except Exception as e:
+            print(f"⚠ Параллельный разбор недоступен, выполняю последовательно: {e}")
+    
+    return _imports_chunk(file_paths, errors, identifiers_only, strict)
+
+
+def parse_python_files(projects_dir, export=True, max_files=5000, max_depth=6, strict=False):
+    """Парсинг Python файлов - функция для импорта из main.py (strict=True - разбор импортов через AST)"""
     project_stats = {}
     scanned_files = 0
+    # Пары (проект, файл) в порядке обхода; импорты разбираются после обхода
+    file_projects = []
 
     for root, dirs, files in os.walk(projects_dir):
         # Удаление игнорируемых директорий
@@ -115,22 +283,15 @@ def parse_python_files(projects_dir, export=True, max_files=5000, max_depth=6):
             if rel_dir != ".":
                 project_stats[project_name]["dirs"].add(rel_dir)
 
-            # Парсинг импортов
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                node = ast.parse(content, filename=file_path)
-                for sub_node in ast.walk(node):
-                    if isinstance(sub_node, ast.Import):
-                        for alias in sub_node.names:
-                            project_stats[project_name]["libs"].add(alias.name.split('.')[0])
-                    elif isinstance(sub_node, ast.ImportFrom) and sub_node.module:
-                        project_stats[project_name]["libs"].add(sub_node.module.split('.')[0])
-            except Exception:
-                continue
+            file_projects.append((project_name, file_path))
 
         print(f"[✓] {project_name} — {len(py_files)} файлов")
 
+    # Парсинг импортов
+    file_paths = [file_path for _, file_path in file_projects]
+    for (project_name, _), libs in zip(file_projects, _collect_imports(file_paths, strict=strict)):
+        project_stats[project_name]["libs"].update(libs)
+
     # Финальная сборка
     result = []
     for proj, data in project_stats.items():
@@ -230,12 +391,14 @@ class StatsWorker(QThread):
             
         return structure
     
-    def parse_python_files(self, projects_dir, export=True, max_files=5000, max_depth=6):
-        """Парсинг Python файлов"""
+    def parse_python_files(self, projects_dir, export=True, max_files=5000, max_depth=6, strict=False):
+        """Парсинг Python файлов (strict=True - разбор импортов через AST)"""
         self.progress_updated.emit("Парсинг Python файлов...")
         
         project_stats = {}
         scanned_files = 0
+        # Пары (проект, файл) в порядке обхода; импорты разбираются после обхода
+        file_projects = []
         
         for root, dirs, files in os.walk(projects_dir):
             # Удаление игнорируемых директорий
@@ -278,31 +441,53 @@ class StatsWorker(QThread):
                 except:
                     pass
                     
-                # Анализ импортов
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        tree = ast.parse(f.read(), filename=file_path)
-                        
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.Import):
-                            for alias in node.names:
-                                lib = alias.name.split('.')[0]
-                                if lib and lib.isidentifier():
-                                    project_stats[project_name]["libs"].add(lib)
-                        elif isinstance(node, ast.ImportFrom):
-                            if node.module:
-                                lib = node.module.split('.')[0]
-                                if lib and lib.isidentifier():
-                                    project_stats[project_name]["libs"].add(lib)
-                except:
-                    pass
+                file_projects.append((project_name, file_path))
                     
                 # Добавление директории
                 project_stats[project_name]["dirs"].add(os.path.dirname(file_path))
+        
+        # Анализ импортов
+        file_paths = [file_path for _, file_path in file_projects]
+        file_imports = _collect_imports(file_paths, errors='ignore', identifiers_only=True,
+                                        strict=strict)
+        for (project_name, _), libs in zip(file_projects, file_imports):
+            project_stats[project_name]["libs"].update(libs)
                 
         return project_stats
 
 
+class ImportsTableModel(QAbstractTableModel):
+    """Модель таблицы импортов: строки (место, библиотека, количество, процент)"""
+    
+    HEADERS = ['Место', 'Библиотека', 'Количество', 'Процент']
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+    
+    def set_rows(self, rows):
+        """Заменяет все строки модели одним сбросом"""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=_DISPLAY_ROLE):
+        if role == _DISPLAY_ROLE and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+    
+    def headerData(self, section, orientation, role=_DISPLAY_ROLE):
+        if role == _DISPLAY_ROLE and orientation == _HORIZONTAL:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+
 class StatsWindow(QMainWindow):
     """Окно статистики"""
     
@@ -322,6 +507,7 @@ class StatsWindow(QMainWindow):
         """Извлечение данных об импортах из project_data"""
         if not self.project_data:
             self.imports_count = {}
+            self.prepare_sorted_imports()
             return
             
         # Собираем все импорты из всех проектов
@@ -347,6 +533,26 @@ class StatsWindow(QMainWindow):
         # Подсчитываем количество каждого импорта
         from collections import Counter
         self.imports_count = dict(Counter(all_imports))
+        self.prepare_sorted_imports()
+        
+    def prepare_sorted_imports(self):
+        """
+        Однократная подготовка библиотек по убыванию количества импортов
+        
+        Таблица, обзор, графики и экспорт используют общие массивы вместо
+        повторных sorted() и sum() по словарю imports_count.
+        """
+        counts = np.fromiter(self.imports_count.values(), dtype=np.int64,
+                             count=len(self.imports_count))
+        # Устойчивая сортировка сохраняет порядок библиотек с равным количеством
+        order = np.argsort(-counts, kind='stable')
+        libraries = list(self.imports_count)
+        
+        self.total_imports = int(counts.sum())
+        self.sorted_libraries = [libraries[i] for i in order.tolist()]
+        self.sorted_counts = counts[order]
+        self.sorted_percentages = (self.sorted_counts / self.total_imports * 100
+                                   if self.total_imports else np.zeros(len(counts)))
         
     def init_ui(self):
         """Инициализация пользовательского интерфейса"""
@@ -498,12 +704,13 @@ class StatsWindow(QMainWindow):
         if not self.imports_count:
             return "Нет данных для анализа"
             
-        total_imports = sum(self.imports_count.values())
+        total_imports = self.total_imports
         unique_libraries = len(self.imports_count)
+        counts = self.sorted_counts
         
         # Топ-10 библиотек
-        sorted_imports = sorted(self.imports_count.items(), key=lambda x: x[1], reverse=True)
-        top_10 = sorted_imports[:10]
+        top_10 = list(zip(self.sorted_libraries[:10], counts[:10].tolist(),
+                          self.sorted_percentages[:10].tolist()))
         
         stats = f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -518,19 +725,18 @@ class StatsWindow(QMainWindow):
 🏆 ТОП-10 САМЫХ ПОПУЛЯРНЫХ БИБЛИОТЕК:
 """
         
-        for i, (lib, count) in enumerate(top_10, 1):
-            percentage = (count / total_imports) * 100
+        for i, (lib, count, percentage) in enumerate(top_10, 1):
             stats += f"   {i:2d}. {lib:<20} {count:>8,} импортов ({percentage:>5.1f}%)\n"
         
         stats += f"""
 📈 ДОПОЛНИТЕЛЬНАЯ ИНФОРМАЦИЯ:
-   • Библиотеки с 1 импортом: {sum(1 for count in self.imports_count.values() if count == 1):,}
-   • Библиотеки с 2-5 импортами: {sum(1 for count in self.imports_count.values() if 2 <= count <= 5):,}
-   • Библиотеки с 6-10 импортами: {sum(1 for count in self.imports_count.values() if 6 <= count <= 10):,}
-   • Библиотеки с 10+ импортами: {sum(1 for count in self.imports_count.values() if count > 10):,}
+   • Библиотеки с 1 импортом: {np.count_nonzero(counts == 1):,}
+   • Библиотеки с 2-5 импортами: {np.count_nonzero((counts >= 2) & (counts <= 5)):,}
+   • Библиотеки с 6-10 импортами: {np.count_nonzero((counts >= 6) & (counts <= 10)):,}
+   • Библиотеки с 10+ импортами: {np.count_nonzero(counts > 10):,}
 
 💡 РЕКОМЕНДАЦИИ:
-   • Самые используемые библиотеки: {', '.join(lib for lib, _ in top_10[:3])}
+   • Самые используемые библиотеки: {', '.join(self.sorted_libraries[:3])}
    • Рассмотрите возможность оптимизации импортов
    • Проверьте неиспользуемые зависимости
 """
@@ -603,9 +809,12 @@ class StatsWindow(QMainWindow):
         table_layout = QVBoxLayout(table_widget)
         
         # Таблица с данными
-        self.table = QTableWidget()
+        self.table_model = ImportsTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border: 1px solid #dee2e6;
                 border-radius: 5px;
@@ -657,11 +866,8 @@ class StatsWindow(QMainWindow):
         ax = fig.add_subplot(111)
         
         # Подготовка данных
-        sorted_imports = sorted(self.imports_count.items(), key=lambda x: x[1], reverse=True)
-        top_imports = sorted_imports[:15]  # Топ-15
-        
-        libraries = [item[0] for item in top_imports]
-        counts = [item[1] for item in top_imports]
+        libraries = self.sorted_libraries[:15]  # Топ-15
+        counts = self.sorted_counts[:15].tolist()
         
         # Создание графика
         bars = ax.bar(libraries, counts, color='#3498db', alpha=0.8)
@@ -693,16 +899,14 @@ class StatsWindow(QMainWindow):
         ax = fig.add_subplot(111)
         
         # Подготовка данных
-        sorted_imports = sorted(self.imports_count.items(), key=lambda x: x[1], reverse=True)
-        top_imports = sorted_imports[:10]  # Топ-10
+        libraries = self.sorted_libraries[:10]  # Топ-10
+        counts = self.sorted_counts[:10].tolist()
         
         # Группировка остальных
-        other_count = sum(count for _, count in sorted_imports[10:])
+        other_count = int(self.sorted_counts[10:].sum())
         if other_count > 0:
-            top_imports.append(('Остальные', other_count))
-        
-        libraries = [item[0] for item in top_imports]
-        counts = [item[1] for item in top_imports]
+            libraries.append('Остальные')
+            counts.append(other_count)
         
         # Цвета
         colors = plt.cm.Set3(np.linspace(0, 1, len(libraries)))
@@ -727,26 +931,13 @@ class StatsWindow(QMainWindow):
         if not self.imports_count:
             return
             
-        # Подготовка данных
-        sorted_imports = sorted(self.imports_count.items(), key=lambda x: x[1], reverse=True)
-        total_imports = sum(self.imports_count.values())
-        
-        # Настройка таблицы
-        self.table.setRowCount(len(sorted_imports))
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(['Место', 'Библиотека', 'Количество', 'Процент'])
-        
-        # Заполнение данных
-        for i, (lib, count) in enumerate(sorted_imports):
-            percentage = (count / total_imports) * 100
-            
-            self.table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
-            self.table.setItem(i, 1, QTableWidgetItem(lib))
-            self.table.setItem(i, 2, QTableWidgetItem(str(count)))
-            self.table.setItem(i, 3, QTableWidgetItem(f"{percentage:.1f}%"))
-            
-        # Автоматическая подгонка размеров
-        self.table.resizeColumnsToContents()
+        # Заполнение модели одним сбросом, ширина колонок задается заголовком
+        self.table_model.set_rows([
+            (str(i), lib, str(count), f"{percentage:.1f}%")
+            for i, (lib, count, percentage) in enumerate(
+                zip(self.sorted_libraries, self.sorted_counts.tolist(),
+                    self.sorted_percentages.tolist()), 1)
+        ])
         
     def populate_details(self):
         """Заполнение детальной информации"""
@@ -769,7 +960,7 @@ class StatsWindow(QMainWindow):
 📈 ОБЩАЯ ИНФОРМАЦИЯ:
 • Всего проектов: {len(project_list)}
 • Всего уникальных библиотек: {len(self.imports_count)}
-• Общее количество импортов: {sum(self.imports_count.values())}
+• Общее количество импортов: {self.total_imports}
 
 🏗️ АНАЛИЗ ПРОЕКТОВ:
 {'='*60}
@@ -826,20 +1017,12 @@ class StatsWindow(QMainWindow):
             return
             
         try:
-            # Создание DataFrame
-            data = []
-            total_imports = sum(self.imports_count.values())
-            
-            for lib, count in self.imports_count.items():
-                percentage = (count / total_imports) * 100
-                data.append({
-                    'Библиотека': lib,
-                    'Количество_импортов': count,
-                    'Процент': round(percentage, 2)
-                })
-                
-            df = pd.DataFrame(data)
-            df = df.sort_values('Количество_импортов', ascending=False)
+            # Создание DataFrame из уже отсортированных массивов
+            df = pd.DataFrame({
+                'Библиотека': self.sorted_libraries,
+                'Количество_импортов': self.sorted_counts,
+                'Процент': self.sorted_percentages.round(2)
+            })
             
             # Сохранение файла
             filename = f"import_statistics_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
@@ -61,12 +61,13 @@ class ArchitectureAnalyzer:
         self.graph = nx.DiGraph()
         self.modules_info: Dict[str, ModuleInfo] = {}
 
-    def analyze_project(self, project_path: Path) -> ArchitectureReport:
+    def analyze_project(self, project_path: Path, ast_cache=None) -> ArchitectureReport:
         """
         Анализирует архитектуру проекта
         
         Args:
             project_path: Путь к корню проекта
+            ast_cache: Кэш AST деревьев (AstCache) для файлов, уже разобранных другими анализаторами
             
         Returns:
             Отчет об архитектуре
@@ -85,7 +86,7 @@ class ArchitectureAnalyzer:
             
             # Анализ каждого файла
             for file_path in python_files:
-                module_info = self._analyze_file(file_path, project_path)
+                module_info = self._analyze_file(file_path, project_path, ast_cache)
                 if module_info:
                     self.modules_info[module_info.name] = module_info
                     report.modules.append(module_info)
@@ -129,13 +130,17 @@ class ArchitectureAnalyzer:
         
         return sorted(python_files)
 
-    def _analyze_file(self, file_path: Path, project_path: Path) -> Optional[ModuleInfo]:
+    def _analyze_file(self, file_path: Path, project_path: Path,
+                      ast_cache=None) -> Optional[ModuleInfo]:
         """Анализирует отдельный Python файл"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
+            if ast_cache is not None:
+                tree = ast_cache.get(file_path)
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                tree = ast.parse(content)
             
             # Определение имени модуля
             module_name = self._get_module_name(file_path, project_path)
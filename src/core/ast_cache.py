@@ -0,0 +1,52 @@
+"""
+Кэш AST деревьев Python файлов
+"""
+import os
+import ast
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+
+class AstCache:
+    """
+    Кэш разобранных AST деревьев
+    
+    Ключ - путь к файлу и время его модификации (st_mtime_ns), поэтому
+    измененный файл разбирается заново. Кэш рассчитан на время одного
+    анализа проекта и очищается вызывающей стороной.
+    """
+    
+    def __init__(self):
+        self._cache: Dict[Tuple[str, int], ast.Module] = {}
+    
+    def get(self, path: Union[str, Path], source: Optional[bytes] = None) -> ast.Module:
+        """
+        Возвращает AST дерево файла, разбирая его при отсутствии в кэше
+        
+        Args:
+            path: Путь к файлу
+            source: Уже прочитанное содержимое файла (чтобы не читать повторно)
+        
+        Raises:
+            OSError: Файл не удалось прочитать
+            SyntaxError: Файл содержит синтаксическую ошибку
+        """
+        path_str = str(path)
+        key = (path_str, os.stat(path_str).st_mtime_ns)
+        
+        tree = self._cache.get(key)
+        if tree is None:
+            if source is None:
+                with open(path_str, 'rb') as f:
+                    source = f.read()
+            tree = ast.parse(source, filename=path_str)
+            self._cache[key] = tree
+        
+        return tree
+    
+    def clear(self) -> None:
+        """Очищает кэш"""
+        self._cache.clear()
+    
+    def __len__(self) -> int:
+        return len(self._cache)
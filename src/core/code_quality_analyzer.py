@@ -15,6 +15,20 @@ from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Узлы AST, увеличивающие сложность. Классы узлов ast не наследуются,
+# поэтому проверка type(node) in frozenset эквивалентна isinstance
+_CYCLOMATIC_NODE_TYPES = frozenset({
+    ast.If, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler, ast.With
+})
+_COGNITIVE_NODE_TYPES = frozenset({
+    ast.If, ast.While, ast.For, ast.AsyncFor, ast.Try, ast.ExceptHandler, ast.With,
+    ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp
+})
+_NESTING_NODE_TYPES = frozenset({
+    ast.If, ast.While, ast.For, ast.AsyncFor, ast.Try, ast.With
+})
+_FUNCTION_NODE_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef})
+
 
 @dataclass
 class PEP8Violation:
@@ -184,17 +198,50 @@ class CodeQualityAnalyzer:
             'gen_expr': 1,
         }
     
-    def analyze_file(self, file_path: Path) -> CodeQualityReport:
-        """Анализирует качество кода в файле"""
-        self.logger.info(f"Анализ качества кода файла: {file_path}")
-        
+    def analyze_file(self, file_path: Path, ast_cache=None) -> CodeQualityReport:
+        """
+        Анализирует качество кода в файле
+        
+        Args:
+            file_path: Путь к файлу
+            ast_cache: Кэш AST деревьев (AstCache), общий для нескольких анализаторов
+        """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                lines = content.splitlines()
+        except Exception as e:
+            self.logger.error(f"Ошибка анализа файла {file_path}: {e}")
+            return CodeQualityReport(file_path=file_path)
+        
+        tree = None
+        if ast_cache is not None:
+            try:
+                tree = ast_cache.get(file_path)
+            except (OSError, SyntaxError, ValueError):
+                tree = None
+        
+        return self.analyze_source(content, file_path, tree=tree)
+    
+    def analyze_source(self, content: str, file_path: Path,
+                       tree: Optional[ast.AST] = None,
+                       function_nodes: Optional[List[ast.AST]] = None) -> CodeQualityReport:
+        """
+        Анализирует качество уже прочитанного исходного кода
+        
+        Args:
+            content: Исходный код файла
+            file_path: Путь к файлу (для отчета и сообщений)
+            tree: Готовое AST дерево (если файл уже был разобран)
+            function_nodes: Узлы функций в порядке ast.walk, уже найденные внешним обходом
+        """
+        self.logger.info(f"Анализ качества кода файла: {file_path}")
+        
+        try:
+            lines = content.splitlines()
             
             # Парсинг AST
-            tree = ast.parse(content)
+            if tree is None:
+                tree = ast.parse(content)
             
             # Создание отчета
             report = CodeQualityReport(file_path=file_path)
@@ -202,11 +249,16 @@ class CodeQualityAnalyzer:
             # PEP8 проверки
             report.pep8_violations = self._check_pep8(lines)
             
+            # Узлы функций ищутся одним обходом (если не переданы готовыми)
+            if function_nodes is None:
+                function_nodes = [node for node in ast.walk(tree)
+                                  if type(node) in _FUNCTION_NODE_TYPES]
+            
             # Анализ функций
-            report.functions_quality = self._analyze_functions_quality(tree, lines)
+            report.functions_quality = self._analyze_functions_quality(function_nodes, lines)
             
             # Когнитивная сложность
-            report.cognitive_complexity = self._analyze_cognitive_complexity(tree, lines)
+            report.cognitive_complexity = self._analyze_cognitive_complexity(function_nodes, lines)
             
             # Дублирование кода
             report.code_duplications = self._find_code_duplications(lines)
@@ -305,11 +357,12 @@ class CodeQualityAnalyzer:
         
         return violations
     
-    def _analyze_functions_quality(self, tree: ast.AST, lines: List[str]) -> List[FunctionQuality]:
+    def _analyze_functions_quality(self, function_nodes: List[ast.AST],
+                                   lines: List[str]) -> List[FunctionQuality]:
         """Анализирует качество функций"""
         functions = []
         
-        for node in ast.walk(tree):
+        for node in function_nodes:
             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 func_quality = FunctionQuality(
                     name=node.name,
@@ -356,13 +409,10 @@ class CodeQualityAnalyzer:
         complexity = 1  # Базовая сложность
         
         for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
+            child_type = type(child)
+            if child_type in _CYCLOMATIC_NODE_TYPES:
                 complexity += 1
-            elif isinstance(child, ast.With):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
+            elif child_type is ast.BoolOp:
                 complexity += len(child.values) - 1
         
         return complexity
@@ -372,31 +422,12 @@ class CodeQualityAnalyzer:
         complexity = 0
         
         for child in ast.walk(node):
-            if isinstance(child, ast.If):
-                complexity += 1
-            elif isinstance(child, ast.While):
-                complexity += 1
-            elif isinstance(child, ast.For):
-                complexity += 1
-            elif isinstance(child, ast.AsyncFor):
-                complexity += 1
-            elif isinstance(child, ast.Try):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, ast.With):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
-                if isinstance(child.op, (ast.And, ast.Or)):
-                    complexity += len(child.values) - 1
-            elif isinstance(child, ast.ListComp):
-                complexity += 1
-            elif isinstance(child, ast.DictComp):
-                complexity += 1
-            elif isinstance(child, ast.SetComp):
-                complexity += 1
-            elif isinstance(child, ast.GeneratorExp):
+            child_type = type(child)
+            if child_type in _COGNITIVE_NODE_TYPES:
                 complexity += 1
+            elif child_type is ast.BoolOp:
+                # Операторы BoolOp - только And и Or
+                complexity += len(child.values) - 1
         
         return complexity
     
@@ -414,20 +445,22 @@ class CodeQualityAnalyzer:
         current_depth = 0
         
         for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor, ast.Try, ast.With)):
+            child_type = type(child)
+            if child_type in _NESTING_NODE_TYPES:
                 current_depth += 1
                 max_depth = max(max_depth, current_depth)
-            elif isinstance(child, ast.FunctionDef):
+            elif child_type is ast.FunctionDef:
                 # Сброс глубины для вложенных функций
                 current_depth = 0
         
         return max_depth
     
-    def _analyze_cognitive_complexity(self, tree: ast.AST, lines: List[str]) -> List[CognitiveComplexity]:
+    def _analyze_cognitive_complexity(self, function_nodes: List[ast.AST],
+                                      lines: List[str]) -> List[CognitiveComplexity]:
         """Анализирует когнитивную сложность"""
         complexities = []
         
-        for node in ast.walk(tree):
+        for node in function_nodes:
             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 complexity = self._calculate_cognitive_complexity(node)
                 factors = self._identify_cognitive_factors(node)
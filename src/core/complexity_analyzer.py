@@ -1,6 +1,6 @@
 import ast
 import math
-from typing import Dict, List, Any, Optional, Tuple, Set
+from typing import Dict, List, Any, Optional, Tuple, Set, Iterable
 from pathlib import Path
 from dataclasses import dataclass, field
 from collections import defaultdict, Counter
@@ -98,23 +98,53 @@ class ComplexityAnalyzer:
             'maintainability': 65
         }
         
-    def analyze_file(self, file_path: Path) -> FileComplexityReport:
-        """Анализирует сложность одного файла"""
+    def analyze_file(self, file_path: Path, ast_cache=None) -> FileComplexityReport:
+        """
+        Анализирует сложность одного файла
+        
+        Args:
+            file_path: Путь к файлу
+            ast_cache: Кэш AST деревьев (AstCache), общий для нескольких анализаторов
+        """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                
+        except Exception as e:
+            self.logger.error(f"Error analyzing {file_path}: {e}")
+            return self._create_error_report(file_path, f"Analysis error: {e}")
+        
+        tree = None
+        if ast_cache is not None:
+            try:
+                tree = ast_cache.get(file_path)
+            except (OSError, SyntaxError, ValueError):
+                tree = None
+        
+        return self.analyze_source(content, file_path, tree=tree)
+    
+    def analyze_source(self, content: str, file_path: Path,
+                       tree: Optional[ast.AST] = None) -> FileComplexityReport:
+        """
+        Анализирует сложность уже прочитанного исходного кода
+        
+        Args:
+            content: Исходный код файла
+            file_path: Путь к файлу (для отчета и сообщений)
+            tree: Готовое AST дерево (если файл уже был разобран)
+        """
+        try:
             # Базовые метрики строк
             lines = content.split('\n')
             metrics = self._calculate_basic_metrics(lines)
             
             # AST анализ
-            try:
-                tree = ast.parse(content, filename=str(file_path))
-                self._analyze_ast(tree, metrics)
-            except SyntaxError as e:
-                self.logger.warning(f"Syntax error in {file_path}: {e}")
-                metrics.issues.append(f"Syntax error: {e}")
+            if tree is None:
+                try:
+                    tree = ast.parse(content, filename=str(file_path))
+                except SyntaxError as e:
+                    self.logger.warning(f"Syntax error in {file_path}: {e}")
+                    return self._create_error_report(file_path, f"Syntax error: {e}")
+            self._analyze_ast(tree, metrics)
             
             # Дополнительные метрики
             self._calculate_advanced_metrics(content, metrics)
@@ -137,18 +167,29 @@ class ComplexityAnalyzer:
             
         except Exception as e:
             self.logger.error(f"Error analyzing {file_path}: {e}")
-            return FileComplexityReport(
-                file_path=file_path,
-                metrics=ComplexityMetrics(),
-                functions=[],
-                classes=[],
-                issues=[f"Analysis error: {e}"],
-                grade="F"
-            )
+            return self._create_error_report(file_path, f"Analysis error: {e}")
+    
+    def _create_error_report(self, file_path: Path, message: str) -> FileComplexityReport:
+        """Создает отчет для файла, который не удалось проанализировать"""
+        return FileComplexityReport(
+            file_path=file_path,
+            metrics=ComplexityMetrics(),
+            functions=[],
+            classes=[],
+            issues=[message],
+            grade="F"
+        )
     
-    def analyze_project(self, directory: Path) -> ProjectComplexityReport:
-        """Анализирует сложность всего проекта"""
-        python_files = list(directory.rglob("*.py"))
+    def analyze_project(self, directory: Path,
+                        files: Optional[Iterable[Path]] = None) -> ProjectComplexityReport:
+        """
+        Анализирует сложность всего проекта
+        
+        Args:
+            directory: Директория проекта
+            files: Уже найденные Python файлы проекта (если None, ищутся в directory)
+        """
+        python_files = list(directory.rglob("*.py")) if files is None else files
         file_reports = []
         
         for file_path in python_files:
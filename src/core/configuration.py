@@ -1,11 +1,32 @@
 """
 Модуль конфигурации приложения
 """
-from typing import Set, Dict, List, Any, Optional
+from typing import Set, Dict, List, Any, Optional, TYPE_CHECKING
 from pathlib import Path
+import functools
 import json
 from .interfaces import IConfiguration
 
+try:
+    from functools import cached_property
+except ImportError:
+    # functools.cached_property доступен только с Python 3.8
+    def cached_property(func: Any) -> property:
+        """Свойство, значение которого вычисляется один раз и хранится в __dict__ экземпляра"""
+        name: str = func.__name__
+        
+        @functools.wraps(func)
+        def getter(self: Any) -> Any:
+            if name not in self.__dict__:
+                self.__dict__[name] = func(self)
+            return self.__dict__[name]
+        
+        return property(getter)
+
+if TYPE_CHECKING:
+    from .logging_config import LogConfig
+    from .security import SecurityConfig
+
 
 class Configuration(IConfiguration):
     """Класс конфигурации приложения"""
@@ -113,14 +134,17 @@ class Configuration(IConfiguration):
                 "gc_threshold": 100,
                 "memory_check_interval": 50,
                 "enable_profiling": True,
-                "profile_file": "logs/performance_profile.json",
+                "profile_file": "logs/performance_profile.ndjson",
                 "detailed_profiling": False,
                 "optimal_threads": 0,
                 "thread_chunk_size": 100,
                 "adaptive_threading": True,
                 "cache_imports": True,
                 "cache_file_hashes": True,
-                "cache_directory_structure": True
+                "cache_directory_structure": True,
+                "cache_scan_results": True,
+                "parallel_directory_walk": False,
+                "directory_walk_workers": 32
             }
         }
     
@@ -160,16 +184,39 @@ class Configuration(IConfiguration):
         """Возвращает интервал обновления прогресса"""
         return self._config.get("progress_update_interval", 500)
     
+    def get_last_directory(self) -> Optional[str]:
+        """Возвращает последнюю выбранную для анализа папку"""
+        return self._config.get("last_directory")
+    
     def update_config(self, key: str, value: Any) -> None:
         """Обновляет значение конфигурации"""
         self._config[key] = value
+        self._invalidate_config_objects()
         self._save_config()
     
     def reset_to_defaults(self) -> None:
         """Сбрасывает конфигурацию к значениям по умолчанию"""
         self._config = self._get_default_config()
+        self._invalidate_config_objects()
         self._save_config()
     
+    @cached_property
+    def logging_config(self) -> 'LogConfig':
+        """Конфигурация логирования в виде LogConfig (создается один раз)"""
+        from .logging_config import LogConfig
+        return LogConfig(**self.get_logging_config())
+    
+    @cached_property
+    def security_config(self) -> 'SecurityConfig':
+        """Конфигурация безопасности в виде SecurityConfig (создается один раз)"""
+        from .security import SecurityConfig
+        return SecurityConfig(**self.get_security_config())
+    
+    def _invalidate_config_objects(self) -> None:
+        """Сбрасывает закэшированные объекты конфигурации после изменений"""
+        self.__dict__.pop('logging_config', None)
+        self.__dict__.pop('security_config', None)
+    
     def get_logging_config(self) -> Dict[str, Any]:
         """Возвращает конфигурацию логирования"""
         return self._config.get("logging", {})
@@ -179,6 +226,7 @@ class Configuration(IConfiguration):
         if "logging" not in self._config:
             self._config["logging"] = {}
         self._config["logging"][key] = value
+        self._invalidate_config_objects()
         self._save_config()
     
     def get_security_config(self) -> Dict[str, Any]:
@@ -190,6 +238,7 @@ class Configuration(IConfiguration):
         if "security" not in self._config:
             self._config["security"] = {}
         self._config["security"][key] = value
+        self._invalidate_config_objects()
         self._save_config()
     
     def get_performance_config(self) -> Dict[str, Any]:
@@ -37,8 +37,7 @@ class FileScanner(IFileScanner):
         self.logger = get_logger("FileScanner")
         
         # Инициализация безопасности
-        security_config_dict: Dict[str, Any] = config.get_security_config()
-        security_config: SecurityConfig = SecurityConfig(**security_config_dict)
+        security_config: SecurityConfig = config.security_config
         self.security_manager: SecurityManager = SecurityManager(security_config)
         
         # Инициализация производительности
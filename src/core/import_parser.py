@@ -2,7 +2,7 @@
 Модуль парсера импортов Python
 """
 import ast
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Iterator
 from pathlib import Path
 from collections import Counter
 from .interfaces import IImportParser
@@ -23,8 +23,7 @@ class ImportParser(IImportParser):
         self.logger = get_logger("ImportParser")
         
         # Инициализация безопасности
-        security_config_dict: Dict[str, Any] = config.get_security_config()
-        security_config: SecurityConfig = SecurityConfig(**security_config_dict)
+        security_config: SecurityConfig = config.security_config
         self.security_manager: SecurityManager = SecurityManager(security_config)
         
         # Инициализация производительности
@@ -34,13 +33,18 @@ class ImportParser(IImportParser):
         
         self.logger.info(f"ImportParser инициализирован (excluded_libs_count: {len(self._excluded_libs)})")
     
-    def parse_imports(self, content: str, file_path: Path) -> List[str]:
+    def parse_imports(self, content: str, file_path: Path,
+                      tree: Optional[ast.AST] = None,
+                      import_nodes: Optional[List[ast.AST]] = None) -> List[str]:
         """
         Парсит импорты из содержимого файла
         
         Args:
             content: Содержимое файла
             file_path: Путь к файлу
+            tree: Готовое AST дерево (если файл уже был разобран)
+            import_nodes: Узлы Import/ImportFrom в порядке ast.walk, уже найденные
+                внешним обходом с учетом лимита узлов (дерево повторно не обходится)
             
         Returns:
             Список найденных библиотек
@@ -68,19 +72,16 @@ class ImportParser(IImportParser):
                 self.logger.warning(f"Файл слишком большой для AST парсинга (file: {file_path})")
                 return imports
             
-            # Парсинг AST
-            tree: ast.AST = ast.parse(content, filename=str(file_path))
+            if import_nodes is not None:
+                nodes = import_nodes
+            else:
+                # Парсинг AST
+                if tree is None:
+                    tree = ast.parse(content, filename=str(file_path))
+                nodes = self._walk_limited(tree, file_path)
             
             # Обход AST
-            node_count: int = 0
-            for node in ast.walk(tree):
-                node_count += 1
-                
-                # Проверка лимита узлов AST
-                if node_count > self.security_manager.config.max_ast_nodes:
-                    self.logger.warning(f"Превышен лимит узлов AST (file: {file_path})")
-                    break
-                
+            for node in nodes:
                 if isinstance(node, ast.Import):
                     for alias in node.names:
                         lib: str = self._extract_library_name(alias.name)
@@ -108,6 +109,15 @@ class ImportParser(IImportParser):
         
         return imports
     
+    def _walk_limited(self, tree: ast.AST, file_path: Path) -> Iterator[ast.AST]:
+        """Обход AST с проверкой лимита узлов"""
+        max_nodes: int = self.security_manager.config.max_ast_nodes
+        for node_count, node in enumerate(ast.walk(tree), 1):
+            if node_count > max_nodes:
+                self.logger.warning(f"Превышен лимит узлов AST (file: {file_path})")
+                break
+            yield node
+    
     def _extract_library_name(self, import_name: str) -> str:
         """
         Извлекает имя библиотеки из импорта
@@ -175,7 +185,20 @@ class ImportParser(IImportParser):
         Returns:
             Словарь со статистикой
         """
-        if not imports:
+        return self.get_import_statistics_from_counts(Counter(imports))
+    
+    def get_import_statistics_from_counts(self, counts: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Создает статистику по уже подсчитанным импортам
+        
+        Args:
+            counts: Словарь {библиотека: количество импортов}
+            
+        Returns:
+            Словарь со статистикой
+        """
+        counter: Counter = Counter({lib: count for lib, count in counts.items() if count > 0})
+        if not counter:
             return {
                 'total': 0,
                 'unique': 0,
@@ -184,21 +207,17 @@ class ImportParser(IImportParser):
                 'most_common': []
             }
         
-        # Подсчет уникальных импортов
-        unique_imports: Set[str] = set(imports)
-        
         # Разделение на стандартные и сторонние
-        standard_libs: int = sum(1 for lib in unique_imports
+        standard_libs: int = sum(1 for lib in counter
                             if self.is_standard_library(lib))
-        third_party: int = len(unique_imports) - standard_libs
+        third_party: int = len(counter) - standard_libs
         
         # Самые частые импорты
-        counter: Counter = Counter(imports)
         most_common: List[tuple] = counter.most_common(10)
         
         return {
-            'total': len(imports),
-            'unique': len(unique_imports),
+            'total': sum(counter.values()),
+            'unique': len(counter),
             'standard_libs': standard_libs,
             'third_party': third_party,
             'most_common': most_common
@@ -2,7 +2,7 @@
 Модуль паттернов проектирования - Factory, Strategy, Observer
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Callable, Protocol
+from typing import Dict, List, Any, Optional, Callable, Protocol, Union
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
@@ -78,10 +78,8 @@ class ComponentFactory:
             return DataExporter()
         
         elif component_type == ComponentType.SECURITY_MANAGER:
-            from .security import SecurityManager, SecurityConfig
-            security_config_dict = self.config.get_security_config()
-            security_config = SecurityConfig(**security_config_dict)
-            return SecurityManager(security_config)
+            from .security import SecurityManager
+            return SecurityManager(self.config.security_config)
         
         elif component_type == ComponentType.PERFORMANCE_MANAGER:
             from .performance import PerformanceManager, PerformanceConfig
@@ -235,12 +233,32 @@ class ScanningStrategyFactory:
 # OBSERVER PATTERN - Наблюдатели для событий
 # ============================================================================
 
+class ScanEventType(str, Enum):
+    """Типы событий сканирования (значения - прежние строковые имена)"""
+    STARTED = "scan_started"
+    COMPLETED = "scan_completed"
+    ERROR = "error"
+    PROGRESS = "file_processed"
+
+
+# Строковые имена событий (для обратной совместимости)
+_EVENT_TYPE_BY_NAME: Dict[str, ScanEventType] = {
+    event_type.value: event_type for event_type in ScanEventType
+}
+
+
 @dataclass
 class ScanEvent:
     """Событие сканирования"""
-    event_type: str
+    event_type: Union[ScanEventType, str]
     data: Dict[str, Any]
     timestamp: float = field(default_factory=time.time)
+    
+    def __post_init__(self) -> None:
+        # Известные строковые имена приводятся к ScanEventType (члены равны
+        # прежним строкам), неизвестные события сохраняются как есть
+        if isinstance(self.event_type, str):
+            self.event_type = _EVENT_TYPE_BY_NAME.get(self.event_type, self.event_type)
 
 
 class ScanObserver(ABC):
@@ -262,11 +280,11 @@ class ProgressObserver(ScanObserver):
     def update(self, event: ScanEvent) -> None:
         """Обновляет прогресс"""
         if self.progress_callback:
-            if event.event_type == "file_processed":
+            if event.event_type == ScanEventType.PROGRESS:
                 self.progress_callback(f"Обработан файл: {event.data.get('file', 'Unknown')}")
-            elif event.event_type == "scan_completed":
+            elif event.event_type == ScanEventType.COMPLETED:
                 self.progress_callback(f"Сканирование завершено: {event.data.get('total_files', 0)} файлов")
-            elif event.event_type == "error":
+            elif event.event_type == ScanEventType.ERROR:
                 self.progress_callback(f"Ошибка: {event.data.get('error', 'Unknown error')}")
 
 
@@ -278,11 +296,11 @@ class LoggingObserver(ScanObserver):
     
     def update(self, event: ScanEvent) -> None:
         """Логирует событие"""
-        if event.event_type == "file_processed":
+        if event.event_type == ScanEventType.PROGRESS:
             self.logger.debug("Файл обработан", extra_data=event.data)
-        elif event.event_type == "scan_completed":
+        elif event.event_type == ScanEventType.COMPLETED:
             self.logger.info("Сканирование завершено", extra_data=event.data)
-        elif event.event_type == "error":
+        elif event.event_type == ScanEventType.ERROR:
             self.logger.error("Ошибка сканирования", extra_data=event.data)
 
 
@@ -290,25 +308,30 @@ class MetricsObserver(ScanObserver):
     """Наблюдатель для сбора метрик"""
     
     def __init__(self) -> None:
-        self.metrics: Dict[str, Any] = {
+        self.metrics: Dict[str, Any] = {}
+        self.reset()
+        self.logger = get_logger("MetricsObserver")
+    
+    def reset(self) -> None:
+        """Сбрасывает собранные метрики перед новым сканированием"""
+        self.metrics = {
             'files_processed': 0,
             'total_imports': 0,
             'errors': 0,
             'start_time': None,
             'end_time': None
         }
-        self.logger = get_logger("MetricsObserver")
     
     def update(self, event: ScanEvent) -> None:
         """Обновляет метрики"""
-        if event.event_type == "scan_started":
+        if event.event_type == ScanEventType.STARTED:
             self.metrics['start_time'] = event.timestamp
-        elif event.event_type == "file_processed":
+        elif event.event_type == ScanEventType.PROGRESS:
             self.metrics['files_processed'] += 1
             self.metrics['total_imports'] += event.data.get('imports_count', 0)
-        elif event.event_type == "scan_completed":
+        elif event.event_type == ScanEventType.COMPLETED:
             self.metrics['end_time'] = event.timestamp
-        elif event.event_type == "error":
+        elif event.event_type == ScanEventType.ERROR:
             self.metrics['errors'] += 1
     
     def get_metrics(self) -> Dict[str, Any]:
@@ -345,7 +368,7 @@ class ScanSubject:
             except Exception as e:
                 self.logger.error(f"Ошибка в наблюдателе {type(observer).__name__}: {e}")
     
-    def notify_all(self, event_type: str, data: Dict[str, Any]) -> None:
+    def notify_all(self, event_type: Union[ScanEventType, str], data: Dict[str, Any]) -> None:
         """Уведомляет всех наблюдателей с созданием события"""
         event = ScanEvent(event_type, data)
         self.notify(event)
@@ -2,24 +2,56 @@
 Модуль оптимизации производительности - кэширование и оптимизация
 """
 import time
+import atexit
+import weakref
 import threading
 import functools
 import hashlib
 import json
+import mmap
 import os
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable, Tuple, Union
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from collections import OrderedDict, defaultdict
 import psutil
 import gc
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 from .logging_config import get_logger
 
 
-@dataclass
+# Минимальный интервал между записями профиля на диск (секунды)
+PROFILE_FLUSH_INTERVAL: float = 30.0
+
+# Файлы меньше этого размера читаются целиком, большие - через mmap
+SMALL_FILE_SIZE: int = 64 * 1024
+
+# Параметр slots у dataclass появился в Python 3.10; на старых версиях классы без __slots__
+# (используется и другими модулями core)
+_DATACLASS_SLOTS: Dict[str, bool] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _dumps_json_line(data: Any) -> bytes:
+    """Сериализует данные в одну строку NDJSON (orjson при наличии)"""
+    if orjson is not None:
+        return orjson.dumps(data) + b'\n'
+    return json.dumps(data, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class PerformanceConfig:
-    """Конфигурация производительности"""
+    """Конфигурация производительности (неизменяемая)"""
     # Кэширование
     enable_caching: bool = True
     cache_size: int = 1000
@@ -33,7 +65,7 @@ class PerformanceConfig:
     
     # Профилирование
     enable_profiling: bool = True
-    profile_file: str = "logs/performance_profile.json"
+    profile_file: str = "logs/performance_profile.ndjson"
     detailed_profiling: bool = False
     
     # Оптимизация потоков
@@ -45,6 +77,11 @@ class PerformanceConfig:
     cache_imports: bool = True
     cache_file_hashes: bool = True
     cache_directory_structure: bool = True
+    cache_scan_results: bool = True
+    
+    # Обход директорий
+    parallel_directory_walk: bool = False  # Включать для сетевых ФС
+    directory_walk_workers: int = 32
 
 
 class LRUCache:
@@ -55,7 +92,11 @@ class LRUCache:
         self.ttl: int = ttl
         self.cache: OrderedDict[str, Any] = OrderedDict()
         self.timestamps: Dict[str, float] = {}
-        self.lock: threading.RLock = threading.RLock()
+        self.lock: threading.Lock = threading.Lock()
+        
+        # Статистика попаданий
+        self._hits: int = 0
+        self._misses: int = 0
     
     def get(self, key: str) -> Optional[Any]:
         """Получает значение из кэша"""
@@ -65,11 +106,14 @@ class LRUCache:
                 if time.time() - self.timestamps[key] > self.ttl:
                     del self.cache[key]
                     del self.timestamps[key]
+                    self._misses += 1
                     return None
                 
                 # Перемещаем в конец (LRU)
                 self.cache.move_to_end(key)
+                self._hits += 1
                 return self.cache[key]
+            self._misses += 1
             return None
     
     def put(self, key: str, value: Any) -> None:
@@ -94,11 +138,30 @@ class LRUCache:
         with self.lock:
             self.cache.clear()
             self.timestamps.clear()
+            self._hits = 0
+            self._misses = 0
     
     def size(self) -> int:
         """Возвращает размер кэша"""
         with self.lock:
             return len(self.cache)
+    
+    @property
+    def hits(self) -> int:
+        """Количество попаданий в кэш"""
+        return self._hits
+    
+    @property
+    def misses(self) -> int:
+        """Количество промахов кэша"""
+        return self._misses
+    
+    @property
+    def hit_rate(self) -> float:
+        """Доля попаданий в кэш (0.0 - 1.0)"""
+        with self.lock:
+            total: int = self._hits + self._misses
+            return self._hits / total if total else 0.0
 
 
 class PerformanceProfiler:
@@ -109,7 +172,8 @@ class PerformanceProfiler:
         self.logger = get_logger("PerformanceProfiler")
         self.metrics: Dict[str, List[float]] = defaultdict(list)
         self.start_times: Dict[str, float] = {}
-        self.lock: threading.RLock = threading.RLock()
+        self.lock: threading.Lock = threading.Lock()
+        self._config_saved: bool = False
         
         # Создаем директорию для профилей
         profile_dir: Path = Path(self.config.profile_file).parent
@@ -152,17 +216,21 @@ class PerformanceProfiler:
         return stats
     
     def save_profile(self) -> None:
-        """Сохраняет профиль в файл"""
+        """Дописывает снимок профиля в файл (одна JSON-запись на строку)"""
         try:
             stats: Dict[str, Dict[str, float]] = self.get_statistics()
             profile_data: Dict[str, Any] = {
                 'timestamp': time.time(),
-                'config': self.config.__dict__,
                 'statistics': stats
             }
             
-            with open(self.config.profile_file, 'w', encoding='utf-8') as f:
-                json.dump(profile_data, f, indent=2, ensure_ascii=False)
+            # Конфигурация не меняется - пишем ее только в первую запись сессии
+            if not self._config_saved:
+                profile_data['config'] = asdict(self.config)
+            
+            with open(self.config.profile_file, 'ab') as f:
+                f.write(_dumps_json_line(profile_data))
+            self._config_saved = True
             
             self.logger.info(f"Профиль производительности сохранен (file: {self.config.profile_file})")
             
@@ -184,7 +252,7 @@ class MemoryOptimizer:
         self.logger = get_logger("MemoryOptimizer")
         self.file_counter: int = 0
         self.last_memory_check: int = 0
-        self.lock: threading.RLock = threading.RLock()
+        self.lock: threading.Lock = threading.Lock()
     
     def check_memory_usage(self) -> Dict[str, float]:
         """Проверяет использование памяти"""
@@ -222,6 +290,35 @@ class MemoryOptimizer:
         self.logger.info(f"Использование памяти (rss: {memory_info['rss']:.1f}MB, vms: {memory_info['vms']:.1f}MB, percent: {memory_info['percent']:.1f}%)")
 
 
+# Размер блока квантования доступной памяти (MB)
+MEMORY_BUCKET_MB: int = 512
+
+
+@functools.lru_cache(maxsize=64)
+def _compute_thread_count(cpu_count: int, file_count: int,
+                          memory_bucket: int, adaptive: bool) -> int:
+    """Вычисляет количество потоков (чистая функция для кэширования)"""
+    # Адаптивная настройка
+    if adaptive:
+        # Учитываем количество файлов
+        if file_count < 100:
+            threads: int = max(1, cpu_count // 2)
+        elif file_count < 1000:
+            threads = cpu_count
+        else:
+            threads = min(cpu_count * 2, 16)
+        
+        # Учитываем доступную память
+        if memory_bucket * MEMORY_BUCKET_MB < 1024:  # Меньше 1GB
+            threads = max(1, threads // 2)
+        elif memory_bucket * MEMORY_BUCKET_MB >= 8192:  # От 8GB
+            threads = min(threads + 2, 20)
+    else:
+        threads = cpu_count
+    
+    return min(threads, file_count, 20)  # Максимум 20 потоков
+
+
 class ThreadOptimizer:
     """Оптимизатор потоков"""
     
@@ -241,25 +338,11 @@ class ThreadOptimizer:
         if cpu_count is None:
             cpu_count = 4
         
-        # Адаптивная настройка
-        if self.config.adaptive_threading:
-            # Учитываем количество файлов
-            if file_count < 100:
-                threads: int = max(1, cpu_count // 2)
-            elif file_count < 1000:
-                threads = cpu_count
-            else:
-                threads = min(cpu_count * 2, 16)
-            
-            # Учитываем доступную память
-            if available_memory < 1024:  # Меньше 1GB
-                threads = max(1, threads // 2)
-            elif available_memory > 8192:  # Больше 8GB
-                threads = min(threads + 2, 20)
-        else:
-            threads = cpu_count
-        
-        return min(threads, file_count, 20)  # Максимум 20 потоков
+        # Память квантуется блоками, чтобы результат можно было кэшировать
+        memory_bucket: int = int(available_memory // MEMORY_BUCKET_MB)
+        return _compute_thread_count(
+            cpu_count, file_count, memory_bucket, self.config.adaptive_threading
+        )
     
     def get_chunk_size(self, file_count: int, thread_count: int) -> int:
         """Определяет размер чанка для обработки"""
@@ -280,6 +363,19 @@ class ThreadOptimizer:
             self.performance_history.pop(0)
 
 
+# Живые менеджеры производительности: один обработчик atexit на процесс
+# вместо регистрации для каждого экземпляра
+_live_managers: 'weakref.WeakSet[PerformanceManager]' = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    """Записывает несохраненные данные производительности при завершении процесса"""
+    for manager in list(_live_managers):
+        if manager._dirty:
+            manager.save_performance_data()
+
+
 class PerformanceManager:
     """Менеджер производительности (фасад)"""
     
@@ -293,6 +389,18 @@ class PerformanceManager:
         self.memory_optimizer: MemoryOptimizer = MemoryOptimizer(self.config)
         self.thread_optimizer: ThreadOptimizer = ThreadOptimizer(self.config)
         
+        # Хешер содержимого файлов (xxh3 при наличии, иначе md5)
+        self._file_hasher: Callable[[], Any] = (
+            xxhash.xxh3_64 if xxhash is not None else hashlib.md5
+        )
+        
+        # Отложенная запись профиля: данные помечаются измененными и
+        # записываются не чаще PROFILE_FLUSH_INTERVAL, остаток - при выходе
+        self._dirty: bool = False
+        self._last_flush: Optional[float] = None
+        self._flush_lock: threading.Lock = threading.Lock()
+        _live_managers.add(self)
+        
         # Создаем директории
         self._create_directories()
         
@@ -365,22 +473,75 @@ class PerformanceManager:
         # Создаем хеш
         return hashlib.md5(key_string.encode()).hexdigest()
     
+    def hash_file(self, file_path: Union[str, Path]) -> str:
+        """Вычисляет хеш содержимого файла (с кэшированием по mtime и размеру)"""
+        path_str: str = os.fspath(file_path)
+        stat_result: os.stat_result = os.stat(path_str)
+        
+        cache_key: Optional[str] = None
+        if self.config.cache_file_hashes:
+            cache_key = f"file_hash|{path_str}|{stat_result.st_mtime_ns}|{stat_result.st_size}"
+            cached_hash: Optional[str] = self.get_cached_result(cache_key)
+            if cached_hash is not None:
+                return cached_hash
+        
+        hasher = self._file_hasher()
+        if stat_result.st_size:
+            with open(path_str, 'rb') as f:
+                if stat_result.st_size < SMALL_FILE_SIZE:
+                    hasher.update(f.read())
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        hasher.update(mm)
+        
+        file_hash: str = hasher.hexdigest()
+        if cache_key is not None:
+            self.cache_result(cache_key, file_hash)
+        return file_hash
+    
     def save_performance_data(self) -> None:
         """Сохраняет данные производительности"""
+        with self._flush_lock:
+            self._dirty = False
+            self._last_flush = time.monotonic()
         if self.config.enable_profiling:
             self.profiler.save_profile()
     
+    def mark_dirty(self) -> None:
+        """Помечает данные производительности как несохраненные"""
+        with self._flush_lock:
+            self._dirty = True
+    
+    def flush_if_stale(self, min_interval_s: float = PROFILE_FLUSH_INTERVAL) -> bool:
+        """
+        Сохраняет данные производительности, если они изменены и с прошлой
+        записи прошло не меньше min_interval_s секунд
+        
+        Returns:
+            True, если данные были записаны
+        """
+        with self._flush_lock:
+            if not self._dirty:
+                return False
+            if (self._last_flush is not None
+                    and time.monotonic() - self._last_flush < min_interval_s):
+                return False
+        self.save_performance_data()
+        return True
+    
     def get_performance_report(self) -> Dict[str, Any]:
         """Возвращает отчет о производительности"""
         report: Dict[str, Any] = {
             'cache': {
                 'size': self.cache.size(),
                 'max_size': self.config.cache_size,
-                'hit_rate': 0.0  # TODO: Реализовать подсчет hit rate
+                'hits': self.cache.hits,
+                'misses': self.cache.misses,
+                'hit_rate': self.cache.hit_rate
             },
             'memory': self.get_memory_usage(),
             'profiling': self.profiler.get_statistics() if self.config.enable_profiling else {},
-            'config': self.config.__dict__
+            'config': asdict(self.config)
         }
         
         return report
@@ -400,13 +561,23 @@ class PerformanceManager:
 def cached(manager: PerformanceManager, ttl: Optional[int] = None) -> Callable[[Callable], Callable]:
     """Декоратор для кэширования результатов функций"""
     def decorator(func: Callable) -> Callable:
+        # При выключенном кэшировании функция возвращается без обертки
+        if not manager.config.enable_caching:
+            return func
+        
+        # Связываем горячие методы один раз, а не при каждом вызове
+        key_fn: Callable[..., str] = manager.generate_cache_key
+        cache_get: Callable[[str], Optional[Any]] = manager.cache.get
+        cache_put: Callable[[str, Any], None] = manager.cache.put
+        func_name: str = func.__name__
+        
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Генерируем ключ кэша
-            cache_key: str = manager.generate_cache_key(func.__name__, *args, **kwargs)
+            cache_key: str = key_fn(func_name, *args, **kwargs)
             
             # Пытаемся получить из кэша
-            cached_result: Optional[Any] = manager.get_cached_result(cache_key)
+            cached_result: Optional[Any] = cache_get(cache_key)
             if cached_result is not None:
                 return cached_result
             
@@ -414,7 +585,7 @@ def cached(manager: PerformanceManager, ttl: Optional[int] = None) -> Callable[[
             result: Any = func(*args, **kwargs)
             
             # Кэшируем результат
-            manager.cache_result(cache_key, result)
+            cache_put(cache_key, result)
             
             return result
         return wrapper
@@ -425,21 +596,30 @@ def cached(manager: PerformanceManager, ttl: Optional[int] = None) -> Callable[[
 def profiled(manager: PerformanceManager) -> Callable[[Callable], Callable]:
     """Декоратор для профилирования функций"""
     def decorator(func: Callable) -> Callable:
+        # При выключенном профилировании функция возвращается без обертки
+        if not manager.config.enable_profiling:
+            return func
+        
+        # Связываем горячие методы один раз, а не при каждом вызове
+        start: Callable[[str], None] = manager.profiler.start_timer
+        end: Callable[[str], float] = manager.profiler.end_timer
+        detailed: bool = manager.config.detailed_profiling
+        logger = manager.logger
+        profiler_name: str = f"{func.__module__}.{func.__name__}"
+        
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            profiler_name: str = f"{func.__module__}.{func.__name__}"
-            
-            manager.start_profiling(profiler_name)
+            start(profiler_name)
             try:
                 result: Any = func(*args, **kwargs)
                 return result
             finally:
-                duration: float = manager.end_profiling(profiler_name)
-                if manager.config.detailed_profiling:
-                    manager.logger.debug("Функция выполнена", 
-                                       extra_data={
-                                           "function": profiler_name,
-                                           "duration": duration
-                                       })
+                duration: float = end(profiler_name)
+                if detailed:
+                    logger.debug("Функция выполнена", 
+                                 extra_data={
+                                     "function": profiler_name,
+                                     "duration": duration
+                                 })
         return wrapper
     return decorator
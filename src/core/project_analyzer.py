@@ -3,7 +3,7 @@
 """
 import os
 import datetime
-from typing import List, Set, Optional
+from typing import List, Set, Optional, Union
 from pathlib import Path
 from .interfaces import IProjectAnalyzer, ProjectData
 from .configuration import Configuration
@@ -29,13 +29,17 @@ class ProjectAnalyzer(IProjectAnalyzer):
         """
         projects = []
         
-        for root, dirs, files in os.walk(directory):
+        # Работаем со строками: Path создается только для итоговых данных
+        directory_str = os.fspath(directory)
+        prefix_len = len(os.path.join(directory_str, ''))
+        
+        for root, dirs, files in os.walk(directory_str):
             # Фильтрация директорий
             dirs[:] = [d for d in dirs if not self._is_excluded_directory(d)]
             
             # Проверка глубины
-            rel_path = Path(root).relative_to(directory)
-            if rel_path.parts and len(rel_path.parts) > self._max_depth:
+            rel_str = root[prefix_len:] if len(root) > len(directory_str) else ''
+            if rel_str and rel_str.count(os.sep) + 1 > self._max_depth:
                 continue
             
             # Поиск Python файлов
@@ -44,9 +48,7 @@ class ProjectAnalyzer(IProjectAnalyzer):
                 continue
             
             # Создание данных проекта
-            project_data = self._create_project_data(
-                directory, Path(root), py_files
-            )
+            project_data = self._create_project_data(root, rel_str, py_files)
             if project_data:
                 projects.append(project_data)
         
@@ -65,9 +67,9 @@ class ProjectAnalyzer(IProjectAnalyzer):
         projects = []
         visited = set()
         
-        for root, dirs, files in os.walk(root_directory):
+        for root, dirs, files in os.walk(os.fspath(root_directory)):
             # Пропускаем уже посещенные директории
-            if any(str(Path(root)).startswith(p) for p in visited):
+            if any(root.startswith(p) for p in visited):
                 continue
             
             # Фильтрация директорий
@@ -75,9 +77,8 @@ class ProjectAnalyzer(IProjectAnalyzer):
             
             # Проверка на наличие Python файлов
             if any(f.endswith('.py') for f in files):
-                project_path = Path(root)
-                projects.append(project_path)
-                visited.add(str(project_path))
+                projects.append(Path(root))
+                visited.add(root)
         
         return projects
     
@@ -93,14 +94,14 @@ class ProjectAnalyzer(IProjectAnalyzer):
         """
         return dir_name in self._excluded_dirs
     
-    def _create_project_data(self, root_dir: Path, project_dir: Path, 
+    def _create_project_data(self, project_dir: str, rel_path: str,
                            py_files: List[str]) -> Optional[ProjectData]:
         """
         Создает данные проекта
         
         Args:
-            root_dir: Корневая директория
             project_dir: Директория проекта
+            rel_path: Путь директории относительно корня ('' для корня)
             py_files: Список Python файлов
             
         Returns:
@@ -108,8 +109,7 @@ class ProjectAnalyzer(IProjectAnalyzer):
         """
         try:
             # Определение имени проекта
-            rel_path = project_dir.relative_to(root_dir)
-            project_name = str(rel_path).replace(os.sep, " / ") if str(rel_path) != "." else "ROOT"
+            project_name = rel_path.replace(os.sep, " / ") if rel_path else "ROOT"
             
             # Подсчет файлов и директорий
             py_files_count = len(py_files)
@@ -118,14 +118,14 @@ class ProjectAnalyzer(IProjectAnalyzer):
             created_date = self._get_earliest_creation_date(project_dir, py_files)
             
             # Сбор директорий
-            directories = self._collect_directories(project_dir, root_dir)
+            directories = self._collect_directories(rel_path)
             
             # Сбор библиотек (пока пустой, будет заполнен позже)
             libraries = set()
             
             return ProjectData(
                 name=project_name,
-                path=project_dir,
+                path=Path(project_dir),
                 py_files_count=py_files_count,
                 total_imports=0,  # Будет заполнено позже
                 unique_libraries=0,  # Будет заполнено позже
@@ -137,7 +137,7 @@ class ProjectAnalyzer(IProjectAnalyzer):
         except Exception:
             return None
     
-    def _get_earliest_creation_date(self, project_dir: Path, 
+    def _get_earliest_creation_date(self, project_dir: Union[str, Path], 
                                   py_files: List[str]) -> Optional[datetime.datetime]:
         """
         Получает самую раннюю дату создания файлов
@@ -149,42 +149,64 @@ class ProjectAnalyzer(IProjectAnalyzer):
         Returns:
             Дата создания или None
         """
-        earliest_date = None
+        project_dir_str = os.fspath(project_dir)
+        earliest_time = None
         
         for file_name in py_files:
-            file_path = project_dir / file_name
             try:
-                creation_time = os.path.getctime(file_path)
-                creation_date = datetime.datetime.fromtimestamp(creation_time)
-                
-                if earliest_date is None or creation_date < earliest_date:
-                    earliest_date = creation_date
-                    
-            except (OSError, ValueError):
+                stat_result = os.stat(os.path.join(project_dir_str, file_name),
+                                      follow_symlinks=False)
+            except OSError:
                 continue
+            
+            file_time = self._get_file_creation_time(stat_result)
+            if earliest_time is None or file_time < earliest_time:
+                earliest_time = file_time
+        
+        if earliest_time is None:
+            return None
+        
+        # Преобразуем в datetime только итоговый минимум
+        try:
+            return datetime.datetime.fromtimestamp(earliest_time)
+        except (OverflowError, OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _get_file_creation_time(stat_result: os.stat_result) -> float:
+        """
+        Возвращает наиболее близкое к дате создания время файла
         
-        return earliest_date
+        Args:
+            stat_result: Результат os.stat
+            
+        Returns:
+            Время в секундах с начала эпохи
+        """
+        # st_birthtime доступен на macOS/BSD и на Windows начиная с Python 3.12
+        birth_time = getattr(stat_result, 'st_birthtime', None)
+        if birth_time:
+            return birth_time
+        
+        # На Windows st_ctime - время создания, на POSIX - время изменения inode
+        if os.name == 'nt':
+            return stat_result.st_ctime
+        return stat_result.st_mtime
     
-    def _collect_directories(self, project_dir: Path, 
-                           root_dir: Path) -> Set[str]:
+    def _collect_directories(self, rel_path: str) -> Set[str]:
         """
         Собирает список директорий проекта
         
         Args:
-            project_dir: Директория проекта
-            root_dir: Корневая директория
+            rel_path: Путь директории проекта относительно корня
             
         Returns:
             Множество относительных путей директорий
         """
         directories = set()
         
-        try:
-            rel_path = project_dir.relative_to(root_dir)
-            if str(rel_path) != ".":
-                directories.add(str(rel_path))
-        except ValueError:
-            pass
+        if rel_path:
+            directories.add(rel_path)
         
         return directories
     
@@ -5,10 +5,20 @@ import os
 import ast
 import json
 import time
+import heapq
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Callable
+from dataclasses import dataclass, asdict, is_dataclass
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .logging_config import get_logger
 from .import_parser import ImportParser
@@ -16,9 +26,11 @@ from .dependency_analyzer import DependencyAnalyzer
 from .complexity_analyzer import ComplexityAnalyzer
 from .code_quality_analyzer import CodeQualityAnalyzer
 from .architecture_analyzer import ArchitectureAnalyzer
+from .ast_cache import AstCache
+from .performance import _DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ProjectStats:
     """Статистика проекта"""
     total_files: int = 0
@@ -31,7 +43,7 @@ class ProjectStats:
     scan_duration: float = 0.0
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class LibraryInfo:
     """Информация о библиотеке"""
     name: str
@@ -41,7 +53,7 @@ class LibraryInfo:
     first_occurrence: str
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class FileAnalysis:
     """Анализ файла"""
     path: str
@@ -52,6 +64,300 @@ class FileAnalysis:
     issues: List[str]
 
 
+# Минимальное количество файлов, при котором анализ выносится в процессы
+PARALLEL_MIN_FILES = 64
+
+# Количество файлов в одной задаче рабочего процесса
+PARALLEL_CHUNK_SIZE = 32
+
+# Границы корзин распределения качества: very_poor < 30 <= poor < 50 <= ... <= excellent
+QUALITY_BUCKETS = ('very_poor', 'poor', 'fair', 'good', 'excellent')
+QUALITY_BUCKET_EDGES = np.array([30, 50, 70, 90], dtype=np.float64)
+
+# Границы корзин распределения сложности: very_low <= 5 < low <= 10 < ... < very_high
+COMPLEXITY_BUCKETS = ('very_low', 'low', 'medium', 'high', 'very_high')
+COMPLEXITY_BUCKET_EDGES = np.array([5, 10, 20, 30], dtype=np.float64)
+
+# Минимальный интервал между сообщениями о прогрессе (не чаще ~20 раз в секунду)
+PROGRESS_MIN_INTERVAL = 0.05
+
+# Сообщения, которые передаются всегда (завершение, ошибка и итог кэша сканирования)
+_FINAL_PROGRESS_PREFIXES = ('✅', '❌', '♻️')
+
+# Типы узлов AST для единого обхода (сравнение type(node) вместо isinstance;
+# ветвления - те же, что учитывает ComplexityVisitor)
+_IMPORT_NODE_TYPES = frozenset({ast.Import, ast.ImportFrom})
+_FUNCTION_NODE_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef})
+_BRANCH_NODE_TYPES = frozenset({ast.If, ast.While, ast.For, ast.ExceptHandler, ast.With})
+
+# Кэш сканирования проекта: результаты анализа неизмененных файлов
+SCAN_CACHE_FILE = '.scan_cache.json'
+SCAN_CACHE_VERSION = 1
+SCAN_CACHE_RESULT_KEYS = ('lines', 'imports', 'complexity', 'quality_score', 'issues')
+
+# Размер буфера чтения исходных файлов
+FILE_READ_BUFFER_SIZE = 128 * 1024
+
+# Директории, исключаемые из поиска Python файлов (скрытые директории
+# пропускаются всегда)
+EXCLUDED_DIRS = frozenset({
+    '.git', '__pycache__', '.pytest_cache', 'venv', 'env', 'node_modules',
+    '.venv', 'build', 'dist', '.mypy_cache', '.tox'
+})
+
+# Расширение Python файлов
+_PY_SUFFIX = '.py'
+
+
+def _iter_python_files(directory: str) -> Iterator[str]:
+    """
+    Рекурсивный обход директории через os.scandir
+    
+    Тип записи берется из результата scandir без отдельного stat. Порядок
+    совпадает с os.walk: сначала файлы директории, затем поддиректории.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name[0] != '.' and name not in EXCLUDED_DIRS:
+                        subdirs.append(entry.path)
+                elif name.endswith(_PY_SUFFIX) and not entry.is_dir():
+                    yield entry.path
+    except OSError:
+        return
+    
+    for subdir in subdirs:
+        yield from _iter_python_files(subdir)
+
+
+def project_files_signature(project_path: Path) -> frozenset:
+    """
+    Сигнатура Python файлов проекта: множество (путь, mtime_ns, размер)
+    
+    Меняется при изменении, добавлении, удалении и переименовании
+    анализируемых файлов; служит ключом для повторного использования
+    результатов анализа. Недоступные файлы пропускаются.
+    """
+    entries = []
+    for path_str in _iter_python_files(str(project_path)):
+        try:
+            stat_result = os.stat(path_str)
+        except OSError:
+            continue
+        entries.append((path_str, stat_result.st_mtime_ns, stat_result.st_size))
+    return frozenset(entries)
+
+
+# Анализаторы рабочего процесса (создаются один раз на процесс)
+_worker_analyzers: Dict[str, Any] = {}
+
+
+def _init_worker(config) -> None:
+    """Инициализация анализаторов в рабочем процессе"""
+    _worker_analyzers['import_parser'] = ImportParser(config)
+    _worker_analyzers['complexity'] = ComplexityAnalyzer()
+    _worker_analyzers['quality'] = CodeQualityAnalyzer()
+
+
+def _analyze_chunk(path_strs: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Анализ пакета файлов в рабочем процессе"""
+    return [
+        analyze_file_source(
+            Path(path_str),
+            _worker_analyzers['import_parser'],
+            _worker_analyzers['complexity'],
+            _worker_analyzers['quality']
+        )
+        for path_str in path_strs
+    ]
+
+
+def _throttle_progress(progress_callback: Optional[Callable[[str], None]],
+                       min_interval: float = PROGRESS_MIN_INTERVAL) -> Optional[Callable[[str], None]]:
+    """
+    Ограничивает частоту вызовов progress_callback
+    
+    Промежуточные сообщения, пришедшие раньше min_interval после предыдущего,
+    отбрасываются; сообщения о завершении, ошибке и повторном использовании
+    кэша передаются всегда.
+    """
+    if progress_callback is None:
+        return None
+    
+    monotonic = time.monotonic
+    last_call = [float('-inf')]
+    
+    def throttled(message: str) -> None:
+        now = monotonic()
+        if now - last_call[0] >= min_interval or message.startswith(_FINAL_PROGRESS_PREFIXES):
+            last_call[0] = now
+            progress_callback(message)
+    
+    return throttled
+
+
+def _json_default(obj: Any) -> Any:
+    """Преобразование dataclass для стандартного json"""
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_json_indented(obj: Any, level: int) -> bytes:
+    """
+    Сериализует значение с отступом 2 так, как если бы оно было вложено
+    на указанный уровень (orjson при наличии, иначе стандартный json)
+    """
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+    return data.replace(b'\n', b'\n' + b'  ' * level)
+
+
+def _write_json_items(f, items, is_mapping: bool, level: int) -> None:
+    """Пишет объект или массив JSON поэлементно"""
+    open_bracket, close_bracket = (b'{', b'}') if is_mapping else (b'[', b']')
+    item_indent = b'\n' + b'  ' * (level + 1)
+    
+    f.write(open_bracket)
+    first = True
+    for item in items:
+        f.write(item_indent if first else b',' + item_indent)
+        first = False
+        if is_mapping:
+            key, value = item
+            f.write(_dumps_json_indented(key, level + 1) + b': ')
+            item = value
+        f.write(_dumps_json_indented(item, level + 1))
+    
+    if not first:
+        f.write(b'\n' + b'  ' * level)
+    f.write(close_bracket)
+
+
+def _count_lines(source: bytes) -> int:
+    """Количество строк без декодирования и разбиения на список"""
+    if not source:
+        return 0
+    return source.count(b'\n') + (0 if source.endswith(b'\n') else 1)
+
+
+def _walk_once(tree: ast.AST, max_nodes: int) -> Tuple[List[ast.AST], int, Dict[str, Any]]:
+    """
+    Единственный обход AST файла для всех анализаторов
+    
+    Args:
+        tree: AST дерево файла
+        max_nodes: Лимит узлов, в пределах которого собираются импорты
+        
+    Returns:
+        Кортеж (узлы импортов, цикломатическая сложность, сигналы качества)
+    """
+    import_nodes: List[ast.AST] = []
+    function_nodes: List[ast.AST] = []
+    # Базовая сложность файла, как в ComplexityVisitor
+    complexity = 1
+    
+    for node_count, node in enumerate(ast.walk(tree), 1):
+        node_type = type(node)
+        if node_type in _IMPORT_NODE_TYPES:
+            if node_count <= max_nodes:
+                import_nodes.append(node)
+        elif node_type in _FUNCTION_NODE_TYPES:
+            complexity += 1
+            function_nodes.append(node)
+        elif node_type in _BRANCH_NODE_TYPES:
+            complexity += 1
+    
+    return import_nodes, complexity, {'function_nodes': function_nodes}
+
+
+def analyze_file_source(file_path: Path, import_parser: ImportParser,
+                        complexity_analyzer: ComplexityAnalyzer,
+                        quality_analyzer: CodeQualityAnalyzer,
+                        ast_cache: Optional[AstCache] = None) -> Optional[Dict[str, Any]]:
+    """
+    Читает и разбирает файл один раз и прогоняет его через все анализаторы
+    
+    Args:
+        ast_cache: Кэш, в который сохраняется AST дерево для следующих этапов анализа
+    
+    Returns:
+        Словарь с результатами (None в полях - ошибка соответствующего анализа)
+        или None, если файл не удалось прочитать
+    """
+    try:
+        with open(file_path, 'rb', buffering=FILE_READ_BUFFER_SIZE) as f:
+            source = f.read()
+    except OSError:
+        return None
+    
+    # ast.parse сам декодирует байты с учетом BOM и encoding cookie
+    try:
+        if ast_cache is not None:
+            tree: Optional[ast.AST] = ast_cache.get(file_path, source)
+        else:
+            tree = ast.parse(source, filename=str(file_path))
+    except (OSError, SyntaxError, ValueError):
+        tree = None
+    
+    # Текст нужен анализаторам построчных проверок (как при чтении в текстовом режиме)
+    content = source.decode('utf-8', errors='ignore')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    result: Dict[str, Any] = {
+        'path': str(file_path),
+        'lines': _count_lines(source),
+        'imports': None,
+        'complexity': None,
+        'quality_score': None,
+        'issues': [],
+        'errors': []
+    }
+    
+    # Импорты, сложность и узлы функций собираются за один обход дерева;
+    # без дерева (синтаксическая ошибка) анализаторы обрабатывают файл сами
+    import_nodes = None
+    function_nodes = None
+    complexity = None
+    if tree is not None:
+        import_nodes, complexity, quality_signals = _walk_once(
+            tree, import_parser.security_manager.config.max_ast_nodes
+        )
+        function_nodes = quality_signals['function_nodes']
+    
+    try:
+        result['imports'] = import_parser.parse_imports(
+            content, file_path, tree=tree, import_nodes=import_nodes
+        )
+    except Exception as e:
+        result['errors'].append(f"Ошибка при анализе импортов в {file_path}: {e}")
+    
+    try:
+        if complexity is None:
+            complexity_report = complexity_analyzer.analyze_source(content, file_path, tree=tree)
+            complexity = complexity_report.metrics.cyclomatic_complexity
+        result['complexity'] = complexity
+    except Exception as e:
+        result['errors'].append(f"Ошибка при анализе сложности в {file_path}: {e}")
+    
+    try:
+        quality_report = quality_analyzer.analyze_source(
+            content, file_path, tree=tree, function_nodes=function_nodes
+        )
+        result['quality_score'] = quality_report.overall_score
+        result['issues'] = quality_report.issues if hasattr(quality_report, 'issues') else []
+    except Exception as e:
+        result['errors'].append(f"Ошибка при анализе качества в {file_path}: {e}")
+    
+    return result
+
+
 class IntegratedProjectAnalyzer:
     """Интегрированный анализатор проектов"""
     
@@ -66,12 +372,27 @@ class IntegratedProjectAnalyzer:
         self.quality_analyzer = CodeQualityAnalyzer()
         self.architecture_analyzer = ArchitectureAnalyzer()
         
+        # AST деревья, разобранные за время одного analyze_project
+        self._ast_cache = AstCache()
+        
         # Результаты анализа
         self.project_stats = ProjectStats()
         self.libraries_info: Dict[str, LibraryInfo] = {}
         self.files_analysis: List[FileAnalysis] = []
-        self.dependency_graph: Dict[str, List[str]] = {}
+        self._file_analysis_by_path: Dict[str, FileAnalysis] = {}
+        self._running_total_lines = 0
+        self.dependency_graph: Dict[str, frozenset] = {}
         self.architecture_data: Dict[str, Any] = {}
+    
+    def _reset_results(self) -> None:
+        """Сбрасывает результаты предыдущего анализа"""
+        self.project_stats = ProjectStats()
+        self.libraries_info = {}
+        self.files_analysis = []
+        self._file_analysis_by_path = {}
+        self._running_total_lines = 0
+        self.dependency_graph = {}
+        self.architecture_data = {}
         
     def analyze_project(self, project_path: Path, progress_callback=None) -> Dict[str, Any]:
         """
@@ -86,6 +407,8 @@ class IntegratedProjectAnalyzer:
         """
         start_time = time.time()
         self.logger.info(f"Начало полного анализа проекта: {project_path}")
+        self._reset_results()
+        progress_callback = _throttle_progress(progress_callback)
         
         if progress_callback:
             progress_callback("🔍 Начинаю анализ проекта...")
@@ -98,43 +421,35 @@ class IntegratedProjectAnalyzer:
             if progress_callback:
                 progress_callback(f"📁 Найдено {len(python_files)} Python файлов")
             
-            # 2. Анализ импортов
+            # 2. Анализ файлов: импорты, сложность и качество за один проход
             if progress_callback:
-                progress_callback("📦 Анализ импортов...")
+                progress_callback("🔬 Анализ файлов...")
             
-            imports_data = self._analyze_imports(python_files, progress_callback)
-            
-            # 3. Анализ сложности
-            if progress_callback:
-                progress_callback("📊 Анализ сложности кода...")
-            
-            complexity_data = self._analyze_complexity(python_files, progress_callback)
-            
-            # 4. Анализ качества
-            if progress_callback:
-                progress_callback("✨ Анализ качества кода...")
-            
-            quality_data = self._analyze_quality(python_files, progress_callback)
+            imports_data, complexity_data, quality_data = self._analyze_files_fused(
+                python_files, progress_callback, project_path
+            )
             
-            # 5. Анализ архитектуры
+            # 3. Анализ архитектуры
             if progress_callback:
                 progress_callback("🏗️ Анализ архитектуры...")
             
             architecture_data = self._analyze_architecture(project_path, progress_callback)
             
-            # 6. Анализ зависимостей
+            # 4. Анализ зависимостей
             if progress_callback:
                 progress_callback("🔗 Анализ зависимостей...")
             
-            dependency_data = self._analyze_dependencies(project_path, progress_callback)
+            dependency_data = self._analyze_dependencies(
+                project_path, imports_data['file_imports'], progress_callback
+            )
             
-            # 7. Сборка итоговой статистики
+            # 5. Сборка итоговой статистики
             if progress_callback:
                 progress_callback("📈 Сборка статистики...")
             
             self._build_final_stats(imports_data, complexity_data, quality_data)
             
-            # 8. Расчет времени
+            # 6. Расчет времени
             self.project_stats.scan_duration = time.time() - start_time
             
             if progress_callback:
@@ -148,144 +463,279 @@ class IntegratedProjectAnalyzer:
             if progress_callback:
                 progress_callback(f"❌ Ошибка: {e}")
             raise
+        finally:
+            self._ast_cache.clear()
     
     def _find_python_files(self, project_path: Path) -> List[Path]:
         """Поиск всех Python файлов в проекте"""
-        python_files = []
-        excluded_dirs = {'.git', '__pycache__', '.pytest_cache', 'venv', 'env', 'node_modules'}
+        return [Path(path) for path in _iter_python_files(str(project_path))]
+    
+    def _analyze_files(self, python_files: List[Path], progress_callback=None,
+                       project_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """
+        Анализ всех файлов проекта
+        
+        Файлы, не изменившиеся с прошлого запуска (совпадают mtime и размер),
+        берутся из кэша сканирования проекта, остальные анализируются заново.
+        """
+        use_scan_cache = (
+            project_path is not None
+            and self.config.get_performance_config().get('cache_scan_results', True)
+        )
+        if not use_scan_cache:
+            results = self._run_file_analysis(python_files, progress_callback)
+            return self._log_file_errors([result for result in results if result is not None])
         
-        for root, dirs, files in os.walk(project_path):
-            # Исключаем ненужные директории
-            dirs[:] = [d for d in dirs if d not in excluded_dirs]
+        cached_files = self._load_scan_cache(project_path)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(python_files)
+        file_stats: Dict[str, List[int]] = {}
+        pending_indices: List[int] = []
+        
+        for index, file_path in enumerate(python_files):
+            path_str = str(file_path)
+            try:
+                stat_result = os.stat(path_str)
+            except OSError:
+                pending_indices.append(index)
+                continue
             
-            for file in files:
-                if file.endswith('.py'):
-                    python_files.append(Path(root) / file)
+            file_stat = [stat_result.st_mtime_ns, stat_result.st_size]
+            file_stats[path_str] = file_stat
+            entry = cached_files.get(path_str)
+            if entry is not None and entry.get('stat') == file_stat:
+                results[index] = {**entry['result'], 'path': path_str, 'errors': []}
+            else:
+                pending_indices.append(index)
+        
+        reused = len(python_files) - len(pending_indices)
+        if progress_callback and reused:
+            progress_callback(f"♻️ Без изменений (из кэша): {reused} из {len(python_files)} файлов")
         
-        return python_files
+        if pending_indices:
+            fresh_results = self._run_file_analysis(
+                [python_files[index] for index in pending_indices], progress_callback
+            )
+            for index, result in zip(pending_indices, fresh_results):
+                results[index] = result
+        
+        results = [result for result in results if result is not None]
+        self._save_scan_cache(project_path, results, file_stats)
+        return self._log_file_errors(results)
     
-    def _analyze_imports(self, python_files: List[Path], progress_callback=None) -> Dict[str, Any]:
-        """Анализ импортов во всех файлах"""
-        all_imports = []
-        file_imports = {}
+    def _run_file_analysis(self, python_files: List[Path],
+                           progress_callback=None) -> List[Optional[Dict[str, Any]]]:
+        """Анализ файлов (в пуле процессов для больших проектов), порядок сохраняется"""
+        workers = os.cpu_count() or 1
+        if len(python_files) >= PARALLEL_MIN_FILES and workers > 1:
+            try:
+                return self._analyze_files_parallel(python_files, workers, progress_callback)
+            except Exception as e:
+                self.logger.warning(f"Параллельный анализ недоступен, выполняю последовательно: {e}")
         
+        results = []
         for i, file_path in enumerate(python_files):
             if progress_callback and i % 10 == 0:
-                progress_callback(f"📦 Анализ импортов: {i+1}/{len(python_files)}")
+                progress_callback(f"🔬 Анализ файлов: {i+1}/{len(python_files)}")
             
-            try:
-                imports = self.import_parser.parse_imports(
-                    file_path.read_text(encoding='utf-8', errors='ignore'),
-                    file_path
-                )
-                all_imports.extend(imports)
-                file_imports[str(file_path)] = imports
-            except Exception as e:
-                self.logger.warning(f"Ошибка при анализе импортов в {file_path}: {e}")
+            results.append(analyze_file_source(
+                file_path, self.import_parser, self.complexity_analyzer, self.quality_analyzer,
+                self._ast_cache
+            ))
         
-        # Подсчет статистики
-        import_counter = Counter(all_imports)
-        total_imports = len(all_imports)
-        unique_libraries = len(import_counter)
+        return results
+    
+    def _analyze_files_parallel(self, python_files: List[Path], workers: int,
+                                progress_callback=None) -> List[Optional[Dict[str, Any]]]:
+        """Анализ файлов в пуле процессов с сохранением исходного порядка"""
+        path_strs = [str(file_path) for file_path in python_files]
+        chunks = [path_strs[i:i + PARALLEL_CHUNK_SIZE]
+                  for i in range(0, len(path_strs), PARALLEL_CHUNK_SIZE)]
+        chunk_results: List[List[Optional[Dict[str, Any]]]] = [[] for _ in chunks]
         
-        # Создание информации о библиотеках
-        for lib_name, count in import_counter.most_common():
-            percentage = (count / total_imports * 100) if total_imports > 0 else 0
-            files_using_lib = [f for f, imports in file_imports.items() if lib_name in imports]
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 initializer=_init_worker,
+                                 initargs=(self.config,)) as executor:
+            futures = {executor.submit(_analyze_chunk, chunk): index
+                       for index, chunk in enumerate(chunks)}
             
-            self.libraries_info[lib_name] = LibraryInfo(
-                name=lib_name,
-                count=count,
-                percentage=percentage,
-                files=files_using_lib,
-                first_occurrence=files_using_lib[0] if files_using_lib else ""
-            )
+            done_files = 0
+            for future in as_completed(futures):
+                index = futures[future]
+                chunk_results[index] = future.result()
+                done_files += len(chunks[index])
+                if progress_callback:
+                    progress_callback(f"🔬 Анализ файлов: {done_files}/{len(python_files)}")
         
-        return {
-            'total_imports': total_imports,
-            'unique_libraries': unique_libraries,
-            'libraries_info': self.libraries_info,
-            'file_imports': file_imports
+        return [result for chunk in chunk_results for result in chunk]
+    
+    def _scan_cache_settings(self) -> str:
+        """Отпечаток настроек, влияющих на результаты анализа файлов"""
+        excluded = '\n'.join(sorted(self.config.get_excluded_libraries()))
+        return hashlib.md5(excluded.encode('utf-8')).hexdigest()
+    
+    def _load_scan_cache(self, project_path: Path) -> Dict[str, Any]:
+        """Загружает кэш сканирования проекта (пустой, если он отсутствует или устарел)"""
+        cache_path = Path(project_path) / SCAN_CACHE_FILE
+        try:
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+            cache = orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            return {}
+        
+        if (not isinstance(cache, dict)
+                or cache.get('version') != SCAN_CACHE_VERSION
+                or cache.get('settings') != self._scan_cache_settings()
+                or not isinstance(cache.get('files'), dict)):
+            return {}
+        return cache['files']
+    
+    def _save_scan_cache(self, project_path: Path, results: List[Dict[str, Any]],
+                         file_stats: Dict[str, List[int]]) -> None:
+        """Сохраняет кэш сканирования проекта (файлы с ошибками анализа не кэшируются)"""
+        files = {}
+        for result in results:
+            file_stat = file_stats.get(result['path'])
+            if file_stat is None or result['errors']:
+                continue
+            files[result['path']] = {
+                'stat': file_stat,
+                'result': {key: result[key] for key in SCAN_CACHE_RESULT_KEYS}
+            }
+        
+        cache = {
+            'version': SCAN_CACHE_VERSION,
+            'settings': self._scan_cache_settings(),
+            'files': files
         }
+        cache_path = Path(project_path) / SCAN_CACHE_FILE
+        try:
+            if orjson is not None:
+                data = orjson.dumps(cache)
+            else:
+                data = json.dumps(cache, ensure_ascii=False).encode('utf-8')
+            with open(cache_path, 'wb') as f:
+                f.write(data)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.debug(f"Не удалось сохранить кэш сканирования (path: {cache_path}, error: {e})")
+    
+    def _log_file_errors(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Логирует ошибки анализа отдельных файлов"""
+        for result in results:
+            for error in result['errors']:
+                self.logger.warning(error)
+        return results
     
-    def _analyze_complexity(self, python_files: List[Path], progress_callback=None) -> Dict[str, Any]:
-        """Анализ сложности кода"""
+    def _analyze_files_fused(self, python_files: List[Path], progress_callback=None,
+                             project_path: Optional[Path] = None
+                             ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Анализ файлов и сбор импортов, сложности и качества за один проход
+        
+        Returns:
+            Кортеж (imports_data, complexity_data, quality_data)
+        """
+        file_results = self._analyze_files(python_files, progress_callback, project_path)
+        
+        if progress_callback:
+            progress_callback("📊 Сбор статистики импортов, сложности и качества...")
+        
+        import_counter: Counter = Counter()
+        file_imports = {}
+        files_by_lib: Dict[str, List[str]] = defaultdict(list)
         complexity_scores = []
+        quality_scores = []
         
-        for i, file_path in enumerate(python_files):
-            if progress_callback and i % 10 == 0:
-                progress_callback(f"📊 Анализ сложности: {i+1}/{len(python_files)}")
+        for result in file_results:
+            path = result['path']
+            imports = result['imports']
+            complexity = result['complexity']
+            quality_score = result['quality_score']
             
-            try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-                # Используем правильный метод analyze_file
-                complexity_report = self.complexity_analyzer.analyze_file(file_path)
-                complexity = complexity_report.metrics.cyclomatic_complexity
+            if imports is not None:
+                import_counter.update(imports)
+                
+                # Обратный индекс библиотека -> файлы строится за один проход
+                unique_imports = set(imports)
+                file_imports[path] = unique_imports
+                for lib_name in unique_imports:
+                    files_by_lib[lib_name].append(path)
+            
+            if quality_score is not None:
+                quality_scores.append(quality_score)
+            
+            if complexity is not None:
                 complexity_scores.append(complexity)
                 
-                # Обновляем анализ файла
+                # Анализ файла заполняется сразу, без последующего поиска по списку
                 file_analysis = FileAnalysis(
-                    path=str(file_path),
-                    lines=len(content.splitlines()),
-                    imports=[],  # Будет заполнено позже
+                    path=path,
+                    lines=result['lines'],
+                    imports=[],
                     complexity=complexity,
-                    quality_score=0.0,  # Будет заполнено позже
-                    issues=[]
+                    quality_score=quality_score if quality_score is not None else 0.0,
+                    issues=result['issues'] if quality_score is not None else []
                 )
                 self.files_analysis.append(file_analysis)
-                
-            except Exception as e:
-                self.logger.warning(f"Ошибка при анализе сложности в {file_path}: {e}")
+                self._file_analysis_by_path[path] = file_analysis
+                self._running_total_lines += file_analysis.lines
         
-        avg_complexity = sum(complexity_scores) / len(complexity_scores) if complexity_scores else 0
+        imports_data = self._build_imports_data(import_counter, file_imports, files_by_lib)
         
-        return {
-            'average_complexity': avg_complexity,
+        complexity_data = {
+            'average_complexity': sum(complexity_scores) / len(complexity_scores) if complexity_scores else 0,
             'complexity_scores': complexity_scores,
             'max_complexity': max(complexity_scores) if complexity_scores else 0,
             'min_complexity': min(complexity_scores) if complexity_scores else 0
         }
+        
+        quality_data = {
+            'average_quality': sum(quality_scores) / len(quality_scores) if quality_scores else 0,
+            'quality_scores': quality_scores,
+            'quality_distribution': self._calculate_quality_distribution(quality_scores)
+        }
+        
+        return imports_data, complexity_data, quality_data
     
-    def _analyze_quality(self, python_files: List[Path], progress_callback=None) -> Dict[str, Any]:
-        """Анализ качества кода"""
-        quality_scores = []
+    def _build_imports_data(self, import_counter: Counter, file_imports: Dict[str, set],
+                            files_by_lib: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Подсчет статистики импортов и заполнение информации о библиотеках"""
+        total_imports = sum(import_counter.values())
+        unique_libraries = len(import_counter)
         
-        for i, file_path in enumerate(python_files):
-            if progress_callback and i % 10 == 0:
-                progress_callback(f"✨ Анализ качества: {i+1}/{len(python_files)}")
+        # Создание информации о библиотеках
+        for lib_name, count in import_counter.most_common():
+            percentage = (count / total_imports * 100) if total_imports > 0 else 0
+            files_using_lib = files_by_lib[lib_name]
             
-            try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-                # Используем правильный метод analyze_file
-                quality_report = self.quality_analyzer.analyze_file(file_path)
-                quality_score = quality_report.overall_score
-                quality_scores.append(quality_score)
-                
-                # Обновляем анализ файла
-                for file_analysis in self.files_analysis:
-                    if file_analysis.path == str(file_path):
-                        file_analysis.quality_score = quality_score
-                        file_analysis.issues = quality_report.issues if hasattr(quality_report, 'issues') else []
-                        break
-                
-            except Exception as e:
-                self.logger.warning(f"Ошибка при анализе качества в {file_path}: {e}")
-        
-        avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
+            self.libraries_info[lib_name] = LibraryInfo(
+                name=lib_name,
+                count=count,
+                percentage=percentage,
+                files=files_using_lib,
+                first_occurrence=files_using_lib[0] if files_using_lib else ""
+            )
         
         return {
-            'average_quality': avg_quality,
-            'quality_scores': quality_scores,
-            'quality_distribution': self._calculate_quality_distribution(quality_scores)
+            'total_imports': total_imports,
+            'unique_libraries': unique_libraries,
+            'libraries_info': self.libraries_info,
+            'file_imports': file_imports
         }
     
+    def get_file_analysis(self, file_path) -> Optional[FileAnalysis]:
+        """Возвращает анализ файла по пути из последнего анализа проекта"""
+        return self._file_analysis_by_path.get(str(file_path))
+    
     def _analyze_architecture(self, project_path: Path, progress_callback=None) -> Dict[str, Any]:
         """Анализ архитектуры проекта"""
         if progress_callback:
             progress_callback("🏗️ Анализ архитектуры проекта...")
         
         try:
-            architecture_result = self.architecture_analyzer.analyze_project(project_path)
+            architecture_result = self.architecture_analyzer.analyze_project(
+                project_path, ast_cache=self._ast_cache
+            )
             # Преобразуем результат в словарь
             self.architecture_data = {
                 'modules': len(architecture_result.modules) if hasattr(architecture_result, 'modules') else 0,
@@ -298,41 +748,27 @@ class IntegratedProjectAnalyzer:
             self.logger.error(f"Ошибка при анализе архитектуры: {e}")
             return {}
     
-    def _analyze_dependencies(self, project_path: Path, progress_callback=None) -> Dict[str, Any]:
-        """Анализ зависимостей проекта"""
+    def _analyze_dependencies(self, project_path: Path, file_imports: Dict[str, set],
+                              progress_callback=None) -> Dict[str, Any]:
+        """Анализ зависимостей проекта (по уже найденным импортам файлов)"""
         if progress_callback:
             progress_callback("🔗 Анализ зависимостей...")
         
-        try:
-            # Создаем простой граф зависимостей на основе импортов
-            dependency_graph = {}
-            
-            # Анализируем импорты в каждом файле
-            for file_analysis in self.files_analysis:
-                file_path = Path(file_analysis.path)
-                module_name = file_path.stem
-                
-                # Получаем импорты для этого файла
-                try:
-                    imports = self.import_parser.parse_imports(
-                        file_path.read_text(encoding='utf-8', errors='ignore'),
-                        file_path
-                    )
-                    dependency_graph[module_name] = list(set(imports))
-                except Exception as e:
-                    self.logger.warning(f"Ошибка при анализе зависимостей в {file_path}: {e}")
-                    dependency_graph[module_name] = []
-            
-            self.dependency_graph = dependency_graph
-            
-            return {
-                'dependency_graph': dependency_graph,
-                'total_modules': len(dependency_graph),
-                'total_dependencies': sum(len(deps) for deps in dependency_graph.values())
-            }
-        except Exception as e:
-            self.logger.error(f"Ошибка при анализе зависимостей: {e}")
-            return {}
+        # Граф зависимостей строится из импортов, собранных при анализе файлов.
+        # Ключ - путь относительно проекта: одноименные модули (например, разные
+        # __init__.py) не перезаписывают друг друга
+        project_path = Path(project_path)
+        dependency_graph: Dict[str, frozenset] = {}
+        for path, imports in file_imports.items():
+            key = str(Path(path).relative_to(project_path))
+            dependency_graph[key] = dependency_graph.get(key, frozenset()) | frozenset(imports)
+        self.dependency_graph = dependency_graph
+        
+        return {
+            'dependency_graph': dependency_graph,
+            'total_modules': len(dependency_graph),
+            'total_dependencies': sum(map(len, dependency_graph.values()))
+        }
     
     def _build_final_stats(self, imports_data, complexity_data, quality_data):
         """Сборка итоговой статистики"""
@@ -341,33 +777,23 @@ class IntegratedProjectAnalyzer:
         self.project_stats.average_complexity = complexity_data['average_complexity']
         self.project_stats.quality_score = quality_data['average_quality']
         
-        # Подсчет общего количества строк
-        total_lines = sum(file_analysis.lines for file_analysis in self.files_analysis)
-        self.project_stats.total_lines = total_lines
+        # Общее количество строк накоплено при сборе анализа файлов
+        self.project_stats.total_lines = self._running_total_lines
     
     def _calculate_quality_distribution(self, quality_scores: List[float]) -> Dict[str, int]:
         """Расчет распределения качества"""
-        distribution = {
-            'excellent': 0,  # 90-100
-            'good': 0,       # 70-89
-            'fair': 0,       # 50-69
-            'poor': 0,       # 30-49
-            'very_poor': 0   # 0-29
-        }
-        
-        for score in quality_scores:
-            if score >= 90:
-                distribution['excellent'] += 1
-            elif score >= 70:
-                distribution['good'] += 1
-            elif score >= 50:
-                distribution['fair'] += 1
-            elif score >= 30:
-                distribution['poor'] += 1
-            else:
-                distribution['very_poor'] += 1
+        # Индекс корзины = количество границ, не превышающих оценку
+        scores = np.asarray(quality_scores, dtype=np.float64)
+        indices = np.searchsorted(QUALITY_BUCKET_EDGES, scores, side='right')
+        counts = np.bincount(indices, minlength=len(QUALITY_BUCKETS)).tolist()
         
-        return distribution
+        return {
+            'excellent': counts[4],  # 90-100
+            'good': counts[3],       # 70-89
+            'fair': counts[2],       # 50-69
+            'poor': counts[1],       # 30-49
+            'very_poor': counts[0]   # 0-29
+        }
     
     def _generate_comprehensive_report(self) -> Dict[str, Any]:
         """Генерация комплексного отчета"""
@@ -375,7 +801,15 @@ class IntegratedProjectAnalyzer:
             'project_stats': asdict(self.project_stats),
             'libraries_info': {name: asdict(info) for name, info in self.libraries_info.items()},
             'files_analysis': [asdict(analysis) for analysis in self.files_analysis],
-            'dependency_graph': self.dependency_graph,
+            **self._generate_report_summary()
+        }
+    
+    def _generate_report_summary(self) -> Dict[str, Any]:
+        """Сводные разделы отчета (без поэлементных данных о библиотеках и файлах)"""
+        return {
+            'dependency_graph': {
+                module: sorted(dependencies) for module, dependencies in self.dependency_graph.items()
+            },
             'architecture_data': self.architecture_data,
             'top_libraries': self._get_top_libraries(10),
             'quality_distribution': self._calculate_quality_distribution(
@@ -387,89 +821,108 @@ class IntegratedProjectAnalyzer:
     
     def _get_top_libraries(self, count: int = 10) -> List[Dict[str, Any]]:
         """Получение топ библиотек"""
-        sorted_libraries = sorted(
-            self.libraries_info.values(),
-            key=lambda x: x.count,
-            reverse=True
-        )
+        # nlargest дает тот же результат, что sorted(..., reverse=True)[:count]
+        top_libraries = heapq.nlargest(count, self.libraries_info.values(), key=lambda x: x.count)
         
-        return [asdict(lib) for lib in sorted_libraries[:count]]
+        return [asdict(lib) for lib in top_libraries]
     
     def _calculate_complexity_distribution(self) -> Dict[str, int]:
         """Расчет распределения сложности"""
-        distribution = {
-            'very_low': 0,   # 0-5
-            'low': 0,        # 6-10
-            'medium': 0,     # 11-20
-            'high': 0,       # 21-30
-            'very_high': 0   # 30+
-        }
-        
-        for file_analysis in self.files_analysis:
-            complexity = file_analysis.complexity
-            if complexity <= 5:
-                distribution['very_low'] += 1
-            elif complexity <= 10:
-                distribution['low'] += 1
-            elif complexity <= 20:
-                distribution['medium'] += 1
-            elif complexity <= 30:
-                distribution['high'] += 1
-            else:
-                distribution['very_high'] += 1
+        # Индекс корзины = количество границ, строго меньших сложности
+        complexities = np.fromiter(
+            (file_analysis.complexity for file_analysis in self.files_analysis),
+            dtype=np.float64, count=len(self.files_analysis)
+        )
+        indices = np.searchsorted(COMPLEXITY_BUCKET_EDGES, complexities, side='left')
+        counts = np.bincount(indices, minlength=len(COMPLEXITY_BUCKETS)).tolist()
         
-        return distribution
+        return dict(zip(COMPLEXITY_BUCKETS, counts))
     
-    def export_report(self, output_path: Path, format: str = 'json') -> None:
-        """Экспорт отчета в файл"""
-        report = self._generate_comprehensive_report()
+    def export_report(self, output_path: Path, format: str = 'json',
+                      report: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Экспорт отчета в файл
         
+        Если передан готовый отчет (результат analyze_project), экспортируется он,
+        иначе - текущее состояние анализатора.
+        """
         if format.lower() == 'json':
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            if report is None:
+                self.export_report_streaming(output_path)
+            else:
+                Path(output_path).write_bytes(_dumps_json_indented(report, 0))
         elif format.lower() == 'txt':
-            self._export_text_report(output_path, report)
+            self._export_text_report(output_path, report or self._generate_comprehensive_report())
         
         self.logger.info(f"Отчет экспортирован в {output_path}")
     
-    def _export_text_report(self, output_path: Path, report: Dict[str, Any]) -> None:
-        """Экспорт отчета в текстовом формате"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("=" * 60 + "\n")
-            f.write("ОТЧЕТ ОБ АНАЛИЗЕ ПРОЕКТА\n")
-            f.write("=" * 60 + "\n\n")
+    def export_report_streaming(self, output_path: Path) -> None:
+        """
+        Потоковый экспорт отчета в JSON
+        
+        Записи libraries_info и files_analysis сериализуются и пишутся по одной,
+        без построения полного словаря отчета и всего JSON в памяти. Результат
+        совпадает с json.dump(report, indent=2, ensure_ascii=False).
+        """
+        with open(output_path, 'wb') as f:
+            f.write(b'{\n  "project_stats": ')
+            f.write(_dumps_json_indented(self.project_stats, 1))
             
-            # Общая статистика
-            stats = report['project_stats']
-            f.write("📊 ОБЩАЯ СТАТИСТИКА:\n")
-            f.write(f"   Всего файлов: {stats['total_files']}\n")
-            f.write(f"   Всего строк: {stats['total_lines']}\n")
-            f.write(f"   Всего импортов: {stats['total_imports']}\n")
-            f.write(f"   Уникальных библиотек: {stats['unique_libraries']}\n")
-            f.write(f"   Средняя сложность: {stats['average_complexity']:.2f}\n")
-            f.write(f"   Среднее качество: {stats['quality_score']:.2f}\n")
-            f.write(f"   Время анализа: {stats['scan_duration']:.2f}с\n\n")
+            f.write(b',\n  "libraries_info": ')
+            _write_json_items(f, self.libraries_info.items(), is_mapping=True, level=1)
             
-            # Топ библиотек
-            f.write("🏆 ТОП-10 БИБЛИОТЕК:\n")
-            for i, lib in enumerate(report['top_libraries'], 1):
-                f.write(f"   {i:2d}. {lib['name']:20s} - {lib['count']:4d} ({lib['percentage']:5.1f}%)\n")
-            f.write("\n")
+            f.write(b',\n  "files_analysis": ')
+            _write_json_items(f, self.files_analysis, is_mapping=False, level=1)
             
-            # Распределение качества
-            f.write("✨ РАСПРЕДЕЛЕНИЕ КАЧЕСТВА:\n")
-            quality_dist = report['quality_distribution']
-            f.write(f"   Отличное (90-100): {quality_dist['excellent']}\n")
-            f.write(f"   Хорошее (70-89): {quality_dist['good']}\n")
-            f.write(f"   Удовлетворительное (50-69): {quality_dist['fair']}\n")
-            f.write(f"   Плохое (30-49): {quality_dist['poor']}\n")
-            f.write(f"   Очень плохое (0-29): {quality_dist['very_poor']}\n\n")
+            for key, value in self._generate_report_summary().items():
+                f.write(b',\n  ' + _dumps_json_indented(key, 1) + b': ')
+                f.write(_dumps_json_indented(value, 1))
             
-            # Распределение сложности
-            f.write("📊 РАСПРЕДЕЛЕНИЕ СЛОЖНОСТИ:\n")
-            complexity_dist = report['complexity_distribution']
-            f.write(f"   Очень низкая (0-5): {complexity_dist['very_low']}\n")
-            f.write(f"   Низкая (6-10): {complexity_dist['low']}\n")
-            f.write(f"   Средняя (11-20): {complexity_dist['medium']}\n")
-            f.write(f"   Высокая (21-30): {complexity_dist['high']}\n")
-            f.write(f"   Очень высокая (30+): {complexity_dist['very_high']}\n\n")
+            f.write(b'\n}')
+    
+    def _export_text_report(self, output_path: Path, report: Dict[str, Any]) -> None:
+        """Экспорт отчета в текстовом формате"""
+        parts: List[str] = []
+        
+        parts.append("=" * 60 + "\n")
+        parts.append("ОТЧЕТ ОБ АНАЛИЗЕ ПРОЕКТА\n")
+        parts.append("=" * 60 + "\n\n")
+        
+        # Общая статистика
+        stats = report['project_stats']
+        parts.append("📊 ОБЩАЯ СТАТИСТИКА:\n")
+        parts.append(f"   Всего файлов: {stats['total_files']}\n")
+        parts.append(f"   Всего строк: {stats['total_lines']}\n")
+        parts.append(f"   Всего импортов: {stats['total_imports']}\n")
+        parts.append(f"   Уникальных библиотек: {stats['unique_libraries']}\n")
+        parts.append(f"   Средняя сложность: {stats['average_complexity']:.2f}\n")
+        parts.append(f"   Среднее качество: {stats['quality_score']:.2f}\n")
+        parts.append(f"   Время анализа: {stats['scan_duration']:.2f}с\n\n")
+        
+        # Топ библиотек
+        parts.append("🏆 ТОП-10 БИБЛИОТЕК:\n")
+        for i, lib in enumerate(report['top_libraries'], 1):
+            parts.append(f"   {i:2d}. {lib['name']:20s} - {lib['count']:4d} ({lib['percentage']:5.1f}%)\n")
+        parts.append("\n")
+        
+        # Распределение качества
+        parts.append("✨ РАСПРЕДЕЛЕНИЕ КАЧЕСТВА:\n")
+        quality_dist = report['quality_distribution']
+        parts.append(f"   Отличное (90-100): {quality_dist['excellent']}\n")
+        parts.append(f"   Хорошее (70-89): {quality_dist['good']}\n")
+        parts.append(f"   Удовлетворительное (50-69): {quality_dist['fair']}\n")
+        parts.append(f"   Плохое (30-49): {quality_dist['poor']}\n")
+        parts.append(f"   Очень плохое (0-29): {quality_dist['very_poor']}\n\n")
+        
+        # Распределение сложности
+        parts.append("📊 РАСПРЕДЕЛЕНИЕ СЛОЖНОСТИ:\n")
+        complexity_dist = report['complexity_distribution']
+        parts.append(f"   Очень низкая (0-5): {complexity_dist['very_low']}\n")
+        parts.append(f"   Низкая (6-10): {complexity_dist['low']}\n")
+        parts.append(f"   Средняя (11-20): {complexity_dist['medium']}\n")
+        parts.append(f"   Высокая (21-30): {complexity_dist['high']}\n")
+        parts.append(f"   Очень высокая (30+): {complexity_dist['very_high']}\n\n")
+        
+        # Отчет собирается целиком и записывается одним вызовом
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
@@ -1,27 +1,197 @@
 """
 Главный сервис для координации сканирования с паттернами проектирования
 """
+import os
+import stat
+import logging
+import threading
+from datetime import datetime
+import functools
+from collections import Counter
+from concurrent.futures import (
+    ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+)
 from pathlib import Path
-from typing import Optional, Callable, Dict, List, Any, Tuple
-from .interfaces import ScanResult, IProgressReporter
-from .configuration import Configuration
+from typing import Optional, Callable, Dict, List, Any, Tuple, Iterator, Set, TYPE_CHECKING
+from .interfaces import ScanResult, ImportData
+from .configuration import Configuration, cached_property
 from .import_parser import ImportParser
 from .project_analyzer import ProjectAnalyzer
 from .file_scanner import FileScanner
-from .data_exporter import DataExporter
 from .logging_config import setup_logging, get_logger, LogConfig
-from .security import SecurityManager, SecurityConfig
-from .performance import PerformanceManager, PerformanceConfig
+from .security import SecurityManager
 from .patterns import (
     ComponentFactory, ComponentType, ScanningStrategyFactory,
-    ScanSubject, ProgressObserver, LoggingObserver, MetricsObserver,
+    ScanSubject, ScanEventType, ProgressObserver, LoggingObserver, MetricsObserver,
     ScanConfigurationBuilder, ScanConfiguration
 )
-from .complexity_analyzer import ComplexityAnalyzer, ProjectComplexityReport
 from .code_quality_analyzer import CodeQualityAnalyzer, ProjectQualityReport
 from .dependency_analyzer import DependencyAnalyzer, DependencyReport
 from .architecture_analyzer import ArchitectureAnalyzer, ArchitectureReport
 
+if TYPE_CHECKING:
+    # Тяжелые модули (pandas/openpyxl, psutil) загружаются при первом обращении
+    from .data_exporter import DataExporter
+    from .performance import PerformanceManager
+    from .complexity_analyzer import (
+        ComplexityAnalyzer, ProjectComplexityReport, FileComplexityReport
+    )
+
+
+PARALLEL_WALK_MAX_WORKERS = 32
+
+# Суффиксы имен файлов экспорта по форматам (в порядке экспорта)
+_EXT_MAP: Dict[str, str] = {
+    'csv': '.csv',
+    'json': '.json',
+    'excel': '.xlsx',
+    'txt': '_report.txt',
+    'imports_csv': '_imports.csv',
+}
+
+
+def _scan_dir(path: str) -> Tuple[List[str], List[str]]:
+    """
+    Читает одну директорию через os.scandir
+    
+    Тип записи берется из уже прочитанного dirent, поэтому дополнительные
+    вызовы stat() не выполняются. Недоступные директории пропускаются,
+    как и в Path.rglob.
+    
+    Args:
+        path: Директория для чтения
+        
+    Returns:
+        Кортеж (Python файлы, поддиректории)
+    """
+    files: List[str] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith('.py'):
+                        files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def _iter_py_files(root: str) -> Iterator[str]:
+    """
+    Рекурсивно перечисляет Python файлы в одном потоке
+    
+    Args:
+        root: Корневая директория
+        
+    Yields:
+        Пути к Python файлам
+    """
+    stack: List[str] = [root]
+    while stack:
+        files, subdirs = _scan_dir(stack.pop())
+        yield from files
+        stack.extend(subdirs)
+
+
+def _parallel_walk(root: str, max_workers: int = PARALLEL_WALK_MAX_WORKERS) -> Iterator[str]:
+    """
+    Рекурсивно перечисляет Python файлы, читая директории в пуле потоков
+    
+    Чтение директорий независимо и упирается в задержки файловой системы
+    (сетевые ФС), поэтому каждая директория читается отдельной задачей,
+    а найденные поддиректории отправляются в пул по мере готовности.
+    Координация выполняется в вызывающем потоке: при досрочном завершении
+    генератора оставшиеся задачи отменяются.
+    
+    Args:
+        root: Корневая директория
+        max_workers: Количество потоков
+        
+    Yields:
+        Пути к Python файлам
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending: Set[Future] = {executor.submit(_scan_dir, root)}
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                for subdir in subdirs:
+                    pending.add(executor.submit(_scan_dir, subdir))
+                yield from files
+    finally:
+        # shutdown(cancel_futures=True) доступен только с Python 3.9
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _walk_python_files(path_str: str, count_files: bool,
+                       parallel_workers: int) -> Tuple[str, ...]:
+    """
+    Ищет Python файлы в директории
+    
+    Args:
+        path_str: Путь к директории
+        count_files: Подсчитать все файлы вместо остановки на первом
+        parallel_workers: Количество потоков обхода (0 - обход в одном потоке)
+        
+    Returns:
+        Отсортированные пути к Python файлам (без count_files - не более одного)
+    """
+    python_files: Iterator[str] = (
+        _parallel_walk(path_str, parallel_workers) if parallel_workers
+        else _iter_py_files(path_str)
+    )
+    if not count_files:
+        first_file: Optional[str] = next(python_files, None)
+        return () if first_file is None else (first_file,)
+    return tuple(sorted(python_files))
+
+
+@functools.lru_cache(maxsize=32)
+def _validate_directory_cached(path_str: str, mtime_ns: int,
+                               parallel_workers: int) -> Tuple[str, ...]:
+    """
+    Проверяет наличие хотя бы одного Python файла (результат кэшируется)
+    
+    Ключ кэша включает st_mtime_ns корневой директории, который не меняется
+    при изменениях в поддиректориях, поэтому результат может устареть.
+    Кэшируется только дешевая проверка наличия файлов; полный список
+    (count_files) всегда собирается новым обходом.
+    
+    Args:
+        path_str: Путь к директории
+        mtime_ns: Время модификации директории (только для ключа кэша)
+        parallel_workers: Количество потоков обхода (0 - обход в одном потоке)
+        
+    Returns:
+        Путь к первому найденному Python файлу или пустой кортеж
+    """
+    return _walk_python_files(path_str, False, parallel_workers)
+
+
+# Минимальное количество файлов для анализа сложности в пуле процессов
+PARALLEL_COMPLEXITY_MIN_FILES = 16
+
+# Анализатор сложности процесса-воркера (создается при первом вызове)
+_worker_complexity_analyzer: Optional['ComplexityAnalyzer'] = None
+
+
+def _analyze_one(path: str) -> 'FileComplexityReport':
+    """Анализирует сложность одного файла в процессе-воркере"""
+    global _worker_complexity_analyzer
+    if _worker_complexity_analyzer is None:
+        from .complexity_analyzer import ComplexityAnalyzer
+        _worker_complexity_analyzer = ComplexityAnalyzer()
+    return _worker_complexity_analyzer.analyze_file(Path(path))
+
 
 class ScanService:
     """Главный сервис для координации сканирования с паттернами"""
@@ -36,8 +206,7 @@ class ScanService:
         self.config: Configuration = config or Configuration()
         
         # Настройка логирования
-        log_config_dict: Dict[str, Any] = self.config.get_logging_config()
-        log_config: LogConfig = LogConfig(**log_config_dict)
+        log_config: LogConfig = self.config.logging_config
         setup_logging(log_config)
         self.logger = get_logger("ScanService")
         
@@ -54,20 +223,12 @@ class ScanService:
         self.file_scanner: FileScanner = self.component_factory.create_component(
             ComponentType.FILE_SCANNER
         )
-        self.data_exporter: DataExporter = self.component_factory.create_component(
-            ComponentType.DATA_EXPORTER
-        )
         
-        # Инициализация безопасности и производительности
+        # Инициализация безопасности (экспортер, менеджер производительности
+        # и анализатор сложности создаются лениво, см. свойства ниже)
         self.security_manager: SecurityManager = self.component_factory.create_component(
             ComponentType.SECURITY_MANAGER
         )
-        self.performance_manager: PerformanceManager = self.component_factory.create_component(
-            ComponentType.PERFORMANCE_MANAGER
-        )
-        
-        # Инициализация анализатора сложности
-        self.complexity_analyzer = ComplexityAnalyzer()
         
         # Инициализация анализатора качества кода
         self.quality_analyzer = CodeQualityAnalyzer()
@@ -76,16 +237,40 @@ class ScanService:
         # Инициализация анализатора архитектуры
         self.architecture_analyzer = ArchitectureAnalyzer()
         
-        # Инициализация субъекта для Observer паттерна
+        # Инициализация субъекта для Observer паттерна; наблюдатели логирования
+        # и метрик создаются один раз и переиспользуются между сканированиями
         self.scan_subject: ScanSubject = ScanSubject()
+        self._logging_observer: LoggingObserver = LoggingObserver()
+        self._metrics_observer: MetricsObserver = MetricsObserver()
         
         # Состояние
         self.last_scan_result: Optional[ScanResult] = None
-        self.is_scanning: bool = False
+        self._scan_lock: threading.Lock = threading.Lock()
         self.current_strategy: Optional[Any] = None
         
         self.logger.info(f"ScanService инициализирован с паттернами (config_file: {self.config.config_file})")
     
+    @property
+    def is_scanning(self) -> bool:
+        """Выполняется ли сканирование"""
+        return self._scan_lock.locked()
+    
+    @cached_property
+    def data_exporter(self) -> 'DataExporter':
+        """Экспортер данных (создается при первом обращении)"""
+        return self.component_factory.create_component(ComponentType.DATA_EXPORTER)
+    
+    @cached_property
+    def performance_manager(self) -> 'PerformanceManager':
+        """Менеджер производительности (создается при первом обращении)"""
+        return self.component_factory.create_component(ComponentType.PERFORMANCE_MANAGER)
+    
+    @cached_property
+    def complexity_analyzer(self) -> 'ComplexityAnalyzer':
+        """Анализатор сложности (создается при первом обращении)"""
+        from .complexity_analyzer import ComplexityAnalyzer
+        return ComplexityAnalyzer()
+    
     def scan_directory(self, directory: Path, 
                       progress_callback: Optional[Callable[[str, Optional[float]], None]] = None,
                       strategy_type: str = "adaptive") -> ScanResult:
@@ -100,21 +285,22 @@ class ScanService:
         Returns:
             Результат сканирования
         """
-        self.logger.info(f"Начало сканирования директории с паттернами (directory: {directory}, strategy: {strategy_type})")
+        dir_str: str = os.fspath(directory)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"Начало сканирования директории с паттернами (directory: {dir_str}, strategy: {strategy_type})")
         
-        if self.is_scanning:
+        # Неблокирующий захват исключает одновременный запуск из разных потоков
+        if not self._scan_lock.acquire(blocking=False):
             self.logger.warning("Попытка запуска сканирования во время выполнения")
             raise RuntimeError("Сканирование уже выполняется")
         
         try:
-            self.is_scanning = True
-            
             # Настройка наблюдателей
             self._setup_observers(progress_callback)
             
             # Уведомление о начале сканирования
-            self.scan_subject.notify_all("scan_started", {
-                "directory": str(directory),
+            self.scan_subject.notify_all(ScanEventType.STARTED, {
+                "directory": dir_str,
                 "strategy": strategy_type
             })
             
@@ -123,8 +309,8 @@ class ScanService:
             message: str
             is_valid, message = self.security_manager.validate_scan_request(directory)
             if not is_valid:
-                self.logger.error(f"Ошибка валидации безопасности (directory: {directory}, error: {message})")
-                self.scan_subject.notify_all("error", {"error": message})
+                self.logger.error(f"Ошибка валидации безопасности (directory: {dir_str}, error: {message})")
+                self.scan_subject.notify_all(ScanEventType.ERROR, {"error": message})
                 raise ValueError(f"Ошибка валидации безопасности: {message}")
             
             # Запуск профилирования
@@ -148,36 +334,39 @@ class ScanService:
             # Завершение профилирования
             scan_duration: float = self.performance_manager.end_profiling("scan_directory")
             
-            # Сохранение данных производительности
-            self.performance_manager.save_performance_data()
+            # Сохранение данных производительности (не чаще PROFILE_FLUSH_INTERVAL,
+            # несохраненный остаток записывается при выходе)
+            self.performance_manager.mark_dirty()
+            self.performance_manager.flush_if_stale()
             
             # Уведомление о завершении сканирования
-            self.scan_subject.notify_all("scan_completed", {
+            self.scan_subject.notify_all(ScanEventType.COMPLETED, {
                 "total_files": result.total_files_scanned,
                 "total_imports": result.total_imports,
                 "duration": result.scan_duration,
                 "strategy": strategy_type
             })
             
-            self.logger.info("Сканирование завершено успешно с паттернами", 
-                           extra_data={
-                               "total_files": result.total_files_scanned,
-                               "total_imports": result.total_imports,
-                               "duration": result.scan_duration,
-                               "scan_duration_profiled": scan_duration,
-                               "projects_found": len(result.projects_data),
-                               "strategy": strategy_type
-                           })
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    f"Сканирование завершено успешно с паттернами "
+                    f"(total_files: {result.total_files_scanned}, "
+                    f"total_imports: {result.total_imports}, "
+                    f"duration: {result.scan_duration}, "
+                    f"scan_duration_profiled: {scan_duration}, "
+                    f"projects_found: {len(result.projects_data)}, "
+                    f"strategy: {strategy_type})"
+                )
             
             return result
             
         except Exception as e:
             self.logger.error("Ошибка при сканировании", 
-                            extra_data={"error": str(e), "directory": str(directory)})
-            self.scan_subject.notify_all("error", {"error": str(e)})
+                            extra_data={"error": str(e), "directory": dir_str})
+            self.scan_subject.notify_all(ScanEventType.ERROR, {"error": str(e)})
             raise
         finally:
-            self.is_scanning = False
+            self._scan_lock.release()
             self.logger.info("Сканирование завершено")
     
     def scan_with_configuration(self, directory: Path, 
@@ -220,27 +409,24 @@ class ScanService:
     
     def _setup_observers(self, progress_callback: Optional[Callable] = None) -> None:
         """Настраивает наблюдателей"""
-        # Очищаем существующих наблюдателей
-        self.scan_subject.observers.clear()
-        
-        # Добавляем наблюдателя логирования
-        self.scan_subject.attach(LoggingObserver())
-        
-        # Добавляем наблюдателя метрик
-        self.scan_subject.attach(MetricsObserver())
+        # Сбрасываем метрики предыдущего сканирования
+        self._metrics_observer.reset()
         
-        # Добавляем наблюдателя прогресса если есть callback
+        # Постоянные наблюдатели логирования и метрик, наблюдатель прогресса
+        # зависит от callback конкретного вызова
+        observers: List[Any] = [self._logging_observer, self._metrics_observer]
         if progress_callback:
-            self.scan_subject.attach(ProgressObserver(progress_callback))
+            observers.append(ProgressObserver(progress_callback))
+        
+        # Заменяем набор наблюдателей (посторонние наблюдатели удаляются, как и раньше)
+        self.scan_subject.observers[:] = observers
     
     def _create_scan_result(self, scan_data: Dict[str, Any], directory: Path) -> ScanResult:
         """Создает ScanResult из данных стратегии"""
-        from datetime import datetime
-        
         # Преобразование данных в зависимости от стратегии
         if 'imports' in scan_data and isinstance(scan_data['imports'], list):
             # Для последовательной стратегии
-            imports_data = self._process_imports_list(scan_data['imports'])
+            imports_data, total_imports = self._process_imports_list(scan_data['imports'])
             projects_data = scan_data.get('projects', [])
             total_files = scan_data.get('total_files', 0)
         else:
@@ -248,40 +434,44 @@ class ScanService:
             imports_data = scan_data.get('imports', {})
             projects_data = scan_data.get('projects', [])
             total_files = scan_data.get('total_files', 0)
+            total_imports = sum(data.count for data in imports_data.values())
         
         return ScanResult(
             imports_data=imports_data,
             projects_data=projects_data,
             total_files_scanned=total_files,
-            total_imports=sum(data.count for data in imports_data.values()),
+            total_imports=total_imports,
             scan_duration=0.0,  # Будет обновлено позже
             scan_timestamp=datetime.now()
         )
     
-    def _process_imports_list(self, imports_list: List[str]) -> Dict[str, Any]:
-        """Обрабатывает список импортов в формат ImportData"""
-        from collections import Counter
-        from .interfaces import ImportData
+    def _process_imports_list(self, imports_list: List[str]) -> Tuple[Dict[str, Any], int]:
+        """
+        Обрабатывает список импортов в формат ImportData
         
+        Returns:
+            Кортеж (данные об импортах, общее количество импортов)
+        """
         if not imports_list:
-            return {}
+            return {}, 0
         
-        # Подсчет импортов
-        counter = Counter(imports_list)
-        total_imports = len(imports_list)
+        # Подсчет импортов. Цикл подсчета Counter выполняется на C и линеен;
+        # np.unique сортирует строки и на больших списках заметно медленнее
+        counter: Counter = Counter(imports_list)
+        total_imports: int = len(imports_list)
         
         # Создание ImportData
-        imports_data = {}
-        for library, count in counter.items():
-            percentage = (count / total_imports * 100) if total_imports > 0 else 0
-            imports_data[library] = ImportData(
+        imports_data: Dict[str, ImportData] = {
+            library: ImportData(
                 library=library,
                 count=count,
-                percentage=percentage,
+                percentage=count / total_imports * 100,
                 files=[]  # Можно добавить список файлов
             )
+            for library, count in counter.items()
+        }
         
-        return imports_data
+        return imports_data, total_imports
     
     def get_last_result(self) -> Optional[ScanResult]:
         """
@@ -313,42 +503,42 @@ class ScanService:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         # Генерация имени файла с временной меткой
-        timestamp: str = result.scan_timestamp.strftime('%Y%m%d_%H%M%S')
+        # Форматирование по полям без strftime (без обращения к локали)
+        scan_time: datetime = result.scan_timestamp
+        timestamp: str = (f"{scan_time.year:04d}{scan_time.month:02d}{scan_time.day:02d}_"
+                          f"{scan_time.hour:02d}{scan_time.minute:02d}{scan_time.second:02d}")
         base_name: str = f"import_scan_{timestamp}"
         
+        # Задачи экспорта: (формат, путь, функция экспорта)
+        exporter: 'DataExporter' = self.data_exporter
+        writers: Dict[str, Callable[[ScanResult, Path], None]] = {
+            'csv': exporter.export_to_csv,
+            'json': exporter.export_to_json,
+            'excel': exporter.export_to_excel,
+            'txt': exporter.export_summary_report,
+            'imports_csv': exporter.export_imports_only_csv,
+        }
+        tasks: List[Tuple[str, Path, Callable[[ScanResult, Path], None]]] = [
+            (key, output_dir / f"{base_name}{suffix}", writers[key])
+            for key, suffix in _EXT_MAP.items() if key in formats
+        ]
+        
         exported_files: Dict[str, Path] = {}
+        if not tasks:
+            return exported_files
+        
+        # Форматы пишутся в разные файлы независимо друг от друга,
+        # поэтому выполняются параллельно
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures: List[Tuple[str, Path, Future]] = [
+                (key, path, executor.submit(export_func, result, path))
+                for key, path, export_func in tasks
+            ]
         
         try:
-            # Экспорт в CSV
-            if 'csv' in formats:
-                csv_path: Path = output_dir / f"{base_name}.csv"
-                self.data_exporter.export_to_csv(result, csv_path)
-                exported_files['csv'] = csv_path
-            
-            # Экспорт в JSON
-            if 'json' in formats:
-                json_path: Path = output_dir / f"{base_name}.json"
-                self.data_exporter.export_to_json(result, json_path)
-                exported_files['json'] = json_path
-            
-            # Экспорт в Excel
-            if 'excel' in formats:
-                excel_path: Path = output_dir / f"{base_name}.xlsx"
-                self.data_exporter.export_to_excel(result, excel_path)
-                exported_files['excel'] = excel_path
-            
-            # Экспорт краткого отчета
-            if 'txt' in formats:
-                txt_path: Path = output_dir / f"{base_name}_report.txt"
-                self.data_exporter.export_summary_report(result, txt_path)
-                exported_files['txt'] = txt_path
-            
-            # Экспорт только импортов
-            if 'imports_csv' in formats:
-                imports_csv_path: Path = output_dir / f"{base_name}_imports.csv"
-                self.data_exporter.export_imports_only_csv(result, imports_csv_path)
-                exported_files['imports_csv'] = imports_csv_path
-                
+            for key, path, future in futures:
+                future.result()
+                exported_files[key] = path
         except Exception as e:
             raise RuntimeError(f"Ошибка при экспорте: {e}")
         
@@ -377,9 +567,8 @@ class ScanService:
             return {}
         
         # Статистика импортов
-        imports_stats: Dict[str, Any] = self.import_parser.get_import_statistics(
-            [lib for lib, data in result.imports_data.items() 
-             for _ in range(data.count)]
+        imports_stats: Dict[str, Any] = self.import_parser.get_import_statistics_from_counts(
+            {lib: data.count for lib, data in result.imports_data.items()}
         )
         
         # Статистика проектов
@@ -401,28 +590,79 @@ class ScanService:
             }
         }
     
-    def validate_directory(self, directory: Path) -> Tuple[bool, str]:
+    def validate_directory(self, directory: Path,
+                           count_files: bool = False) -> Tuple[bool, str]:
         """
         Проверяет валидность директории для сканирования
         
         Args:
             directory: Директория для проверки
+            count_files: Подсчитать все Python файлы вместо остановки
+                на первом найденном
             
         Returns:
             Кортеж (валидна, сообщение об ошибке)
         """
-        if not directory.exists():
-            return False, f"Директория не существует: {directory}"
+        is_valid: bool
+        message: str
+        is_valid, message, _ = self._validate_directory_files(directory, count_files)
+        return is_valid, message
+    
+    def _validate_directory_files(self, directory: Path,
+                                  count_files: bool) -> Tuple[bool, str, Tuple[str, ...]]:
+        """
+        Проверяет директорию и возвращает найденные при проверке Python файлы
         
-        if not directory.is_dir():
-            return False, f"Путь не является директорией: {directory}"
+        Args:
+            directory: Директория для проверки
+            count_files: Найти все Python файлы вместо остановки на первом
+            
+        Returns:
+            Кортеж (валидна, сообщение об ошибке, пути к Python файлам)
+        """
+        try:
+            dir_stat: os.stat_result = os.stat(directory)
+        except OSError:
+            return False, f"Директория не существует: {directory}", ()
+        
+        if not stat.S_ISDIR(dir_stat.st_mode):
+            return False, f"Путь не является директорией: {directory}", ()
         
-        # Проверка на наличие Python файлов
-        python_files: List[Path] = list(directory.rglob("*.py"))
+        # Проверка на наличие Python файлов (без count_files кэшируется по mtime)
+        python_files: Tuple[str, ...] = self._find_python_files(directory, dir_stat, count_files)
         if not python_files:
-            return False, "В директории не найдено Python файлов"
+            return False, "В директории не найдено Python файлов", ()
+        
+        if not count_files:
+            return True, "Найдены Python файлы", python_files
+        
+        return True, f"Найдено {len(python_files)} Python файлов", python_files
+    
+    def _find_python_files(self, directory: Path, dir_stat: os.stat_result,
+                           count_files: bool = True) -> Tuple[str, ...]:
+        """
+        Возвращает Python файлы директории
+        
+        Полный список собирается новым обходом; через кэш по mtime
+        выполняется только проверка наличия файлов (без count_files).
         
-        return True, f"Найдено {len(python_files)} Python файлов"
+        Args:
+            directory: Директория
+            dir_stat: Результат os.stat для директории (mtime входит в ключ кэша)
+            count_files: Найти все файлы вместо остановки на первом
+            
+        Returns:
+            Отсортированные пути к Python файлам
+        """
+        performance_config: Dict[str, Any] = self.config.get_performance_config()
+        parallel_workers: int = 0
+        if performance_config.get('parallel_directory_walk', False):
+            parallel_workers = performance_config.get('directory_walk_workers',
+                                                      PARALLEL_WALK_MAX_WORKERS)
+        path_str: str = str(directory.resolve())
+        if count_files:
+            return _walk_python_files(path_str, True, parallel_workers)
+        return _validate_directory_cached(path_str, dir_stat.st_mtime_ns, parallel_workers)
     
     def get_configuration(self) -> Configuration:
         """
@@ -465,7 +705,7 @@ class ScanService:
         """
         return self.scan_subject
     
-    def analyze_complexity(self, directory: Path) -> ProjectComplexityReport:
+    def analyze_complexity(self, directory: Path) -> 'ProjectComplexityReport':
         """
         Анализирует сложность кода в проекте
         
@@ -475,31 +715,31 @@ class ScanService:
         Returns:
             Отчет о сложности проекта
         """
-        self.logger.info("Начало анализа сложности кода", 
-                        extra_data={"directory": str(directory)})
+        dir_str: str = os.fspath(directory)
+        self.logger.info(f"Начало анализа сложности кода (directory: {dir_str})")
         
         try:
-            # Валидация директории
+            # Валидация директории (полный список файлов собирается новым обходом)
             is_valid: bool
             message: str
-            is_valid, message = self.validate_directory(directory)
+            file_paths: Tuple[str, ...]
+            is_valid, message, file_paths = self._validate_directory_files(
+                directory, count_files=True
+            )
             if not is_valid:
                 raise ValueError(f"Ошибка валидации директории: {message}")
             
-            # Анализ сложности
-            report = self.complexity_analyzer.analyze_project(directory)
+            # Анализ сложности по найденным при валидации файлам
+            python_files: List[Path] = [Path(file_path) for file_path in file_paths]
+            report = self.complexity_analyzer.analyze_project(directory, files=python_files)
             
-            self.logger.info("Анализ сложности завершен", 
-                            extra_data={
-                                "total_files": report.total_files,
-                                "average_complexity": report.average_complexity
-                            })
+            self.logger.info(f"Анализ сложности завершен (total_files: {report.total_files}, "
+                             f"average_complexity: {report.average_complexity})")
             
             return report
             
         except Exception as e:
-            self.logger.error("Ошибка при анализе сложности", 
-                            extra_data={"directory": str(directory), "error": str(e)})
+            self.logger.error(f"Ошибка при анализе сложности (directory: {dir_str}, error: {e})")
             raise
     
     def analyze_file_complexity(self, file_path: Path) -> 'FileComplexityReport':
@@ -512,26 +752,57 @@ class ScanService:
         Returns:
             Отчет о сложности файла
         """
-        self.logger.info("Анализ сложности файла", 
-                        extra_data={"file_path": str(file_path)})
+        file_path_str: str = os.fspath(file_path)
+        log_info: bool = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
+            self.logger.info(f"Анализ сложности файла (file_path: {file_path_str})")
         
         try:
             report = self.complexity_analyzer.analyze_file(file_path)
             
-            self.logger.info("Анализ сложности файла завершен", 
-                            extra_data={
-                                "file_path": str(file_path),
-                                "grade": report.grade,
-                                "complexity": report.metrics.cyclomatic_complexity
-                            })
+            if log_info:
+                self.logger.info(
+                    f"Анализ сложности файла завершен (file_path: {file_path_str}, "
+                    f"grade: {report.grade}, "
+                    f"complexity: {report.metrics.cyclomatic_complexity})"
+                )
             
             return report
             
         except Exception as e:
             self.logger.error("Ошибка при анализе сложности файла", 
-                            extra_data={"file_path": str(file_path), "error": str(e)})
+                            extra_data={"file_path": file_path_str, "error": str(e)})
             raise
 
+    def analyze_files_complexity(self, files: List[Path]) -> List['FileComplexityReport']:
+        """
+        Анализирует сложность набора файлов
+        
+        Разбор AST и подсчет метрик ограничены CPU, поэтому при достаточном
+        количестве файлов анализ выполняется в пуле процессов.
+        
+        Args:
+            files: Пути к файлам для анализа
+            
+        Returns:
+            Отчеты о сложности в порядке входных файлов
+        """
+        cpu_count: int = os.cpu_count() or 1
+        if len(files) >= PARALLEL_COMPLEXITY_MIN_FILES and cpu_count >= 2:
+            self.logger.info(f"Параллельный анализ сложности (files: {len(files)}, workers: {cpu_count})")
+            
+            chunksize: int = max(1, len(files) // (cpu_count * 4))
+            try:
+                with ProcessPoolExecutor(max_workers=cpu_count) as executor:
+                    return list(executor.map(_analyze_one, [os.fspath(f) for f in files],
+                                             chunksize=chunksize))
+            except Exception as e:
+                # Пул может не запуститься (spawn, pickle, BrokenProcessPool, песочница)
+                self.logger.warning(f"Параллельный анализ сложности недоступен, "
+                                    f"выполняю последовательно: {e}")
+        
+        return [self.complexity_analyzer.analyze_file(file_path) for file_path in files]
+    
     def analyze_file_quality(self, file_path: Path) -> 'CodeQualityReport':
         """
         Анализирует качество кода в файле
@@ -542,15 +813,16 @@ class ScanService:
         Returns:
             Отчет о качестве кода
         """
+        file_path_str: str = os.fspath(file_path)
         self.logger.info("Анализ качества кода файла", 
-                        extra_data={"file_path": str(file_path)})
+                        extra_data={"file_path": file_path_str})
         
         try:
             report = self.quality_analyzer.analyze_file(file_path)
             
             self.logger.info("Анализ качества кода завершен", 
                             extra_data={
-                                "file_path": str(file_path),
+                                "file_path": file_path_str,
                                 "score": report.overall_score,
                                 "issues": report.issues_count
                             })
@@ -559,7 +831,7 @@ class ScanService:
             
         except Exception as e:
             self.logger.error("Ошибка при анализе качества кода", 
-                            extra_data={"file_path": str(file_path), "error": str(e)})
+                            extra_data={"file_path": file_path_str, "error": str(e)})
             raise
 
     def analyze_project_quality(self, directory: Path) -> ProjectQualityReport:
@@ -572,8 +844,9 @@ class ScanService:
         Returns:
             Отчет о качестве проекта
         """
+        dir_str: str = os.fspath(directory)
         self.logger.info("Анализ качества кода проекта", 
-                        extra_data={"directory": str(directory)})
+                        extra_data={"directory": dir_str})
         
         try:
             # Валидация директории
@@ -597,7 +870,7 @@ class ScanService:
             
         except Exception as e:
             self.logger.error("Ошибка при анализе качества кода проекта", 
-                            extra_data={"directory": str(directory), "error": str(e)})
+                            extra_data={"directory": dir_str, "error": str(e)})
             raise
 
     def analyze_dependencies(self, requirements_path: Path) -> DependencyReport:
@@ -610,8 +883,9 @@ class ScanService:
         Returns:
             Отчет об анализе зависимостей
         """
+        requirements_path_str: str = os.fspath(requirements_path)
         self.logger.info("Анализ зависимостей", 
-                        extra_data={"requirements_path": str(requirements_path)})
+                        extra_data={"requirements_path": requirements_path_str})
         
         try:
             report = self.dependency_analyzer.analyze_requirements(requirements_path)
@@ -628,7 +902,7 @@ class ScanService:
             
         except Exception as e:
             self.logger.error("Ошибка при анализе зависимостей", 
-                            extra_data={"requirements_path": str(requirements_path), "error": str(e)})
+                            extra_data={"requirements_path": requirements_path_str, "error": str(e)})
             raise
 
     def export_dependency_report(self, report: DependencyReport, 
@@ -641,18 +915,19 @@ class ScanService:
             output_path: Путь для сохранения отчета
             format: Формат экспорта (json, csv, txt)
         """
+        output_path_str: str = os.fspath(output_path)
         self.logger.info("Экспорт отчета о зависимостях", 
-                        extra_data={"output_path": str(output_path), "format": format})
+                        extra_data={"output_path": output_path_str, "format": format})
         
         try:
             self.dependency_analyzer.export_report(report, output_path, format)
             
             self.logger.info("Отчет о зависимостях экспортирован", 
-                            extra_data={"output_path": str(output_path)})
+                            extra_data={"output_path": output_path_str})
             
         except Exception as e:
             self.logger.error("Ошибка при экспорте отчета о зависимостях", 
-                            extra_data={"output_path": str(output_path), "error": str(e)})
+                            extra_data={"output_path": output_path_str, "error": str(e)})
             raise
 
     def analyze_architecture(self, project_path: Path) -> ArchitectureReport:
@@ -665,8 +940,9 @@ class ScanService:
         Returns:
             Отчет об архитектуре
         """
+        project_path_str: str = os.fspath(project_path)
         self.logger.info("Анализ архитектуры проекта", 
-                        extra_data={"project_path": str(project_path)})
+                        extra_data={"project_path": project_path_str})
         
         try:
             report = self.architecture_analyzer.analyze_project(project_path)
@@ -682,7 +958,7 @@ class ScanService:
             
         except Exception as e:
             self.logger.error("Ошибка при анализе архитектуры", 
-                            extra_data={"project_path": str(project_path), "error": str(e)})
+                            extra_data={"project_path": project_path_str, "error": str(e)})
             raise
 
     def visualize_architecture(self, report: ArchitectureReport, 
@@ -695,18 +971,19 @@ class ScanService:
             output_path: Путь для сохранения изображения
             format: Формат изображения (png, svg, pdf)
         """
+        output_path_str: str = os.fspath(output_path)
         self.logger.info("Визуализация архитектуры", 
-                        extra_data={"output_path": str(output_path), "format": format})
+                        extra_data={"output_path": output_path_str, "format": format})
         
         try:
             self.architecture_analyzer.visualize_dependencies(report, output_path, format)
             
             self.logger.info("Визуализация архитектуры завершена", 
-                            extra_data={"output_path": str(output_path)})
+                            extra_data={"output_path": output_path_str})
             
         except Exception as e:
             self.logger.error("Ошибка при визуализации архитектуры", 
-                            extra_data={"output_path": str(output_path), "error": str(e)})
+                            extra_data={"output_path": output_path_str, "error": str(e)})
             raise
 
     def export_architecture_report(self, report: ArchitectureReport, 
@@ -719,16 +996,17 @@ class ScanService:
             output_path: Путь для сохранения отчета
             format: Формат экспорта (json, dot)
         """
+        output_path_str: str = os.fspath(output_path)
         self.logger.info("Экспорт отчета об архитектуре", 
-                        extra_data={"output_path": str(output_path), "format": format})
+                        extra_data={"output_path": output_path_str, "format": format})
         
         try:
             self.architecture_analyzer.export_report(report, output_path, format)
             
             self.logger.info("Отчет об архитектуре экспортирован", 
-                            extra_data={"output_path": str(output_path)})
+                            extra_data={"output_path": output_path_str})
             
         except Exception as e:
             self.logger.error("Ошибка при экспорте отчета об архитектуре", 
-                            extra_data={"output_path": str(output_path), "error": str(e)})
+                            extra_data={"output_path": output_path_str, "error": str(e)})
             raise
@@ -2,151 +2,306 @@
 Окно детального анализа отдельного проекта
 """
 import os
-import json
-import sys
 import time
-import traceback
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional, Sequence
 
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                                QTabWidget, QTextEdit, QLabel, QPushButton, 
-                               QTableWidget, QTableWidgetItem, QProgressBar,
-                               QFrame, QSplitter, QScrollArea, QComboBox,
-                               QFileDialog, QMessageBox, QGridLayout)
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
-from PySide6.QtGui import QFont, QPalette, QColor, QPixmap
-# Временно отключаем matplotlib для избежания конфликтов
-# import matplotlib.pyplot as plt
-# from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-# from matplotlib.figure import Figure
-# import matplotlib
-# matplotlib.use('Qt5Agg')
+                               QTableView, QHeaderView, QProgressBar,
+                               QFrame, QFileDialog, QMessageBox, QGridLayout)
+from PySide6.QtCore import (Qt, QThread, Signal, QTimer, QAbstractTableModel,
+                            QModelIndex)
+from PySide6.QtGui import QFont
 
-from ..core.project_analyzer_core import IntegratedProjectAnalyzer
+from ..core.project_analyzer_core import IntegratedProjectAnalyzer, project_files_signature
 from ..core.configuration import Configuration
+from ..core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+# Таблицы стилей, общие для нескольких виджетов окна
+_TABLE_QSS = """
+    QTableView {
+        background-color: white;
+        border: 1px solid #dee2e6;
+        border-radius: 5px;
+        gridline-color: #dee2e6;
+    }
+    QHeaderView::section {
+        background-color: #f8f9fa;
+        padding: 8px;
+        border: 1px solid #dee2e6;
+        font-weight: bold;
+    }
+"""
+
+_FRAME_QSS_TEMPLATE = """
+    QFrame {{
+        background-color: {background};
+        border: 1px solid #dee2e6;
+        border-radius: 8px;
+        padding: 15px;
+    }}
+"""
+
+_STATS_FRAME_QSS = _FRAME_QSS_TEMPLATE.format(background="#f8f9fa")
+_CHARTS_FRAME_QSS = _FRAME_QSS_TEMPLATE.format(background="white")
+
+_BUTTON_QSS_TEMPLATE = """
+    QPushButton {{
+        background-color: {background};
+        color: white;
+        border: none;
+        padding: 12px 20px;
+        border-radius: 6px;
+        font-weight: bold;
+    }}
+    QPushButton:hover {{
+        background-color: {hover};
+    }}
+    QPushButton:disabled {{
+        background-color: #bdc3c7;
+        color: #7f8c8d;
+    }}
+"""
+
+_TEXT_VIEW_QSS = """
+    QTextEdit {
+        background-color: #f8f9fa;
+        border: 1px solid #dee2e6;
+        border-radius: 5px;
+        padding: 10px;
+        color: #2c3e50;
+    }
+"""
+
+
+# Количество результатов анализа, хранимых для повторного открытия папок
+ANALYSIS_CACHE_SIZE = 8
+
+# Тексты интерфейса строятся один раз при импорте модуля
+_TEXTS = {
+    "ru": {
+        "window_title": "📊 Детальный анализ проекта",
+        "title_label": "📊 Детальный анализ проекта",
+        "select_folder_btn": "📁 Выбрать папку",
+        "analyze_btn": "🔍 Анализировать папку",
+        "export_btn": "💾 Экспорт",
+        "progress_label": "Выберите папку для анализа",
+        "ready_status": "Готов к анализу",
+        "folder_selected": "Выбрана папка: {}",
+        "warning_title": "Предупреждение",
+        "warning_select_folder": "Сначала выберите папку!",
+        "error_title": "Ошибка",
+        "error_analysis": "Ошибка при анализе:\n{}",
+        "error_export": "Ошибка при сохранении отчета:\n{}",
+        "success_export": "Отчет сохранен в {}",
+        "analysis_completed": "✅ Анализ завершен!",
+        "analysis_error": "❌ Ошибка анализа",
+        "overview_tab": "📊 Обзор",
+        "libraries_tab": "📦 Библиотеки",
+        "quality_tab": "✨ Качество",
+        "complexity_tab": "📊 Сложность",
+        "architecture_tab": "🏗️ Архитектура",
+        "dependencies_tab": "🔗 Зависимости",
+        "overview_title": "📊 Общая статистика папки",
+        "architecture_title": "🏗️ АНАЛИЗ АРХИТЕКТУРЫ ПАПКИ",
+        "dependencies_title": "🔗 АНАЛИЗ ЗАВИСИМОСТЕЙ В ПАПКЕ",
+        "architecture_placeholder": "Результаты анализа архитектуры папки появятся здесь...",
+        "dependencies_placeholder": "Результаты анализа зависимостей в папке появятся здесь...",
+        "chart_libraries": "Топ библиотек",
+        "chart_quality": "Распределение качества кода",
+        "chart_complexity": "Распределение сложности кода",
+        "chart_quality_folder": "Распределение качества кода в папке",
+        "no_architecture_data": "Данные архитектуры недоступны",
+        "no_dependencies_data": "Данные зависимостей недоступны"
+    },
+    "en": {
+        "window_title": "📊 Detailed Project Analysis",
+        "title_label": "📊 Detailed Project Analysis",
+        "select_folder_btn": "📁 Select Folder",
+        "analyze_btn": "🔍 Analyze Folder",
+        "export_btn": "💾 Export",
+        "progress_label": "Select folder for analysis",
+        "ready_status": "Ready for analysis",
+        "folder_selected": "Selected folder: {}",
+        "warning_title": "Warning",
+        "warning_select_folder": "Please select a folder first!",
+        "error_title": "Error",
+        "error_analysis": "Error during analysis:\n{}",
+        "error_export": "Error saving report:\n{}",
+        "success_export": "Report saved to {}",
+        "analysis_completed": "✅ Analysis completed!",
+        "analysis_error": "❌ Analysis error",
+        "overview_tab": "📊 Overview",
+        "libraries_tab": "📦 Libraries",
+        "quality_tab": "✨ Quality",
+        "complexity_tab": "📊 Complexity",
+        "architecture_tab": "🏗️ Architecture",
+        "dependencies_tab": "🔗 Dependencies",
+        "overview_title": "📊 General Folder Statistics",
+        "architecture_title": "🏗️ FOLDER ARCHITECTURE ANALYSIS",
+        "dependencies_title": "🔗 DEPENDENCIES ANALYSIS IN FOLDER",
+        "architecture_placeholder": "Folder architecture analysis results will appear here...",
+        "dependencies_placeholder": "Folder dependencies analysis results will appear here...",
+        "chart_libraries": "Top Libraries",
+        "chart_quality": "Code Quality Distribution",
+        "chart_complexity": "Code Complexity Distribution",
+        "chart_quality_folder": "Code Quality Distribution in Folder",
+        "no_architecture_data": "Architecture data unavailable",
+        "no_dependencies_data": "Dependencies data unavailable"
+    }
+}
 
 
 def get_ui_texts(language="ru"):
     """Получение текстов интерфейса в соответствии с выбранным языком"""
-    texts = {
-        "ru": {
-            "window_title": "📊 Детальный анализ проекта",
-            "title_label": "📊 Детальный анализ проекта",
-            "select_folder_btn": "📁 Выбрать папку",
-            "analyze_btn": "🔍 Анализировать папку",
-            "export_btn": "💾 Экспорт",
-            "progress_label": "Выберите папку для анализа",
-            "ready_status": "Готов к анализу",
-            "folder_selected": "Выбрана папка: {}",
-            "warning_title": "Предупреждение",
-            "warning_select_folder": "Сначала выберите папку!",
-            "error_title": "Ошибка",
-            "error_analysis": "Ошибка при анализе:\n{}",
-            "error_export": "Ошибка при сохранении отчета:\n{}",
-            "success_export": "Отчет сохранен в {}",
-            "analysis_completed": "✅ Анализ завершен!",
-            "analysis_error": "❌ Ошибка анализа",
-            "overview_tab": "📊 Обзор",
-            "libraries_tab": "📦 Библиотеки",
-            "quality_tab": "✨ Качество",
-            "complexity_tab": "📊 Сложность",
-            "architecture_tab": "🏗️ Архитектура",
-            "dependencies_tab": "🔗 Зависимости",
-            "overview_title": "📊 Общая статистика папки",
-            "architecture_title": "🏗️ АНАЛИЗ АРХИТЕКТУРЫ ПАПКИ",
-            "dependencies_title": "🔗 АНАЛИЗ ЗАВИСИМОСТЕЙ В ПАПКЕ",
-            "architecture_placeholder": "Результаты анализа архитектуры папки появятся здесь...",
-            "dependencies_placeholder": "Результаты анализа зависимостей в папке появятся здесь...",
-            "chart_libraries": "Топ библиотек",
-            "chart_quality": "Распределение качества кода",
-            "chart_complexity": "Распределение сложности кода",
-            "chart_quality_folder": "Распределение качества кода в папке",
-            "no_architecture_data": "Данные архитектуры недоступны",
-            "no_dependencies_data": "Данные зависимостей недоступны"
-        },
-        "en": {
-            "window_title": "📊 Detailed Project Analysis",
-            "title_label": "📊 Detailed Project Analysis",
-            "select_folder_btn": "📁 Select Folder",
-            "analyze_btn": "🔍 Analyze Folder",
-            "export_btn": "💾 Export",
-            "progress_label": "Select folder for analysis",
-            "ready_status": "Ready for analysis",
-            "folder_selected": "Selected folder: {}",
-            "warning_title": "Warning",
-            "warning_select_folder": "Please select a folder first!",
-            "error_title": "Error",
-            "error_analysis": "Error during analysis:\n{}",
-            "error_export": "Error saving report:\n{}",
-            "success_export": "Report saved to {}",
-            "analysis_completed": "✅ Analysis completed!",
-            "analysis_error": "❌ Analysis error",
-            "overview_tab": "📊 Overview",
-            "libraries_tab": "📦 Libraries",
-            "quality_tab": "✨ Quality",
-            "complexity_tab": "📊 Complexity",
-            "architecture_tab": "🏗️ Architecture",
-            "dependencies_tab": "🔗 Dependencies",
-            "overview_title": "📊 General Folder Statistics",
-            "architecture_title": "🏗️ FOLDER ARCHITECTURE ANALYSIS",
-            "dependencies_title": "🔗 DEPENDENCIES ANALYSIS IN FOLDER",
-            "architecture_placeholder": "Folder architecture analysis results will appear here...",
-            "dependencies_placeholder": "Folder dependencies analysis results will appear here...",
-            "chart_libraries": "Top Libraries",
-            "chart_quality": "Code Quality Distribution",
-            "chart_complexity": "Code Complexity Distribution",
-            "chart_quality_folder": "Code Quality Distribution in Folder",
-            "no_architecture_data": "Architecture data unavailable",
-            "no_dependencies_data": "Dependencies data unavailable"
-        }
-    }
-    
-    return texts.get(language, texts["ru"])
+    return _TEXTS.get(language, _TEXTS["ru"])
+
+
+# Перечисления PySide6 разрешаются медленно, а data() вызывается для каждой
+# ячейки и роли, поэтому нужные значения связываются один раз
+_DISPLAY_ROLE = Qt.DisplayRole
+_HORIZONTAL = Qt.Horizontal
+
+
+# Форматирование ячеек таблиц качества и сложности из словарей files_analysis
+_QUALITY_COLUMNS = (
+    itemgetter('path'),
+    lambda file_analysis: f"{file_analysis['quality_score']:.1f}",
+    lambda file_analysis: str(len(file_analysis['issues'])),
+    lambda file_analysis: f"{file_analysis['complexity']:.1f}",
+)
+
+_COMPLEXITY_COLUMNS = (
+    itemgetter('path'),
+    lambda file_analysis: f"{file_analysis['complexity']:.1f}",
+    lambda file_analysis: str(file_analysis['lines']),
+)
+
 
+@lru_cache(maxsize=None)
+def _font(family: str, size: int, bold: bool = False) -> QFont:
+    """Общий экземпляр шрифта, создается при первом запросе (после QApplication)"""
+    font = QFont(family, size)
+    font.setBold(bold)
+    return font
 
-def debug_log(message: str):
-    """Функция для отладочного логирования"""
-    print(f"[DEBUG] StatsWindow: {message}")
-    sys.stdout.flush()
+
+class RowsTableModel(QAbstractTableModel):
+    """
+    Модель таблицы только для чтения поверх списка строк
+    
+    Без форматтеров строки - кортежи готовых значений ячеек. С форматтерами
+    строки хранятся как есть (например, словари анализа файлов), а текст
+    ячейки строится при запросе, то есть только для показываемых ячеек.
+    """
+    
+    def __init__(self, headers, parent=None,
+                 formatters: Optional[Sequence[Callable[[Any], str]]] = None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._formatters = formatters
+        self._rows: List[Any] = []
+    
+    def set_rows(self, rows: List[Any]):
+        """Заменяет все строки модели одним сбросом"""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+    
+    def data(self, index, role=_DISPLAY_ROLE):
+        if role == _DISPLAY_ROLE and index.isValid():
+            row = self._rows[index.row()]
+            if self._formatters is None:
+                return row[index.column()]
+            return self._formatters[index.column()](row)
+        return None
+    
+    def headerData(self, section, orientation, role=_DISPLAY_ROLE):
+        if role == _DISPLAY_ROLE and orientation == _HORIZONTAL:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
 
 
 class AnalysisWorker(QThread):
-    """Поток для выполнения анализа"""
+    """
+    Поток для выполнения анализа
+    
+    Поток только освобождает UI: разбор файлов analyze_project сам распределяет
+    по процессам (см. PARALLEL_MIN_FILES), поэтому отдельный пул процессов для
+    всего анализа добавил бы лишь пересылку результата между процессами.
+    """
     progress_updated = Signal(str)
     analysis_completed = Signal(dict)
     error_occurred = Signal(str)
     
     def __init__(self, project_path: Path, config: Configuration):
-        debug_log("🔧 Инициализация AnalysisWorker...")
+        logger.debug("🔧 Инициализация AnalysisWorker...")
         super().__init__()
         self.project_path = project_path
         self.config = config
-        debug_log(f"✅ AnalysisWorker инициализирован с project_path: {project_path}")
+        logger.debug("✅ AnalysisWorker инициализирован с project_path: %s", project_path)
         
         try:
-            debug_log("🔧 Создание IntegratedProjectAnalyzer...")
+            logger.debug("🔧 Создание IntegratedProjectAnalyzer...")
             self.analyzer = IntegratedProjectAnalyzer(config)
-            debug_log("✅ IntegratedProjectAnalyzer создан")
+            logger.debug("✅ IntegratedProjectAnalyzer создан")
         except Exception as e:
-            debug_log(f"❌ ОШИБКА при создании IntegratedProjectAnalyzer: {e}")
-            debug_log(f"Трассировка: {traceback.format_exc()}")
+            logger.error("❌ ОШИБКА при создании IntegratedProjectAnalyzer: %s", e, exc_info=True)
             raise
     
     def run(self):
-        debug_log("🚀 AnalysisWorker.run() начат")
+        logger.debug("🚀 AnalysisWorker.run() начат")
         try:
-            debug_log("🔍 Вызов analyzer.analyze_project...")
+            logger.debug("🔍 Вызов analyzer.analyze_project...")
             result = self.analyzer.analyze_project(
                 self.project_path, 
                 self.progress_updated.emit
             )
-            debug_log("✅ Анализ завершен успешно")
-            debug_log(f"📊 Результат содержит ключи: {list(result.keys()) if result else 'None'}")
+            logger.debug("✅ Анализ завершен успешно")
+            logger.debug("📊 Результат содержит ключи: %s", list(result.keys()) if result else 'None')
+            
+            # Сортировка для вкладки качества выполняется здесь, а не в потоке UI
+            result['files_analysis'].sort(key=itemgetter('quality_score'))
             self.analysis_completed.emit(result)
         except Exception as e:
-            debug_log(f"❌ ОШИБКА в AnalysisWorker.run(): {e}")
-            debug_log(f"Трассировка: {traceback.format_exc()}")
+            logger.error("❌ ОШИБКА в AnalysisWorker.run(): %s", e, exc_info=True)
+            self.error_occurred.emit(str(e))
+
+
+class ExportWorker(QThread):
+    """Поток для сохранения отчета, чтобы сериализация не блокировала UI"""
+    export_completed = Signal(str)
+    error_occurred = Signal(str)
+    
+    def __init__(self, report: Dict[str, Any], output_path: Path, format_type: str,
+                 config: Configuration):
+        super().__init__()
+        self.report = report
+        self.output_path = output_path
+        self.format_type = format_type
+        self.config = config
+    
+    def run(self):
+        try:
+            # Готовый результат анализа (JSON через orjson при наличии)
+            analyzer = IntegratedProjectAnalyzer(self.config)
+            analyzer.export_report(self.output_path, self.format_type, report=self.report)
+            self.export_completed.emit(str(self.output_path))
+        except Exception as e:
+            logger.error("❌ ОШИБКА при сохранении отчета: %s", e, exc_info=True)
             self.error_occurred.emit(str(e))
 
 
@@ -154,13 +309,13 @@ class StatsWindow(QMainWindow):
     """Окно расширенной статистики папки/директории"""
     
     def __init__(self, scan_service=None, language="ru"):
-        debug_log("=== ИНИЦИАЛИЗАЦИЯ StatsWindow ===")
-        debug_log(f"scan_service: {scan_service}")
-        debug_log(f"language: {language}")
+        logger.debug("=== ИНИЦИАЛИЗАЦИЯ StatsWindow ===")
+        logger.debug("scan_service: %s", scan_service)
+        logger.debug("language: %s", language)
         
         try:
             super().__init__()
-            debug_log("✅ super().__init__() выполнен")
+            logger.debug("✅ super().__init__() выполнен")
             
             self.folder_path = None  # Пользователь сам выберет папку
             self.scan_service = scan_service
@@ -168,39 +323,42 @@ class StatsWindow(QMainWindow):
             self.texts = get_ui_texts(language)
             self.analysis_result = None
             self.analysis_worker = None
+            self.export_worker = None
+            # Результаты анализа по ключу (папка, сигнатура ее Python файлов)
+            self._analysis_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+            self._pending_cache_key = None
             
-            debug_log("✅ Переменные инициализированы")
+            logger.debug("✅ Переменные инициализированы")
             
             # Инициализация конфигурации
-            debug_log("🔧 Инициализация конфигурации...")
+            logger.debug("🔧 Инициализация конфигурации...")
             self.config = Configuration()
-            debug_log("✅ Конфигурация создана")
+            logger.debug("✅ Конфигурация создана")
             
-            debug_log("🎨 Инициализация UI...")
+            logger.debug("🎨 Инициализация UI...")
             self.init_ui()
-            debug_log("✅ UI инициализирован")
+            logger.debug("✅ UI инициализирован")
             
-            debug_log("🎨 Настройка стилей...")
+            logger.debug("🎨 Настройка стилей...")
             self.setup_styles()
-            debug_log("✅ Стили настроены")
+            logger.debug("✅ Стили настроены")
             
             # НЕ запускаем анализ автоматически - пользователь сам выберет папку
-            debug_log("ℹ️ Анализ не запускается автоматически - пользователь выберет папку")
+            logger.debug("ℹ️ Анализ не запускается автоматически - пользователь выберет папку")
             
-            debug_log("✅ StatsWindow инициализирован успешно")
+            logger.debug("✅ StatsWindow инициализирован успешно")
             
         except Exception as e:
-            debug_log(f"❌ ОШИБКА при инициализации StatsWindow: {e}")
-            debug_log(f"Трассировка: {traceback.format_exc()}")
+            logger.error("❌ ОШИБКА при инициализации StatsWindow: %s", e, exc_info=True)
             raise
     
     def init_ui(self):
         """Инициализация пользовательского интерфейса"""
-        debug_log("🎨 Начало инициализации UI...")
+        logger.debug("🎨 Начало инициализации UI...")
         
         self.setWindowTitle(self.texts["window_title"])
         self.setMinimumSize(1200, 800)
-        debug_log("✅ Заголовок и размер окна установлены")
+        logger.debug("✅ Заголовок и размер окна установлены")
         
         # Центральный виджет
         central_widget = QWidget()
@@ -213,7 +371,7 @@ class StatsWindow(QMainWindow):
         
         # Заголовок
         title_label = QLabel(self.texts["title_label"])
-        title_label.setFont(QFont("Segoe UI", 20, QFont.Bold))
+        title_label.setFont(_font("Segoe UI", 20, bold=True))
         title_label.setAlignment(Qt.AlignCenter)
         title_label.setStyleSheet("color: #2c3e50; margin-bottom: 10px;")
         main_layout.addWidget(title_label)
@@ -233,65 +391,21 @@ class StatsWindow(QMainWindow):
         
         # Кнопки
         self.select_folder_btn = QPushButton(self.texts["select_folder_btn"])
-        self.select_folder_btn.setFont(QFont("Segoe UI", 11))
+        self.select_folder_btn.setFont(_font("Segoe UI", 11))
         self.select_folder_btn.clicked.connect(self.select_folder)
-        self.select_folder_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                padding: 12px 20px;
-                border-radius: 6px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-        """)
+        self.select_folder_btn.setStyleSheet(_BUTTON_QSS_TEMPLATE.format(background="#3498db", hover="#2980b9"))
         
         self.analyze_btn = QPushButton(self.texts["analyze_btn"])
-        self.analyze_btn.setFont(QFont("Segoe UI", 11))
+        self.analyze_btn.setFont(_font("Segoe UI", 11))
         self.analyze_btn.clicked.connect(self.start_analysis)
         self.analyze_btn.setEnabled(False)
-        self.analyze_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                padding: 12px 20px;
-                border-radius: 6px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.analyze_btn.setStyleSheet(_BUTTON_QSS_TEMPLATE.format(background="#27ae60", hover="#229954"))
         
         self.export_btn = QPushButton("💾 Экспорт")
-        self.export_btn.setFont(QFont("Segoe UI", 11))
+        self.export_btn.setFont(_font("Segoe UI", 11))
         self.export_btn.clicked.connect(self.export_report)
         self.export_btn.setEnabled(False)
-        self.export_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #9b59b6;
-                color: white;
-                border: none;
-                padding: 12px 20px;
-                border-radius: 6px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #8e44ad;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.export_btn.setStyleSheet(_BUTTON_QSS_TEMPLATE.format(background="#9b59b6", hover="#8e44ad"))
         
         control_layout.addWidget(self.select_folder_btn)
         control_layout.addWidget(self.analyze_btn)
@@ -302,7 +416,7 @@ class StatsWindow(QMainWindow):
         
         # Прогресс бар
         self.progress_label = QLabel(self.texts["progress_label"])
-        self.progress_label.setFont(QFont("Segoe UI", 10))
+        self.progress_label.setFont(_font("Segoe UI", 10))
         self.progress_label.setStyleSheet("color: #2c3e50; margin-top: 10px;")
         main_layout.addWidget(self.progress_label)
         
@@ -343,22 +457,49 @@ class StatsWindow(QMainWindow):
             }
         """)
         
-        # Создаем вкладки
-        self.create_overview_tab()
-        self.create_libraries_tab()
-        self.create_quality_tab()
-        self.create_complexity_tab()
-        self.create_architecture_tab()
-        self.create_dependencies_tab()
+        # Вкладки создаются при первом показе: (заголовок, построение, обновление)
+        self._tabs = [
+            ("📊 Обзор", self.create_overview_tab, self.update_statistics),
+            ("📦 Библиотеки", self.create_libraries_tab, self.update_libraries_table),
+            ("✨ Качество", self.create_quality_tab, self.update_quality_tab),
+            ("📊 Сложность", self.create_complexity_tab, self.update_complexity_tab),
+            ("🏗️ Архитектура", self.create_architecture_tab, self.update_architecture_tab),
+            ("🔗 Зависимости", self.create_dependencies_tab, self.update_dependencies_tab),
+        ]
+        self._built_tabs = set()
+        # Вкладки, данные которых устарели относительно analysis_result
+        self._dirty_tabs = set()
+        
+        for title, _, _ in self._tabs:
+            container = QWidget()
+            QVBoxLayout(container).setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(container, title)
+        
+        self.tab_widget.currentChanged.connect(self._show_tab)
+        self._show_tab(self.tab_widget.currentIndex())
         
         main_layout.addWidget(self.tab_widget)
         
         # Статус бар
         self.statusBar().showMessage("Готов к анализу")
         
-        debug_log("✅ UI полностью инициализирован")
+        logger.debug("✅ UI полностью инициализирован")
+    
+    def _show_tab(self, index: int):
+        """Создает содержимое вкладки при первом показе и обновляет устаревшие данные"""
+        if index < 0:
+            return
+        
+        _, build_tab, update_tab = self._tabs[index]
+        if index not in self._built_tabs:
+            self.tab_widget.widget(index).layout().addWidget(build_tab())
+            self._built_tabs.add(index)
+        
+        if index in self._dirty_tabs:
+            self._dirty_tabs.discard(index)
+            update_tab()
     
-    def create_overview_tab(self):
+    def create_overview_tab(self) -> QWidget:
         """Создание вкладки обзора"""
         overview_widget = QWidget()
         layout = QVBoxLayout(overview_widget)
@@ -366,20 +507,13 @@ class StatsWindow(QMainWindow):
         # Общая статистика
         stats_frame = QFrame()
         stats_frame.setFrameStyle(QFrame.StyledPanel)
-        stats_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 1px solid #dee2e6;
-                border-radius: 8px;
-                padding: 15px;
-            }
-        """)
+        stats_frame.setStyleSheet(_STATS_FRAME_QSS)
         
         stats_layout = QGridLayout(stats_frame)
         
         # Заголовок
         stats_title = QLabel("📊 Общая статистика папки")
-        stats_title.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        stats_title.setFont(_font("Segoe UI", 14, bold=True))
         stats_title.setStyleSheet("color: #2c3e50; margin-bottom: 10px;")
         stats_layout.addWidget(stats_title, 0, 0, 1, 2)
         
@@ -400,11 +534,11 @@ class StatsWindow(QMainWindow):
             col = (i % 2) * 2
             
             label_widget = QLabel(label)
-            label_widget.setFont(QFont("Segoe UI", 10, QFont.Bold))
+            label_widget.setFont(_font("Segoe UI", 10, bold=True))
             label_widget.setStyleSheet("color: #2c3e50;")
             
             value_widget = QLabel("—")
-            value_widget.setFont(QFont("Segoe UI", 12))
+            value_widget.setFont(_font("Segoe UI", 12))
             value_widget.setStyleSheet("color: #27ae60; font-weight: bold;")
             
             stats_layout.addWidget(label_widget, row, col)
@@ -413,18 +547,12 @@ class StatsWindow(QMainWindow):
             self.stats_labels[key] = value_widget
         
         layout.addWidget(stats_frame)
+        self.stats_frame = stats_frame
         
         # Графики
         charts_frame = QFrame()
         charts_frame.setFrameStyle(QFrame.StyledPanel)
-        charts_frame.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 8px;
-                padding: 15px;
-            }
-        """)
+        charts_frame.setStyleSheet(_CHARTS_FRAME_QSS)
         
         charts_layout = QHBoxLayout(charts_frame)
         
@@ -438,39 +566,27 @@ class StatsWindow(QMainWindow):
         
         layout.addWidget(charts_frame)
         
-        self.tab_widget.addTab(overview_widget, "📊 Обзор")
+        return overview_widget
     
-    def create_libraries_tab(self):
+    def create_libraries_tab(self) -> QWidget:
         """Создание вкладки библиотек"""
         libraries_widget = QWidget()
         layout = QVBoxLayout(libraries_widget)
         
         # Таблица библиотек
-        self.libraries_table = QTableWidget()
-        self.libraries_table.setColumnCount(5)
-        self.libraries_table.setHorizontalHeaderLabels([
+        self.libraries_model = RowsTableModel([
             "Библиотека", "Количество", "Процент", "Файлы", "Первый файл"
-        ])
-        self.libraries_table.setStyleSheet("""
-            QTableWidget {
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 5px;
-                gridline-color: #dee2e6;
-            }
-            QHeaderView::section {
-                background-color: #f8f9fa;
-                padding: 8px;
-                border: 1px solid #dee2e6;
-                font-weight: bold;
-            }
-        """)
+        ], self)
+        self.libraries_table = QTableView()
+        self.libraries_table.setModel(self.libraries_model)
+        self.libraries_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.libraries_table.setStyleSheet(_TABLE_QSS)
         
         layout.addWidget(self.libraries_table)
         
-        self.tab_widget.addTab(libraries_widget, "📦 Библиотеки")
+        return libraries_widget
     
-    def create_quality_tab(self):
+    def create_quality_tab(self) -> QWidget:
         """Создание вкладки качества"""
         quality_widget = QWidget()
         layout = QVBoxLayout(quality_widget)
@@ -480,31 +596,19 @@ class StatsWindow(QMainWindow):
         layout.addWidget(self.quality_distribution_chart)
         
         # Таблица файлов с проблемами
-        self.quality_table = QTableWidget()
-        self.quality_table.setColumnCount(4)
-        self.quality_table.setHorizontalHeaderLabels([
+        self.quality_model = RowsTableModel([
             "Файл", "Качество", "Проблемы", "Сложность"
-        ])
-        self.quality_table.setStyleSheet("""
-            QTableWidget {
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 5px;
-                gridline-color: #dee2e6;
-            }
-            QHeaderView::section {
-                background-color: #f8f9fa;
-                padding: 8px;
-                border: 1px solid #dee2e6;
-                font-weight: bold;
-            }
-        """)
+        ], self, formatters=_QUALITY_COLUMNS)
+        self.quality_table = QTableView()
+        self.quality_table.setModel(self.quality_model)
+        self.quality_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.quality_table.setStyleSheet(_TABLE_QSS)
         
         layout.addWidget(self.quality_table)
         
-        self.tab_widget.addTab(quality_widget, "✨ Качество")
+        return quality_widget
     
-    def create_complexity_tab(self):
+    def create_complexity_tab(self) -> QWidget:
         """Создание вкладки сложности"""
         complexity_widget = QWidget()
         layout = QVBoxLayout(complexity_widget)
@@ -514,80 +618,51 @@ class StatsWindow(QMainWindow):
         layout.addWidget(self.complexity_chart)
         
         # Таблица сложных файлов
-        self.complexity_table = QTableWidget()
-        self.complexity_table.setColumnCount(3)
-        self.complexity_table.setHorizontalHeaderLabels([
+        self.complexity_model = RowsTableModel([
             "Файл", "Сложность", "Строк"
-        ])
-        self.complexity_table.setStyleSheet("""
-            QTableWidget {
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 5px;
-                gridline-color: #dee2e6;
-            }
-            QHeaderView::section {
-                background-color: #f8f9fa;
-                padding: 8px;
-                border: 1px solid #dee2e6;
-                font-weight: bold;
-            }
-        """)
+        ], self, formatters=_COMPLEXITY_COLUMNS)
+        self.complexity_table = QTableView()
+        self.complexity_table.setModel(self.complexity_model)
+        self.complexity_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.complexity_table.setStyleSheet(_TABLE_QSS)
         
         layout.addWidget(self.complexity_table)
         
-        self.tab_widget.addTab(complexity_widget, "📊 Сложность")
+        return complexity_widget
     
-    def create_architecture_tab(self):
+    def create_architecture_tab(self) -> QWidget:
         """Создание вкладки архитектуры"""
         architecture_widget = QWidget()
         layout = QVBoxLayout(architecture_widget)
         
         # Текстовое представление архитектуры
         self.architecture_text = QTextEdit()
-        self.architecture_text.setFont(QFont("Consolas", 10))
-        self.architecture_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #f8f9fa;
-                border: 1px solid #dee2e6;
-                border-radius: 5px;
-                padding: 10px;
-                color: #2c3e50;
-            }
-        """)
+        self.architecture_text.setFont(_font("Consolas", 10))
+        self.architecture_text.setStyleSheet(_TEXT_VIEW_QSS)
         self.architecture_text.setPlaceholderText("Результаты анализа архитектуры папки появятся здесь...")
         
         layout.addWidget(self.architecture_text)
         
-        self.tab_widget.addTab(architecture_widget, "🏗️ Архитектура")
+        return architecture_widget
     
-    def create_dependencies_tab(self):
+    def create_dependencies_tab(self) -> QWidget:
         """Создание вкладки зависимостей"""
         dependencies_widget = QWidget()
         layout = QVBoxLayout(dependencies_widget)
         
         # Текстовое представление зависимостей
         self.dependencies_text = QTextEdit()
-        self.dependencies_text.setFont(QFont("Consolas", 10))
-        self.dependencies_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #f8f9fa;
-                border: 1px solid #dee2e6;
-                border-radius: 5px;
-                padding: 10px;
-                color: #2c3e50;
-            }
-        """)
+        self.dependencies_text.setFont(_font("Consolas", 10))
+        self.dependencies_text.setStyleSheet(_TEXT_VIEW_QSS)
         self.dependencies_text.setPlaceholderText("Результаты анализа зависимостей в папке появятся здесь...")
         
         layout.addWidget(self.dependencies_text)
         
-        self.tab_widget.addTab(dependencies_widget, "🔗 Зависимости")
+        return dependencies_widget
     
     def create_chart(self, title: str):
         """Создание заглушки для графика"""
         # Временно создаем простой виджет вместо графика
-        from PySide6.QtWidgets import QLabel
         label = QLabel(f"📊 {title}\n(График временно недоступен)")
         label.setAlignment(Qt.AlignCenter)
         label.setStyleSheet("""
@@ -615,10 +690,11 @@ class StatsWindow(QMainWindow):
         directory = QFileDialog.getExistingDirectory(
             self, 
             "Выберите папку для анализа",
-            os.getcwd()
+            self.config.get_last_directory() or os.getcwd()
         )
         
         if directory:
+            self.config.update_config("last_directory", directory)
             self.folder_path = Path(directory)
             self.analyze_btn.setEnabled(True)
             self.progress_label.setText(self.texts["folder_selected"].format(directory))
@@ -626,45 +702,54 @@ class StatsWindow(QMainWindow):
     
     def start_analysis(self):
         """Запуск анализа папки"""
-        debug_log("🚀 Запуск анализа папки...")
-        debug_log(f"folder_path: {self.folder_path}")
+        logger.debug("🚀 Запуск анализа папки...")
+        logger.debug("folder_path: %s", self.folder_path)
         
         if not self.folder_path:
-            debug_log("❌ folder_path не установлен")
+            logger.debug("❌ folder_path не установлен")
             QMessageBox.warning(self, "Предупреждение", "Сначала выберите папку!")
             return
         
-        debug_log("✅ folder_path установлен, начинаем анализ")
+        logger.debug("✅ folder_path установлен, начинаем анализ")
+        
+        # Неизмененная папка не анализируется повторно
+        cache_key = (str(self.folder_path), project_files_signature(self.folder_path))
+        cached_result = self._analysis_cache.get(cache_key)
+        if cached_result is not None:
+            logger.debug("✅ Используется сохраненный результат анализа")
+            self._analysis_cache.move_to_end(cache_key)
+            QTimer.singleShot(0, lambda: self.analysis_completed(cached_result))
+            return
+        self._pending_cache_key = cache_key
         
         # Отключаем кнопки
         self.analyze_btn.setEnabled(False)
         self.select_folder_btn.setEnabled(False)
         self.export_btn.setEnabled(False)
-        debug_log("✅ Кнопки отключены")
+        logger.debug("✅ Кнопки отключены")
         
         # Показываем прогресс
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # Неопределенный прогресс
-        debug_log("✅ Прогресс бар показан")
+        logger.debug("✅ Прогресс бар показан")
         
         # Запускаем анализ в отдельном потоке
-        debug_log("🔧 Создание AnalysisWorker...")
+        logger.debug("🔧 Создание AnalysisWorker...")
         try:
             self.analysis_worker = AnalysisWorker(self.folder_path, self.config)
-            debug_log("✅ AnalysisWorker создан")
+            logger.debug("✅ AnalysisWorker создан")
             
             self.analysis_worker.progress_updated.connect(self.update_progress)
-            self.analysis_worker.analysis_completed.connect(self.analysis_completed)
+            self.analysis_worker.analysis_completed.connect(self._store_analysis_result)
             self.analysis_worker.error_occurred.connect(self.analysis_error)
-            debug_log("✅ Сигналы подключены")
+            logger.debug("✅ Сигналы подключены")
             
-            debug_log("🚀 Запуск потока анализа...")
+            logger.debug("🚀 Запуск потока анализа...")
             self.analysis_worker.start()
-            debug_log("✅ Поток анализа запущен")
+            logger.debug("✅ Поток анализа запущен")
             
         except Exception as e:
-            debug_log(f"❌ ОШИБКА при создании AnalysisWorker: {e}")
-            debug_log(f"Трассировка: {traceback.format_exc()}")
+            logger.error("❌ ОШИБКА при создании AnalysisWorker: %s", e, exc_info=True)
             QMessageBox.critical(self, "Ошибка", f"Ошибка при запуске анализа:\n{e}")
             # Включаем кнопки обратно
             self.analyze_btn.setEnabled(True)
@@ -677,6 +762,16 @@ class StatsWindow(QMainWindow):
         self.progress_label.setText(message)
         self.statusBar().showMessage(message)
     
+    def _store_analysis_result(self, result: Dict[str, Any]):
+        """Сохранение результата анализа в кэше и отображение"""
+        if self._pending_cache_key is not None:
+            self._analysis_cache[self._pending_cache_key] = result
+            self._pending_cache_key = None
+            if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        
+        self.analysis_completed(result)
+    
     def analysis_completed(self, result: Dict[str, Any]):
         """Завершение анализа"""
         self.analysis_result = result
@@ -689,13 +784,9 @@ class StatsWindow(QMainWindow):
         self.select_folder_btn.setEnabled(True)
         self.export_btn.setEnabled(True)
         
-        # Обновляем данные
-        self.update_statistics()
-        self.update_libraries_table()
-        self.update_quality_tab()
-        self.update_complexity_tab()
-        self.update_architecture_tab()
-        self.update_dependencies_tab()
+        # Обновляем только текущую вкладку, остальные - при переключении на них
+        self._dirty_tabs = set(range(len(self._tabs)))
+        self._show_tab(self.tab_widget.currentIndex())
         
         self.progress_label.setText(self.texts["analysis_completed"])
         self.statusBar().showMessage("Анализ завершен успешно")
@@ -719,16 +810,27 @@ class StatsWindow(QMainWindow):
         if not self.analysis_result:
             return
         
+        # Агрегаты уже посчитаны анализатором за проход сбора результатов,
+        # здесь остается только форматирование
         stats = self.analysis_result['project_stats']
         
-        # Обновляем метрики
-        self.stats_labels['total_files'].setText(str(stats['total_files']))
-        self.stats_labels['total_lines'].setText(str(stats['total_lines']))
-        self.stats_labels['total_imports'].setText(str(stats['total_imports']))
-        self.stats_labels['unique_libraries'].setText(str(stats['unique_libraries']))
-        self.stats_labels['average_complexity'].setText(f"{stats['average_complexity']:.2f}")
-        self.stats_labels['quality_score'].setText(f"{stats['quality_score']:.2f}")
-        self.stats_labels['scan_duration'].setText(f"{stats['scan_duration']:.2f}с")
+        # Форматируем значения заранее и обновляем метрики одной перерисовкой
+        values = {
+            'total_files': str(stats['total_files']),
+            'total_lines': str(stats['total_lines']),
+            'total_imports': str(stats['total_imports']),
+            'unique_libraries': str(stats['unique_libraries']),
+            'average_complexity': f"{stats['average_complexity']:.2f}",
+            'quality_score': f"{stats['quality_score']:.2f}",
+            'scan_duration': f"{stats['scan_duration']:.2f}с",
+        }
+        
+        self.stats_frame.setUpdatesEnabled(False)
+        try:
+            for key, value in values.items():
+                self.stats_labels[key].setText(value)
+        finally:
+            self.stats_frame.setUpdatesEnabled(True)
         
         # Обновляем графики
         self.update_libraries_chart()
@@ -741,16 +843,11 @@ class StatsWindow(QMainWindow):
         
         libraries = self.analysis_result['top_libraries']
         
-        self.libraries_table.setRowCount(len(libraries))
-        
-        for i, lib in enumerate(libraries):
-            self.libraries_table.setItem(i, 0, QTableWidgetItem(lib['name']))
-            self.libraries_table.setItem(i, 1, QTableWidgetItem(str(lib['count'])))
-            self.libraries_table.setItem(i, 2, QTableWidgetItem(f"{lib['percentage']:.1f}%"))
-            self.libraries_table.setItem(i, 3, QTableWidgetItem(str(len(lib['files']))))
-            self.libraries_table.setItem(i, 4, QTableWidgetItem(lib['first_occurrence']))
-        
-        self.libraries_table.resizeColumnsToContents()
+        self.libraries_model.set_rows([
+            (lib['name'], str(lib['count']), f"{lib['percentage']:.1f}%",
+             str(len(lib['files'])), lib['first_occurrence'])
+            for lib in libraries
+        ])
     
     def update_libraries_chart(self):
         """Обновление графика библиотек"""
@@ -773,20 +870,9 @@ class StatsWindow(QMainWindow):
         if not self.analysis_result:
             return
         
-        files_analysis = self.analysis_result['files_analysis']
-        
-        # Сортируем по качеству
-        sorted_files = sorted(files_analysis, key=lambda x: x['quality_score'])
-        
-        self.quality_table.setRowCount(len(sorted_files))
-        
-        for i, file_analysis in enumerate(sorted_files):
-            self.quality_table.setItem(i, 0, QTableWidgetItem(file_analysis['path']))
-            self.quality_table.setItem(i, 1, QTableWidgetItem(f"{file_analysis['quality_score']:.1f}"))
-            self.quality_table.setItem(i, 2, QTableWidgetItem(str(len(file_analysis['issues']))))
-            self.quality_table.setItem(i, 3, QTableWidgetItem(f"{file_analysis['complexity']:.1f}"))
-        
-        self.quality_table.resizeColumnsToContents()
+        # Файлы уже отсортированы по качеству в AnalysisWorker, текст ячеек
+        # форматируется моделью только для показываемых строк
+        self.quality_model.set_rows(self.analysis_result['files_analysis'])
     
     def update_complexity_tab(self):
         """Обновление вкладки сложности"""
@@ -796,16 +882,9 @@ class StatsWindow(QMainWindow):
         files_analysis = self.analysis_result['files_analysis']
         
         # Сортируем по сложности
-        sorted_files = sorted(files_analysis, key=lambda x: x['complexity'], reverse=True)
-        
-        self.complexity_table.setRowCount(len(sorted_files))
+        sorted_files = sorted(files_analysis, key=itemgetter('complexity'), reverse=True)
         
-        for i, file_analysis in enumerate(sorted_files):
-            self.complexity_table.setItem(i, 0, QTableWidgetItem(file_analysis['path']))
-            self.complexity_table.setItem(i, 1, QTableWidgetItem(f"{file_analysis['complexity']:.1f}"))
-            self.complexity_table.setItem(i, 2, QTableWidgetItem(str(file_analysis['lines'])))
-        
-        self.complexity_table.resizeColumnsToContents()
+        self.complexity_model.set_rows(sorted_files)
     
     def update_architecture_tab(self):
         """Обновление вкладки архитектуры"""
@@ -862,16 +941,22 @@ class StatsWindow(QMainWindow):
         )
         
         if file_path:
-            try:
-                output_path = Path(file_path)
-                format_type = 'json' if file_path.endswith('.json') else 'txt'
-                
-                # Создаем анализатор для экспорта
-                analyzer = IntegratedProjectAnalyzer(self.config)
-                analyzer.analysis_result = self.analysis_result
-                analyzer.export_report(output_path, format_type)
-                
-                QMessageBox.information(self, "Успех", f"Отчет сохранен в {file_path}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Ошибка", f"Ошибка при сохранении отчета:\n{e}")
+            format_type = 'json' if file_path.endswith('.json') else 'txt'
+            
+            # Сохраняем в отдельном потоке, кнопка недоступна до завершения
+            self.export_btn.setEnabled(False)
+            self.export_worker = ExportWorker(self.analysis_result, Path(file_path),
+                                              format_type, self.config)
+            self.export_worker.export_completed.connect(self.export_completed)
+            self.export_worker.error_occurred.connect(self.export_error)
+            self.export_worker.start()
+    
+    def export_completed(self, file_path: str):
+        """Завершение экспорта отчета"""
+        self.export_btn.setEnabled(True)
+        QMessageBox.information(self, "Успех", f"Отчет сохранен в {file_path}")
+    
+    def export_error(self, error_message: str):
+        """Ошибка экспорта отчета"""
+        self.export_btn.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при сохранении отчета:\n{error_message}")
@@ -76,6 +76,16 @@ class TestArchitecture:
         assert service.file_scanner is not None
         assert service.data_exporter is not None
     
+    def test_scan_service_lazy_components(self):
+        """Тест ленивого создания тяжелых компонентов сервиса"""
+        service = ScanService()
+        
+        for name in ("data_exporter", "performance_manager", "complexity_analyzer"):
+            assert name not in vars(service)
+            component = getattr(service, name)
+            assert component is not None
+            assert getattr(service, name) is component
+    
     def test_import_parser_functionality(self):
         """Тест функциональности парсера импортов"""
         config = Configuration()
@@ -103,6 +113,204 @@ from typing import List, Dict
         assert "numpy" in imports
         assert "pandas" in imports
     
+    def test_import_statistics_from_counts(self):
+        """Тест статистики по уже подсчитанным импортам"""
+        parser = ImportParser(Configuration())
+        imports = ["numpy", "os", "numpy", "pandas", "requests", "pandas", "numpy"]
+        
+        expected = parser.get_import_statistics(imports)
+        counts = {"numpy": 3, "os": 1, "pandas": 2, "requests": 1, "unused": 0}
+        
+        assert parser.get_import_statistics_from_counts(counts) == expected
+        assert expected['total'] == 7
+        assert expected['most_common'][0] == ("numpy", 3)
+        assert parser.get_import_statistics_from_counts({})['total'] == 0
+    
+    def test_scan_service_reuses_observers(self):
+        """Тест переиспользования наблюдателей между сканированиями"""
+        from core.patterns import ProgressObserver
+        
+        service = ScanService()
+        
+        service._setup_observers(lambda msg: None)
+        first = list(service.scan_subject.observers)
+        assert len(first) == 3
+        assert isinstance(first[2], ProgressObserver)
+        
+        service._setup_observers()
+        second = list(service.scan_subject.observers)
+        assert second == first[:2]
+        assert second[0] is service._logging_observer
+        assert second[1] is service._metrics_observer
+    
+    def test_scan_service_analyze_file_complexity(self):
+        """Тест анализа сложности файла через сервис"""
+        import logging
+        
+        service = ScanService()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / "module.py"
+            file_path.write_text("def f(x):\n    if x:\n        return 1\n    return 0\n")
+            
+            report = service.analyze_file_complexity(file_path)
+            assert report.metrics.cyclomatic_complexity >= 2
+            
+            previous_level = service.logger.level
+            service.logger.setLevel(logging.WARNING)
+            try:
+                assert service.analyze_file_complexity(file_path).grade == report.grade
+            finally:
+                service.logger.setLevel(previous_level)
+    
+    def test_analyze_complexity_walks_directory_once(self):
+        """Тест единственного обхода директории при анализе сложности"""
+        from unittest.mock import patch
+        from core import scan_service
+        
+        service = ScanService()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "pkg").mkdir()
+            (root / "main.py").write_text("def main():\n    return 1\n")
+            (root / "pkg" / "utils.py").write_text("def helper(x):\n    if x:\n        return x\n")
+            
+            with patch.object(scan_service, '_iter_py_files',
+                              wraps=scan_service._iter_py_files) as walk_mock:
+                report = service.analyze_complexity(root)
+            
+            assert walk_mock.call_count == 1
+            assert report.total_files == 2
+    
+    def test_analyze_complexity_sees_changes_in_subdirectories(self):
+        """Тест учета добавленных и удаленных файлов поддиректорий при анализе сложности"""
+        from unittest.mock import patch
+        
+        service = ScanService()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "pkg").mkdir()
+            (root / "main.py").write_text("def main():\n    return 1\n")
+            (root / "pkg" / "a.py").write_text("def a():\n    return 1\n")
+            service.analyze_complexity(root)
+            
+            # mtime корня не меняется при изменениях в поддиректории
+            (root / "pkg" / "b.py").write_text("def b():\n    return 2\n")
+            (root / "pkg" / "a.py").unlink()
+            analyzer = service.complexity_analyzer
+            with patch.object(analyzer, 'analyze_project',
+                              wraps=analyzer.analyze_project) as analyze_mock:
+                report = service.analyze_complexity(root)
+            
+            file_names = sorted(path.name for path in analyze_mock.call_args.kwargs['files'])
+            assert file_names == ["b.py", "main.py"]
+            assert report.total_files == 2
+    
+    def test_analyze_files_complexity_parallel_matches_sequential(self):
+        """Тест совпадения параллельного и последовательного анализа сложности файлов"""
+        from unittest.mock import patch
+        from core import scan_service
+        
+        service = ScanService()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            files = []
+            for i in range(4):
+                file_path = Path(temp_dir) / f"module{i}.py"
+                body = "".join(f"    if x > {j}:\n        x -= 1\n" for j in range(i))
+                file_path.write_text(f"def f(x):\n{body}    return x\n")
+                files.append(file_path)
+            
+            sequential = service.analyze_files_complexity(files)
+            with patch.object(scan_service, 'PARALLEL_COMPLEXITY_MIN_FILES', 1), \
+                    patch('core.scan_service.os.cpu_count', return_value=2):
+                parallel = service.analyze_files_complexity(files)
+            
+            assert [r.file_path for r in parallel] == files
+            assert ([r.metrics.cyclomatic_complexity for r in parallel]
+                    == [r.metrics.cyclomatic_complexity for r in sequential])
+    
+    def test_analyze_files_complexity_falls_back_without_pool(self):
+        """Тест последовательного анализа сложности, если пул процессов недоступен"""
+        from concurrent.futures.process import BrokenProcessPool
+        from unittest.mock import patch
+        from core import scan_service
+        
+        service = ScanService()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            files = []
+            for i in range(2):
+                file_path = Path(temp_dir) / f"module{i}.py"
+                file_path.write_text("def f(x):\n    return x\n")
+                files.append(file_path)
+            
+            with patch.object(scan_service, 'PARALLEL_COMPLEXITY_MIN_FILES', 1), \
+                    patch('core.scan_service.os.cpu_count', return_value=2), \
+                    patch.object(scan_service, 'ProcessPoolExecutor',
+                                 side_effect=BrokenProcessPool("pool died")):
+                reports = service.analyze_files_complexity(files)
+            
+            assert [r.file_path for r in reports] == files
+    
+    def test_scan_service_rejects_concurrent_scan(self):
+        """Тест запрета одновременного сканирования"""
+        service = ScanService()
+        assert not service.is_scanning
+        
+        service._scan_lock.acquire()
+        try:
+            assert service.is_scanning
+            with pytest.raises(RuntimeError, match="уже выполняется"):
+                service.scan_directory(Path("."))
+        finally:
+            service._scan_lock.release()
+        
+        assert not service.is_scanning
+    
+    def test_scan_service_process_imports_list(self):
+        """Тест подсчета импортов из списка"""
+        service = ScanService()
+        
+        imports_data, total_imports = service._process_imports_list(
+            ["numpy", "pandas", "numpy", "numpy"]
+        )
+        
+        assert total_imports == 4
+        assert list(imports_data) == ["numpy", "pandas"]
+        assert imports_data["numpy"].count == 3
+        assert imports_data["numpy"].percentage == 75.0
+        assert imports_data["pandas"].percentage == 25.0
+        assert service._process_imports_list([]) == ({}, 0)
+    
+    def test_scan_service_export_results(self):
+        """Тест экспорта результатов в несколько форматов"""
+        from datetime import datetime
+        from core.interfaces import ScanResult, ImportData
+        
+        service = ScanService()
+        result = ScanResult(
+            imports_data={"numpy": ImportData("numpy", 2, 100.0, ["a.py", "b.py"])},
+            projects_data=[],
+            total_files_scanned=2,
+            total_imports=2,
+            scan_duration=0.5,
+            scan_timestamp=datetime(2024, 1, 2, 3, 4, 5)
+        )
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            exported = service.export_results(
+                result, output_dir, ['csv', 'json', 'txt', 'imports_csv']
+            )
+            
+            assert list(exported) == ['csv', 'json', 'txt', 'imports_csv']
+            assert exported['json'] == output_dir / "import_scan_20240102_030405.json"
+            assert exported['txt'].name == "import_scan_20240102_030405_report.txt"
+            assert all(path.exists() for path in exported.values())
+    
     def test_configuration_persistence(self):
         """Тест сохранения конфигурации"""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
@@ -117,12 +325,36 @@ from typing import List, Dict
             # Создаем новую конфигурацию и проверяем, что изменения сохранились
             new_config = Configuration(config_file)
             assert new_config.get_max_depth() == 10
-            
+        
         finally:
             # Удаляем временный файл
             if config_file.exists():
                 config_file.unlink()
     
+    def test_configuration_last_directory(self):
+        """Тест сохранения последней выбранной папки"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.json"
+            config = Configuration(config_file)
+            assert config.get_last_directory() is None
+            
+            config.update_config("last_directory", temp_dir)
+            assert Configuration(config_file).get_last_directory() == temp_dir
+    
+    def test_configuration_cached_objects(self):
+        """Тест кэширования объектов конфигурации логирования и безопасности"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = Configuration(Path(temp_dir) / "config.json")
+            
+            security_config = config.security_config
+            assert config.security_config is security_config
+            assert config.logging_config is config.logging_config
+            
+            # Изменение настроек сбрасывает закэшированные объекты
+            config.update_security_config("max_file_size", 12345)
+            assert config.security_config is not security_config
+            assert config.security_config.max_file_size == 12345
+    
     def test_scan_service_validation(self):
         """Тест валидации директории в сервисе"""
         service = ScanService()
@@ -144,6 +376,128 @@ from typing import List, Dict
             if temp_file.exists():
                 temp_file.unlink()
     
+    def test_scan_service_validation_python_files(self):
+        """Тест поиска Python файлов при валидации директории"""
+        service = ScanService()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "README.md").write_text("# readme\n")
+            
+            is_valid, message = service.validate_directory(root)
+            assert not is_valid
+            assert "не найдено Python файлов" in message
+            
+            nested = root / "pkg" / "sub"
+            nested.mkdir(parents=True)
+            (nested / "module.py").write_text("import os\n")
+            (root / "main.py").write_text("import sys\n")
+            
+            is_valid, message = service.validate_directory(root)
+            assert is_valid
+            
+            is_valid, message = service.validate_directory(root, count_files=True)
+            assert is_valid
+            assert "Найдено 2 Python файлов" in message
+    
+    def test_parallel_walk_matches_sequential(self):
+        """Тест совпадения параллельного и последовательного обхода директорий"""
+        from core.scan_service import _iter_py_files, _parallel_walk
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            for i in range(5):
+                package = root / f"pkg{i}" / "sub"
+                package.mkdir(parents=True)
+                (package / "module.py").write_text("import os\n")
+                (package.parent / "__init__.py").write_text("")
+                (package / "data.txt").write_text("")
+            
+            expected = sorted(_iter_py_files(temp_dir))
+            assert len(expected) == 10
+            assert sorted(_parallel_walk(temp_dir, max_workers=4)) == expected
+            
+            config = Configuration(root / "config.json")
+            config.update_performance_config("parallel_directory_walk", True)
+            is_valid, message = ScanService(config).validate_directory(root, count_files=True)
+            assert is_valid
+            assert "Найдено 10 Python файлов" in message
+    
+    def test_validate_directory_cached_by_mtime(self):
+        """Тест кэширования проверки директории по времени модификации"""
+        from unittest.mock import patch
+        from core import scan_service
+        
+        service = ScanService()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "main.py").write_text("import os\n")
+            
+            with patch.object(scan_service, '_iter_py_files',
+                              wraps=scan_service._iter_py_files) as walk_mock:
+                assert service.validate_directory(root)[0]
+                assert service.validate_directory(root)[0]
+                assert walk_mock.call_count == 1
+                
+                # Изменение директории делает запись кэша недействительной
+                dir_stat = os.stat(root)
+                os.utime(root, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns + 1_000_000_000))
+                assert service.validate_directory(root)[0]
+                assert walk_mock.call_count == 2
+    
+    def test_validate_directory_counts_files_without_cache(self):
+        """Тест подсчета файлов новым обходом при изменениях в поддиректориях"""
+        service = ScanService()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "pkg").mkdir()
+            (root / "pkg" / "a.py").write_text("import os\n")
+            
+            assert "Найдено 1 Python файлов" in service.validate_directory(root, count_files=True)[1]
+            
+            # mtime корня не меняется при добавлении файла в поддиректорию
+            (root / "pkg" / "b.py").write_text("import sys\n")
+            assert "Найдено 2 Python файлов" in service.validate_directory(root, count_files=True)[1]
+    
+    def test_project_analyzer_creation_date(self):
+        """Тест определения даты создания проекта"""
+        config = Configuration()
+        analyzer = ProjectAnalyzer(config)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in ("a.py", "b.py"):
+                (Path(temp_dir) / name).write_text("import os\n")
+            
+            created_date = analyzer._get_earliest_creation_date(
+                Path(temp_dir), ["a.py", "b.py", "missing.py"]
+            )
+            assert created_date is not None
+            
+            assert analyzer._get_earliest_creation_date(temp_dir, ["missing.py"]) is None
+    
+    def test_project_analyzer_structure(self):
+        """Тест анализа структуры проектов"""
+        config = Configuration()
+        analyzer = ProjectAnalyzer(config)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "main.py").write_text("import os\n")
+            (root / "pkg" / "sub").mkdir(parents=True)
+            (root / "pkg" / "sub" / "module.py").write_text("import sys\n")
+            (root / "__pycache__").mkdir()
+            (root / "__pycache__" / "cached.py").write_text("")
+            
+            projects = {p.name: p for p in analyzer.analyze_project_structure(root)}
+            
+            assert set(projects) == {"ROOT", "pkg / sub"}
+            assert projects["ROOT"].path == root
+            assert projects["pkg / sub"].path == root / "pkg" / "sub"
+            assert projects["pkg / sub"].directories == {os.path.join("pkg", "sub")}
+            assert projects["ROOT"].directories == set()
+    
     def test_dependency_injection(self):
         """Тест dependency injection"""
         config = Configuration()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Тесты для кэша AST деревьев
+"""
+
+import os
+import unittest
+from pathlib import Path
+import tempfile
+import sys
+
+# Добавляем путь к модулям
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.ast_cache import AstCache
+from core.complexity_analyzer import ComplexityAnalyzer
+from core.code_quality_analyzer import CodeQualityAnalyzer
+
+
+class TestAstCache(unittest.TestCase):
+    """Тесты для кэша AST деревьев"""
+    
+    def setUp(self):
+        """Настройка тестов"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = Path(self.temp_dir) / "module.py"
+        self.file_path.write_text("def f(x):\n    if x:\n        return 1\n    return 0\n", encoding='utf-8')
+        self.cache = AstCache()
+    
+    def tearDown(self):
+        """Очистка после тестов"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_get_returns_cached_tree(self):
+        """Тест повторного получения дерева из кэша"""
+        tree = self.cache.get(self.file_path)
+        
+        self.assertIs(self.cache.get(str(self.file_path)), tree)
+        self.assertEqual(len(self.cache), 1)
+    
+    def test_modified_file_is_reparsed(self):
+        """Тест повторного разбора измененного файла"""
+        tree = self.cache.get(self.file_path)
+        
+        stat = os.stat(self.file_path)
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        
+        self.assertIsNot(self.cache.get(self.file_path), tree)
+    
+    def test_syntax_error_is_raised(self):
+        """Тест ошибки разбора файла с синтаксической ошибкой"""
+        broken = Path(self.temp_dir) / "broken.py"
+        broken.write_text("def broken(:\n", encoding='utf-8')
+        
+        with self.assertRaises(SyntaxError):
+            self.cache.get(broken)
+    
+    def test_analyzers_share_cache(self):
+        """Тест использования кэша анализаторами сложности и качества"""
+        complexity = ComplexityAnalyzer().analyze_file(self.file_path, ast_cache=self.cache)
+        quality = CodeQualityAnalyzer().analyze_file(self.file_path, ast_cache=self.cache)
+        
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(complexity.metrics.cyclomatic_complexity,
+                         ComplexityAnalyzer().analyze_file(self.file_path).metrics.cyclomatic_complexity)
+        self.assertEqual(quality.overall_score,
+                         CodeQualityAnalyzer().analyze_file(self.file_path).overall_score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -226,6 +226,43 @@ class TestObserverPattern(unittest.TestCase):
         self.assertEqual(metrics['total_imports'], 5)
         self.assertIsNotNone(metrics['start_time'])
         self.assertIsNotNone(metrics['end_time'])
+    
+    def test_scan_event_types(self):
+        """Тест приведения строковых имен событий к ScanEventType"""
+        from core.patterns import ScanEvent, ScanEventType
+        
+        self.assertIs(ScanEvent("scan_started", {}).event_type, ScanEventType.STARTED)
+        self.assertIs(ScanEvent("file_processed", {}).event_type, ScanEventType.PROGRESS)
+        self.assertIs(ScanEvent(ScanEventType.ERROR, {}).event_type, ScanEventType.ERROR)
+        self.assertEqual(ScanEvent("custom_event", {}).event_type, "custom_event")
+        
+        # Наблюдатели, сравнивающие с прежними строковыми именами, продолжают работать
+        self.assertEqual(ScanEvent(ScanEventType.COMPLETED, {}).event_type, "scan_completed")
+        self.assertEqual(ScanEvent("file_processed", {}).event_type, "file_processed")
+        self.assertIn(ScanEventType.ERROR, {"error"})
+        
+        observer = MetricsObserver()
+        self.subject.attach(observer)
+        self.subject.notify_all(ScanEventType.PROGRESS, {"imports_count": 2})
+        self.subject.notify_all("file_processed", {"imports_count": 1})
+        self.assertEqual(observer.get_metrics()['total_imports'], 3)
+    
+    def test_metrics_observer_reset(self):
+        """Тест сброса метрик наблюдателя"""
+        from core.patterns import ScanEvent
+        
+        observer = MetricsObserver()
+        observer.update(ScanEvent("scan_started", {}))
+        observer.update(ScanEvent("file_processed", {"imports_count": 3}))
+        observer.update(ScanEvent("error", {}))
+        
+        observer.reset()
+        
+        metrics = observer.get_metrics()
+        self.assertEqual(metrics['files_processed'], 0)
+        self.assertEqual(metrics['total_imports'], 0)
+        self.assertEqual(metrics['errors'], 0)
+        self.assertIsNone(metrics['start_time'])
 
 
 class TestBuilderPattern(unittest.TestCase):
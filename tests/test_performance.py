@@ -5,13 +5,16 @@ import unittest
 import tempfile
 import time
 import os
+import json
+import dataclasses
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 # Импорты для тестирования
 from src.core.performance import (
     PerformanceConfig, LRUCache, PerformanceProfiler, 
-    MemoryOptimizer, ThreadOptimizer, PerformanceManager
+    MemoryOptimizer, ThreadOptimizer, PerformanceManager,
+    cached, profiled, _compute_thread_count
 )
 
 
@@ -40,6 +43,13 @@ class TestPerformanceConfig(unittest.TestCase):
         self.assertFalse(config.enable_caching)
         self.assertEqual(config.cache_size, 500)
         self.assertFalse(config.enable_profiling)
+    
+    def test_config_is_frozen(self):
+        """Тест неизменяемости конфигурации"""
+        config = PerformanceConfig()
+        
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.cache_size = 10
 
 
 class TestLRUCache(unittest.TestCase):
@@ -104,6 +114,22 @@ class TestLRUCache(unittest.TestCase):
         self.cache.clear()
         self.assertEqual(self.cache.size(), 0)
         self.assertIsNone(self.cache.get("key1"))
+    
+    def test_hit_rate(self):
+        """Тест подсчета попаданий в кэш"""
+        self.assertEqual(self.cache.hit_rate, 0.0)
+        
+        self.cache.put("key1", "value1")
+        self.cache.get("key1")
+        self.cache.get("key1")
+        self.cache.get("key2")
+        
+        self.assertEqual(self.cache.hits, 2)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertAlmostEqual(self.cache.hit_rate, 2 / 3)
+        
+        self.cache.clear()
+        self.assertEqual(self.cache.hit_rate, 0.0)
 
 
 class TestPerformanceProfiler(unittest.TestCase):
@@ -148,6 +174,23 @@ class TestPerformanceProfiler(unittest.TestCase):
         self.assertEqual(stats["metric1"]["min"], 1.0)
         self.assertEqual(stats["metric1"]["max"], 3.0)
     
+    def test_save_profile_appends_lines(self):
+        """Тест дозаписи профиля в формате NDJSON"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profile_file = Path(temp_dir) / "profile.ndjson"
+            profiler = PerformanceProfiler(PerformanceConfig(profile_file=str(profile_file)))
+            
+            profiler.add_metric("metric", 1.0)
+            profiler.save_profile()
+            profiler.add_metric("metric", 2.0)
+            profiler.save_profile()
+            
+            records = [json.loads(line) for line in profile_file.read_text(encoding='utf-8').splitlines()]
+            self.assertEqual(len(records), 2)
+            self.assertIn('config', records[0])
+            self.assertNotIn('config', records[1])
+            self.assertEqual(records[-1]['statistics']['metric']['count'], 2)
+    
     def test_reset(self):
         """Тест сброса профилировщика"""
         self.profiler.add_metric("test_metric", 1.0)
@@ -227,16 +270,25 @@ class TestThreadOptimizer(unittest.TestCase):
         threads = self.optimizer.get_optimal_thread_count(1000, 512)
         self.assertEqual(threads, 4)  # (cpu_count // 2) // 2
     
+    def test_optimal_thread_count_is_memoized(self):
+        """Тест кэширования расчета количества потоков"""
+        threads = self.optimizer.get_optimal_thread_count(500, 3600)
+        hits_before = _compute_thread_count.cache_info().hits
+        
+        # Память из того же блока дает тот же результат из кэша
+        self.assertEqual(self.optimizer.get_optimal_thread_count(500, 3700), threads)
+        self.assertEqual(_compute_thread_count.cache_info().hits, hits_before + 1)
+    
     def test_get_chunk_size(self):
         """Тест определения размера чанка"""
         # Тест с фиксированным размером
-        self.config.thread_chunk_size = 50
-        chunk_size = self.optimizer.get_chunk_size(1000, 8)
+        optimizer = ThreadOptimizer(PerformanceConfig(thread_chunk_size=50))
+        chunk_size = optimizer.get_chunk_size(1000, 8)
         self.assertEqual(chunk_size, 50)
         
         # Тест с адаптивным размером
-        self.config.thread_chunk_size = 0
-        chunk_size = self.optimizer.get_chunk_size(1000, 8)
+        optimizer = ThreadOptimizer(PerformanceConfig(thread_chunk_size=0))
+        chunk_size = optimizer.get_chunk_size(1000, 8)
         self.assertGreater(chunk_size, 0)
         self.assertLessEqual(chunk_size, 200)
     
@@ -313,6 +365,25 @@ class TestPerformanceManager(unittest.TestCase):
         self.assertEqual(report['cache']['size'], 1)
         self.assertIn('test_operation', report['profiling'])
     
+    def test_hash_file(self):
+        """Тест хеширования файлов"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            small_file = Path(temp_dir) / "small.py"
+            small_file.write_text("import os\n")
+            large_file = Path(temp_dir) / "large.py"
+            large_file.write_bytes(b"x = 1\n" * 20000)
+            empty_file = Path(temp_dir) / "empty.py"
+            empty_file.write_bytes(b"")
+            
+            small_hash = self.manager.hash_file(small_file)
+            self.assertEqual(small_hash, self.manager.hash_file(str(small_file)))
+            self.assertNotEqual(small_hash, self.manager.hash_file(large_file))
+            self.assertIsInstance(self.manager.hash_file(empty_file), str)
+            
+            # Изменение файла должно менять хеш
+            small_file.write_text("import sys, os\n")
+            self.assertNotEqual(small_hash, self.manager.hash_file(small_file))
+    
     def test_clear_cache(self):
         """Тест очистки кэша"""
         self.manager.cache_result("test_key", "test_value")
@@ -321,6 +392,42 @@ class TestPerformanceManager(unittest.TestCase):
         self.manager.clear_cache()
         self.assertEqual(self.manager.cache.size(), 0)
     
+    def test_flush_if_stale(self):
+        """Тест отложенной записи данных производительности"""
+        with patch.object(self.manager.profiler, 'save_profile') as save_mock:
+            # Несохраненных данных нет - запись не выполняется
+            self.assertFalse(self.manager.flush_if_stale())
+            
+            # Первая запись выполняется сразу
+            self.manager.mark_dirty()
+            self.assertTrue(self.manager.flush_if_stale())
+            
+            # Повторная запись в пределах интервала откладывается
+            self.manager.mark_dirty()
+            self.assertFalse(self.manager.flush_if_stale(min_interval_s=3600))
+            self.assertTrue(self.manager.flush_if_stale(min_interval_s=0))
+            
+            self.assertEqual(save_mock.call_count, 2)
+    
+    def test_flush_on_exit_tracks_live_managers(self):
+        """Тест записи данных всех живых менеджеров одним обработчиком atexit"""
+        import gc
+        from src.core import performance
+        
+        manager = PerformanceManager(self.config)
+        self.assertIn(manager, performance._live_managers)
+        
+        with patch.object(PerformanceManager, 'save_performance_data') as save_mock:
+            manager.mark_dirty()
+            performance._flush_on_exit()
+            save_mock.assert_called()
+        
+        # Удаленный менеджер не удерживается множеством
+        live_count = len(performance._live_managers)
+        del manager
+        gc.collect()
+        self.assertEqual(len(performance._live_managers), live_count - 1)
+    
     def test_reset_profiler(self):
         """Тест сброса профилировщика"""
         self.manager.add_metric("test_metric", 1.0)
@@ -334,6 +441,46 @@ class TestPerformanceManager(unittest.TestCase):
         self.assertEqual(len(report_after['profiling']), 0)
 
 
+class TestDecorators(unittest.TestCase):
+    """Тесты для декораторов кэширования и профилирования"""
+    
+    def test_cached_decorator(self):
+        """Тест декоратора кэширования"""
+        manager = PerformanceManager(PerformanceConfig(enable_caching=True))
+        calls = []
+        
+        @cached(manager)
+        def square(x):
+            calls.append(x)
+            return x * x
+        
+        self.assertEqual(square(3), 9)
+        self.assertEqual(square(3), 9)
+        self.assertEqual(calls, [3])
+        self.assertEqual(manager.cache.hits, 1)
+    
+    def test_cached_decorator_disabled(self):
+        """Тест декоратора кэширования при выключенном кэше"""
+        manager = PerformanceManager(PerformanceConfig(enable_caching=False))
+        
+        def square(x):
+            return x * x
+        
+        self.assertIs(cached(manager)(square), square)
+    
+    def test_profiled_decorator(self):
+        """Тест декоратора профилирования"""
+        manager = PerformanceManager(PerformanceConfig(enable_profiling=True))
+        
+        @profiled(manager)
+        def work():
+            return 42
+        
+        self.assertEqual(work(), 42)
+        stats = manager.profiler.get_statistics()
+        self.assertEqual(stats[f"{work.__module__}.work"]["count"], 1)
+
+
 class TestPerformanceIntegration(unittest.TestCase):
     """Интеграционные тесты производительности"""
     
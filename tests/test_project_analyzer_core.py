@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Тесты для интегрированного анализатора проектов
+"""
+
+import unittest
+from pathlib import Path
+import tempfile
+from unittest.mock import patch
+import sys
+
+# Добавляем путь к модулям
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.configuration import Configuration
+from core.project_analyzer_core import IntegratedProjectAnalyzer
+
+
+class TestIntegratedProjectAnalyzer(unittest.TestCase):
+    """Тесты для интегрированного анализатора проектов"""
+    
+    def setUp(self):
+        """Настройка тестов"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.project_path = self.temp_path / "project"
+        self.project_path.mkdir()
+        
+        config = Configuration(self.temp_path / "config.json")
+        self.analyzer = IntegratedProjectAnalyzer(config)
+    
+    def tearDown(self):
+        """Очистка после тестов"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def create_test_file(self, name: str, content: str) -> Path:
+        """Создает тестовый файл"""
+        file_path = self.project_path / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return file_path
+    
+    def create_sample_project(self) -> None:
+        """Создает небольшой тестовый проект"""
+        self.create_test_file("main.py", '''
+import numpy
+import pandas as pd
+from requests import get
+
+
+def main():
+    if numpy:
+        return pd
+    return get
+''')
+        self.create_test_file("pkg/utils.py", '''
+import numpy as np
+
+def helper(values):
+    for value in values:
+        if value > 0:
+            return np.array(value)
+''')
+        self.create_test_file("pkg/broken.py", "def broken(:\n    pass\n")
+    
+    def test_analyze_project_stats(self):
+        """Тест итоговой статистики проекта"""
+        self.create_sample_project()
+        
+        result = self.analyzer.analyze_project(self.project_path)
+        stats = result['project_stats']
+        
+        self.assertEqual(stats['total_files'], 3)
+        self.assertEqual(stats['total_imports'], 4)
+        self.assertEqual(stats['unique_libraries'], 3)
+        self.assertEqual(len(result['files_analysis']), 3)
+    
+    def test_libraries_info(self):
+        """Тест информации о библиотеках"""
+        self.create_sample_project()
+        
+        result = self.analyzer.analyze_project(self.project_path)
+        numpy_info = result['libraries_info']['numpy']
+        
+        self.assertEqual(numpy_info['count'], 2)
+        self.assertEqual(
+            sorted(numpy_info['files']),
+            sorted([str(self.project_path / "main.py"),
+                    str(self.project_path / "pkg" / "utils.py")])
+        )
+        self.assertEqual(result['top_libraries'][0]['name'], 'numpy')
+    
+    def test_dependency_graph(self):
+        """Тест графа зависимостей"""
+        self.create_sample_project()
+        
+        result = self.analyzer.analyze_project(self.project_path)
+        graph = result['dependency_graph']
+        
+        self.assertEqual(graph['main.py'], ['numpy', 'pandas', 'requests'])
+        self.assertEqual(graph[str(Path('pkg') / 'utils.py')], ['numpy'])
+    
+    def test_dependency_graph_keeps_same_named_modules(self):
+        """Тест графа зависимостей для одноименных модулей"""
+        self.create_test_file("a/__init__.py", "import numpy\n")
+        self.create_test_file("b/__init__.py", "import requests\n")
+        
+        graph = self.analyzer.analyze_project(self.project_path)['dependency_graph']
+        
+        self.assertEqual(graph[str(Path('a') / '__init__.py')], ['numpy'])
+        self.assertEqual(graph[str(Path('b') / '__init__.py')], ['requests'])
+    
+    def test_repeated_analysis_does_not_accumulate(self):
+        """Тест повторного анализа без накопления результатов"""
+        self.create_sample_project()
+        
+        self.analyzer.analyze_project(self.project_path)
+        result = self.analyzer.analyze_project(self.project_path)
+        
+        self.assertEqual(len(result['files_analysis']), 3)
+        self.assertEqual(result['project_stats']['total_imports'], 4)
+    
+    def test_line_count_matches_text_mode(self):
+        """Тест подсчета строк при чтении файлов в бинарном режиме"""
+        sources = {
+            "unix.py": b"import os\nimport sys\n",
+            "windows.py": b"import os\r\nimport sys\r\nprint(os)",
+            "empty.py": b"",
+        }
+        for name, source in sources.items():
+            (self.project_path / name).write_bytes(source)
+        
+        result = self.analyzer.analyze_project(self.project_path)
+        lines = {Path(f['path']).name: f['lines'] for f in result['files_analysis']}
+        
+        for name, source in sources.items():
+            self.assertEqual(lines[name], len(source.decode('utf-8').splitlines()))
+        self.assertEqual(result['project_stats']['total_lines'], 5)
+    
+    def test_distribution_bucket_edges(self):
+        """Тест границ корзин распределений качества и сложности"""
+        from core.project_analyzer_core import FileAnalysis
+        
+        quality = self.analyzer._calculate_quality_distribution(
+            [0, 29.9, 30, 49.9, 50, 69.9, 70, 89.9, 90, 100]
+        )
+        self.assertEqual(quality, {'excellent': 2, 'good': 2, 'fair': 2, 'poor': 2, 'very_poor': 2})
+        self.assertEqual(sum(self.analyzer._calculate_quality_distribution([]).values()), 0)
+        
+        self.analyzer.files_analysis = [
+            FileAnalysis(path=str(i), lines=1, imports=[], complexity=c, quality_score=0.0, issues=[])
+            for i, c in enumerate([1, 5, 6, 10, 11, 20, 21, 30, 31, 100])
+        ]
+        complexity = self.analyzer._calculate_complexity_distribution()
+        self.assertEqual(complexity, {'very_low': 2, 'low': 2, 'medium': 2, 'high': 2, 'very_high': 2})
+    
+    def test_find_python_files_skips_excluded_dirs(self):
+        """Тест поиска Python файлов с исключением служебных директорий"""
+        self.create_sample_project()
+        self.create_test_file("venv/lib/site.py", "import os\n")
+        self.create_test_file("pkg/__pycache__/cached.py", "import os\n")
+        self.create_test_file(".hidden/secret.py", "import os\n")
+        self.create_test_file("build/lib/generated.py", "import os\n")
+        self.create_test_file("README.md", "# readme\n")
+        
+        found = self.analyzer._find_python_files(self.project_path)
+        
+        self.assertEqual(
+            sorted(found),
+            sorted([self.project_path / "main.py",
+                    self.project_path / "pkg" / "utils.py",
+                    self.project_path / "pkg" / "broken.py"])
+        )
+    
+    def test_get_file_analysis(self):
+        """Тест получения анализа файла по пути"""
+        self.create_sample_project()
+        
+        self.analyzer.analyze_project(self.project_path)
+        main_path = self.project_path / "main.py"
+        file_analysis = self.analyzer.get_file_analysis(main_path)
+        
+        self.assertIsNotNone(file_analysis)
+        self.assertEqual(file_analysis.path, str(main_path))
+        self.assertIs(file_analysis, self.analyzer.files_analysis[
+            [f.path for f in self.analyzer.files_analysis].index(str(main_path))
+        ])
+        self.assertIsNone(self.analyzer.get_file_analysis(self.project_path / "missing.py"))
+    
+    def test_single_walk_matches_analyzers(self):
+        """Тест совпадения результатов единого обхода AST с анализаторами"""
+        from core.complexity_analyzer import ComplexityAnalyzer
+        
+        self.create_sample_project()
+        main_path = self.project_path / "main.py"
+        content = main_path.read_text(encoding='utf-8')
+        
+        result = self.analyzer.analyze_project(self.project_path)
+        file_analysis = self.analyzer.get_file_analysis(main_path)
+        
+        expected = ComplexityAnalyzer().analyze_source(content, main_path)
+        self.assertEqual(file_analysis.complexity, expected.metrics.cyclomatic_complexity)
+        self.assertEqual(
+            file_analysis.quality_score,
+            self.analyzer.quality_analyzer.analyze_source(content, main_path).overall_score
+        )
+        self.assertEqual(result['dependency_graph']['main.py'],
+                         sorted(set(self.analyzer.import_parser.parse_imports(content, main_path))))
+    
+    def test_export_json_report(self):
+        """Тест экспорта отчета в JSON"""
+        import json
+        
+        self.create_sample_project()
+        result = self.analyzer.analyze_project(self.project_path)
+        output_path = self.temp_path / "report.json"
+        
+        self.analyzer.export_report(output_path, 'json')
+        
+        with open(output_path, 'r', encoding='utf-8') as f:
+            exported = json.load(f)
+        self.assertEqual(exported['project_stats'], result['project_stats'])
+        self.assertEqual(exported['libraries_info'], result['libraries_info'])
+        self.assertEqual(exported['files_analysis'], result['files_analysis'])
+    
+    def test_export_given_report(self):
+        """Тест экспорта готового отчета другим экземпляром анализатора"""
+        import json
+        
+        self.create_sample_project()
+        result = self.analyzer.analyze_project(self.project_path)
+        exporter = IntegratedProjectAnalyzer(self.analyzer.config)
+        json_path = self.temp_path / "report.json"
+        txt_path = self.temp_path / "report.txt"
+        
+        exporter.export_report(json_path, 'json', report=result)
+        exporter.export_report(txt_path, 'txt', report=result)
+        
+        with open(json_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), json.loads(json.dumps(result)))
+        self.assertIn("numpy", txt_path.read_text(encoding='utf-8'))
+    
+    def test_streaming_export_matches_json_dump(self):
+        """Тест совпадения потокового экспорта с json.dump"""
+        import json
+        
+        self.create_sample_project()
+        self.analyzer.analyze_project(self.project_path)
+        output_path = self.temp_path / "report.json"
+        
+        with patch('core.project_analyzer_core.time.time', return_value=1700000000.0):
+            expected = json.dumps(self.analyzer._generate_comprehensive_report(),
+                                  indent=2, ensure_ascii=False)
+            self.analyzer.export_report_streaming(output_path)
+        
+        self.assertEqual(output_path.read_text(encoding='utf-8'), expected)
+    
+    def test_scan_cache_reuses_unchanged_files(self):
+        """Тест повторного использования результатов неизмененных файлов"""
+        import os
+        from core import project_analyzer_core
+        
+        self.create_sample_project()
+        first = self.analyzer.analyze_project(self.project_path)
+        self.assertTrue((self.project_path / project_analyzer_core.SCAN_CACHE_FILE).exists())
+        
+        # Неизмененные файлы не анализируются повторно
+        messages = []
+        with patch.object(project_analyzer_core, 'analyze_file_source',
+                          wraps=project_analyzer_core.analyze_file_source) as analyze_mock:
+            second = self.analyzer.analyze_project(self.project_path, messages.append)
+        
+        analyzed = [Path(call.args[0]).name for call in analyze_mock.call_args_list]
+        self.assertEqual(analyzed, [])
+        self.assertIn("♻️ Без изменений (из кэша): 3 из 3 файлов", messages)
+        self.assertEqual(second['files_analysis'], first['files_analysis'])
+        self.assertEqual(second['libraries_info'], first['libraries_info'])
+        
+        # Измененный файл анализируется заново
+        utils_path = self.project_path / "pkg" / "utils.py"
+        utils_path.write_text("import requests\n", encoding='utf-8')
+        stat = os.stat(utils_path)
+        os.utime(utils_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        third = self.analyzer.analyze_project(self.project_path)
+        self.assertEqual(third['libraries_info']['numpy']['count'], 1)
+        self.assertEqual(third['libraries_info']['requests']['count'], 2)
+    
+    def test_project_files_signature_tracks_changes(self):
+        """Тест изменения сигнатуры файлов проекта"""
+        import os
+        from core.project_analyzer_core import project_files_signature
+        
+        self.create_sample_project()
+        signature = project_files_signature(self.project_path)
+        self.assertEqual(len(signature), 3)
+        self.assertEqual(project_files_signature(self.project_path), signature)
+        
+        # Служебные и не-Python файлы не влияют на сигнатуру
+        self.create_test_file("README.md", "# readme\n")
+        self.create_test_file("venv/lib/site.py", "import os\n")
+        self.assertEqual(project_files_signature(self.project_path), signature)
+        
+        utils_path = self.project_path / "pkg" / "utils.py"
+        stat = os.stat(utils_path)
+        os.utime(utils_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        touched = project_files_signature(self.project_path)
+        self.assertNotEqual(touched, signature)
+        
+        utils_path.rename(self.project_path / "pkg" / "helpers.py")
+        self.assertNotEqual(project_files_signature(self.project_path), touched)
+    
+    def test_progress_callback_is_throttled(self):
+        """Тест ограничения частоты сообщений о прогрессе"""
+        from core.project_analyzer_core import _throttle_progress
+        
+        messages = []
+        callback = _throttle_progress(messages.append, min_interval=3600)
+        
+        callback("🔍 Начинаю анализ проекта...")
+        callback("📁 Найдено 3 Python файлов")
+        callback("✅ Анализ завершен!")
+        
+        self.assertEqual(messages, ["🔍 Начинаю анализ проекта...", "✅ Анализ завершен!"])
+        self.assertIsNone(_throttle_progress(None))
+    
+    def test_parallel_analysis_matches_sequential(self):
+        """Тест совпадения параллельного и последовательного анализа"""
+        from core import project_analyzer_core
+        
+        self.create_sample_project()
+        self.analyzer.config.update_performance_config('cache_scan_results', False)
+        sequential = self.analyzer.analyze_project(self.project_path)
+        
+        with patch.object(project_analyzer_core, 'PARALLEL_MIN_FILES', 1), \
+                patch.object(project_analyzer_core, 'PARALLEL_CHUNK_SIZE', 1), \
+                patch('core.project_analyzer_core.os.cpu_count', return_value=2):
+            parallel = self.analyzer.analyze_project(self.project_path)
+        
+        parallel['project_stats'].pop('scan_duration')
+        sequential['project_stats'].pop('scan_duration')
+        self.assertEqual(parallel['project_stats'], sequential['project_stats'])
+        self.assertEqual(parallel['files_analysis'], sequential['files_analysis'])
+        self.assertEqual(parallel['dependency_graph'], sequential['dependency_graph'])
+
+
+if __name__ == '__main__':
+    unittest.main()
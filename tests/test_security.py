@@ -87,6 +87,19 @@ class TestSecurityValidator:
         assert not is_valid
         assert "path traversal" in message
     
+    def test_validate_file_path_normalizes_without_filesystem(self):
+        """Тест нормализации пути без разрешения символических ссылок"""
+        with patch('os.path.realpath') as realpath_mock:
+            is_valid, message = self.validator.validate_file_path(Path("pkg/sub/../../../setup.py"))
+            assert not is_valid
+            assert "path traversal" in message
+            
+            # '..' внутри корня сканирования устраняется нормализацией
+            is_valid, message = self.validator.validate_file_path(Path("pkg/../missing_module.py"))
+            assert message == "Файл не существует"
+        
+        realpath_mock.assert_not_called()
+    
     def test_validate_file_path_wrong_extension(self):
         """Тест валидации неправильного расширения"""
         with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as f:
@@ -107,6 +120,11 @@ class TestSecurityValidator:
         assert not is_valid
         assert "заблокированный паттерн" in message
     
+    def test_find_blocked_pattern(self):
+        """Тест поиска заблокированного паттерна в пути"""
+        assert self.validator._find_blocked_pattern("pkg/node_modules/mod.py") == "node_modules"
+        assert self.validator._find_blocked_pattern("pkg/module.py") is None
+    
     def test_validate_file_size_valid(self):
         """Тест валидации корректного размера файла"""
         with tempfile.NamedTemporaryFile(delete=False) as f:
@@ -135,6 +153,55 @@ class TestSecurityValidator:
             if temp_file.exists():
                 temp_file.unlink()
     
+    def test_validate_file_size_reuses_stat(self):
+        """Тест проверки размера по уже полученному stat"""
+        import os
+        
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(b"x" * 2048)
+            temp_file = Path(f.name)
+        
+        try:
+            file_stat = os.stat(temp_file)
+            with patch('core.security.os.stat') as stat_mock:
+                is_valid, message = self.validator.validate_file_size(temp_file, file_stat)
+            
+            stat_mock.assert_not_called()
+            assert not is_valid
+            assert "слишком большой" in message
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+    
+    def test_validate_file_size_total_across_threads(self):
+        """Тест общего лимита размера при проверке из нескольких потоков"""
+        import threading
+        
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(b"x" * 100)
+            temp_file = Path(f.name)
+        
+        try:
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(self.validator.validate_file_size(temp_file)))
+                for _ in range(30)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            # Лимит 2048 байт вмещает 20 файлов по 100 байт
+            assert sum(1 for is_valid, _ in results if is_valid) == 20
+            assert self.validator.total_size_processed == 2000
+            
+            self.validator.start_scan()
+            assert self.validator.total_size_processed == 0
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+    
     def test_validate_file_content_valid(self):
         """Тест валидации корректного содержимого"""
         content = "import os\nimport sys\n"
@@ -163,6 +230,122 @@ class TestSecurityValidator:
             if temp_file.exists():
                 temp_file.unlink()
     
+    def test_malicious_pattern_identifies_subpattern(self):
+        """Тест определения сработавшего паттерна в объединенном выражении"""
+        temp_file = Path("module.py")
+        cases = {
+            "x = 1\nos.system('ls')": r'os\.system\s*\(',
+            "import json\nSUBPROCESS.run(['ls'])": r'subprocess\..*\(',
+            "f = open('out.txt', 'w')": r'open\s*\(.*[\'"]w[\'"]',
+        }
+        
+        for content, expected in cases.items():
+            is_valid, message = self.validator.validate_file_content(content, temp_file)
+            assert not is_valid
+            assert message == f"Обнаружен подозрительный паттерн: {expected}"
+        
+        is_valid, message = self.validator.validate_file_content("print('ok')\n", temp_file)
+        assert is_valid
+    
+    def test_validate_file_content_line_length(self):
+        """Тест проверки длины строк"""
+        validator = SecurityValidator(SecurityConfig(max_line_length=100))
+        temp_file = Path("module.py")
+        
+        is_valid, message = validator.validate_file_content("x = 1\n" + "y" * 101 + "\nz = 2", temp_file)
+        assert not is_valid
+        assert message == "Строка 2 слишком длинная: 101 символов"
+        
+        is_valid, message = validator.validate_file_content("x = 1\n" + "y" * 101, temp_file)
+        assert message == "Строка 2 слишком длинная: 101 символов"
+        
+        is_valid, message = validator.validate_file_content("y" * 100 + "\n", temp_file)
+        assert is_valid
+    
+    def test_validate_file_content_parallel_pattern_scan(self):
+        """Тест поиска паттернов в отдельном потоке для больших файлов"""
+        validator = SecurityValidator(SecurityConfig(max_imports_per_file=2))
+        validator._parallel_pattern_scan = True
+        temp_file = Path("module.py")
+        
+        with patch('core.security.PARALLEL_CONTENT_SCAN_MIN_SIZE', 1):
+            is_valid, message = validator.validate_file_content("import a\nimport b\nimport c\nexec('x')\n", temp_file)
+            assert message == "Обнаружен подозрительный паттерн: exec\\s*\\("
+            
+            is_valid, message = validator.validate_file_content("import a\nimport b\nimport c\n", temp_file)
+            assert message == "Слишком много импортов: 3"
+            
+            is_valid, message = validator.validate_file_content("x = 1\n", temp_file)
+            assert is_valid
+    
+    def test_find_malicious_pattern_reports_same_pattern_for_all_engines(self):
+        """Тест одинакового паттерна от всех движков при совпадении двух паттернов"""
+        import re
+        from types import SimpleNamespace
+        from core import security
+        
+        validator = SecurityValidator(SecurityConfig())
+        eval_pattern = r'eval\s*\('
+        exec_pattern = r'exec\s*\('
+        # Паттерн exec встречается в тексте раньше, но eval стоит в списке первым
+        ascii_content = "exec('x')\neval('y')\n"
+        unicode_content = "# Проверка\n" + ascii_content
+        
+        assert validator._find_malicious_pattern(ascii_content) == eval_pattern
+        assert validator._find_malicious_pattern(unicode_content) == eval_pattern
+        
+        class FakeDatabase:
+            """Имитация базы hyperscan: совпадения сообщаются в порядке текста"""
+            
+            def scan(self, data, match_event_handler, scratch):
+                matches = sorted(
+                    (match.start(), index)
+                    for index, source in enumerate(validator._pattern_sources)
+                    for match in re.finditer(source.encode('utf-8'), data, re.IGNORECASE)
+                )
+                for start, index in matches:
+                    if match_event_handler(index, start, start, 0, None):
+                        raise fake_hyperscan.error("scan terminated")
+        
+        fake_hyperscan = SimpleNamespace(Scratch=lambda database: object(), error=RuntimeError)
+        validator._hs_db = FakeDatabase()
+        with patch.object(security, 'hyperscan', fake_hyperscan):
+            assert validator._find_malicious_pattern(ascii_content) == eval_pattern
+            assert validator._find_malicious_pattern("exec('x')\n") == exec_pattern
+    
+    def test_parallel_scan_skips_ascii_without_hyperscan(self):
+        """Тест поиска ASCII-текста в вызывающем потоке, если GIL отпускает только regex"""
+        from core import security
+        
+        validator = SecurityValidator(SecurityConfig())
+        validator._parallel_pattern_scan = False
+        validator._parallel_unicode_scan = True
+        
+        with patch('core.security.PARALLEL_CONTENT_SCAN_MIN_SIZE', 1), \
+                patch.object(security, '_get_scan_executor',
+                             wraps=security._get_scan_executor) as executor_mock:
+            assert validator.validate_file_content("x = 1\n", Path("module.py"))[0]
+            assert executor_mock.call_count == 0
+            
+            assert validator.validate_file_content("x = 'ё'\n", Path("module.py"))[0]
+            assert executor_mock.call_count == 1
+    
+    def test_validators_share_scan_executor(self):
+        """Тест общего пула поиска паттернов для всех валидаторов"""
+        from core import security
+        
+        validators = [SecurityValidator(SecurityConfig()) for _ in range(3)]
+        for validator in validators:
+            validator._parallel_pattern_scan = True
+        
+        with patch('core.security.PARALLEL_CONTENT_SCAN_MIN_SIZE', 1):
+            for validator in validators:
+                assert validator.validate_file_content("x = 1\n", Path("module.py"))[0]
+        
+        executor = security._get_scan_executor()
+        assert executor is security._get_scan_executor()
+        assert len(executor._threads) <= security.SCAN_EXECUTOR_MAX_WORKERS
+    
     def test_validate_file_content_too_many_imports(self):
         """Тест валидации слишком большого количества импортов"""
         content = "import os\n" * 1001  # Больше лимита в 1000
@@ -177,6 +360,22 @@ class TestSecurityValidator:
             if temp_file.exists():
                 temp_file.unlink()
     
+    def test_validate_file_content_import_count_boundary(self):
+        """Тест границы лимита импортов"""
+        validator = SecurityValidator(SecurityConfig(max_imports_per_file=3))
+        temp_file = Path("module.py")
+        
+        is_valid, _ = validator.validate_file_content("import a\nfrom b import c\n", temp_file)
+        assert is_valid
+        
+        is_valid, message = validator.validate_file_content("import a\nfrom b import c\nimport d\n", temp_file)
+        assert not is_valid
+        assert message == "Слишком много импортов: 4"
+        
+        # Содержимое короче 20 символов не может содержать больше 3 вхождений
+        is_valid, _ = validator.validate_file_content("from from from ", temp_file)
+        assert is_valid
+    
     def test_validate_imports_valid(self):
         """Тест валидации корректных импортов"""
         imports = ["os", "sys", "json"]
@@ -228,12 +427,39 @@ class TestSecurityValidator:
         assert "\x00" not in sanitized
         assert sanitized == "import os\n\nimport sys\n"
     
+    def test_sanitize_content_unicode(self):
+        """Тест санитизации непечатаемых символов Unicode"""
+        content = "name = 'é\u00a0x'\x7f\u200b \t\nvalue = 1\x0c\r"
+        sanitized = self.validator.sanitize_content(content)
+        
+        assert sanitized == "name = 'éx'\nvalue = 1\n"
+    
     def test_check_resource_limits(self):
         """Тест проверки лимитов ресурсов"""
         is_valid, message = self.validator.check_resource_limits()
         assert is_valid
         assert message == "OK"
     
+    def test_check_resource_limits_samples_memory(self):
+        """Тест выборочного замера памяти"""
+        process = MagicMock()
+        process.memory_info.return_value.rss = 100
+        self.validator._process = process
+        
+        with patch('core.security.time.monotonic', return_value=1000.0):
+            for _ in range(128):
+                is_valid, message = self.validator.check_resource_limits()
+                assert is_valid
+        
+        # Первый вызов и каждый 64-й
+        assert process.memory_info.call_count == 3
+        
+        process.memory_info.return_value.rss = 2 * 1024 * 1024 * 1024
+        with patch('core.security.time.monotonic', return_value=1001.0):
+            is_valid, message = self.validator.check_resource_limits()
+        assert not is_valid
+        assert "Превышено использование памяти" in message
+    
     def test_contains_path_traversal(self):
         """Тест обнаружения path traversal"""
         assert self.validator._contains_path_traversal("../etc/passwd")
@@ -241,6 +467,13 @@ class TestSecurityValidator:
         assert self.validator._contains_path_traversal("%2e%2e/etc/passwd")
         assert not self.validator._contains_path_traversal("normal/path")
     
+    def test_path_suffix_matches_pathlib(self):
+        """Тест совпадения расширения с Path.suffix"""
+        from core.security import _path_suffix
+        
+        for name in ["a.py", "dir/a.PY", ".py", "dir/.hidden", "a.", "dir.x/file", "a.b.c", "x"]:
+            assert _path_suffix(str(Path(name))) == Path(name).suffix
+    
     def test_is_valid_import_name(self):
         """Тест валидации имени импорта"""
         assert self.validator._is_valid_import_name("os")
@@ -305,6 +538,32 @@ class TestSecurityManager:
             if temp_file.exists():
                 temp_file.unlink()
     
+    def test_validate_files_matches_validate_file(self):
+        """Тест пакетной валидации файлов"""
+        import os
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            old_cwd = os.getcwd()
+            os.chdir(temp_dir)
+            try:
+                for name, size in [("a.py", 100), ("big.py", 2000), ("b.py", 1000), ("c.py", 1000)]:
+                    Path(name).write_bytes(b"x" * size)
+                Path("notes.txt").write_text("text")
+                paths = [Path(name) for name in ["a.py", "notes.txt", "missing.py", "big.py", "b.py", "c.py"]]
+                
+                sequential_manager = SecurityManager(self.config)
+                expected = [sequential_manager.validate_file(path) for path in paths]
+                batch_manager = SecurityManager(self.config)
+                results = batch_manager.validate_files(paths)
+                
+                assert results == expected
+                assert [is_valid for is_valid, _ in results] == [True, False, False, False, True, False]
+                assert results[5] == (False, "Превышен лимит общего размера файлов")
+                assert batch_manager.validator._total_files_processed == 2
+                assert batch_manager.validator.total_size_processed == 1100
+            finally:
+                os.chdir(old_cwd)
+    
     def test_validate_and_sanitize_content(self):
         """Тест валидации и санитизации содержимого"""
         content = "import os\x00\nimport sys\r\n"
@@ -343,7 +602,7 @@ class TestSecurityManager:
         
         try:
             file_hash = self.manager.get_file_hash(temp_file)
-            assert len(file_hash) == 32  # MD5 hash length
+            assert len(file_hash) == 64  # Длина хеша BLAKE3/SHA-256
             assert file_hash.isalnum()
             
             # Проверяем кэширование
@@ -353,6 +612,62 @@ class TestSecurityManager:
             if temp_file.exists():
                 temp_file.unlink()
     
+    def test_get_file_hash_large_file(self):
+        """Тест хеширования большого файла"""
+        import hashlib
+        from core import security
+        
+        content = b"import os\n" * 20000  # Больше MMAP_HASH_MIN_SIZE
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(content)
+            temp_file = Path(f.name)
+        
+        try:
+            if security.blake3 is None:
+                expected = hashlib.sha256(content).hexdigest()
+            else:
+                expected = security.blake3.blake3(content).hexdigest()
+            assert self.manager.get_file_hash(temp_file) == expected
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+    
+    def test_get_file_hash_without_file_digest(self):
+        """Тест хеширования SHA-256 блоками без hashlib.file_digest (Python < 3.11)"""
+        import hashlib
+        from types import SimpleNamespace
+        from unittest.mock import patch
+        from core import security
+        
+        content = b"import os\n" * 50000  # Больше HASH_CHUNK_SIZE
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(content)
+            temp_file = Path(f.name)
+        
+        try:
+            with patch.object(security, 'blake3', None), \
+                    patch.object(security, 'hashlib', SimpleNamespace(sha256=hashlib.sha256)):
+                file_hash = self.manager.get_file_hash(temp_file)
+            assert file_hash == hashlib.sha256(content).hexdigest()
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+    
+    def test_get_file_hash_counts_all_shards(self):
+        """Тест подсчета хешей во всех сегментах кэша"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for i in range(40):
+                path = Path(temp_dir) / f"module_{i}.py"
+                path.write_text(f"value = {i}\n")
+                paths.append(path)
+            
+            hashes = [self.manager.get_file_hash(path) for path in paths]
+            
+            assert len(set(hashes)) == 40
+            assert self.manager.get_security_report()["file_hashes_count"] == 40
+            assert [self.manager.get_file_hash(path) for path in paths] == hashes
+    
     def test_get_security_report(self):
         """Тест получения отчета о безопасности"""
         report = self.manager.get_security_report()
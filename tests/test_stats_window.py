@@ -0,0 +1,52 @@
+"""
+Тесты поиска импортов окна статистики
+"""
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Модуль окна требует PySide6, matplotlib с Qt backend и модуль utils
+stats_window = pytest.importorskip("gui.stats_window", exc_type=ImportError)
+
+
+class TestRegexTopLevelImports:
+    """Тесты поиска импортов регулярным выражением"""
+    
+    def test_plain_imports(self):
+        """Тест обычных строк импорта"""
+        data = b"import os, sys.path as p\nfrom collections.abc import Mapping\nfrom . import sibling\n"
+        assert stats_window._regex_top_level_imports(data) == {'os', 'sys', 'collections'}
+    
+    def test_semicolon_and_else(self):
+        """Тест импортов после ';' и ':'"""
+        data = b"x = 1; import json\ntry:\n    import ujson\nexcept ImportError: import yaml\nelse: import toml\n"
+        assert stats_window._regex_top_level_imports(data) == {'json', 'ujson', 'yaml', 'toml'}
+    
+    def test_comment_falls_back_to_ast(self):
+        """Тест отказа от регулярного выражения для импорта в комментарии"""
+        data = (b"import os\n"
+                b"# TODO: import json\n"
+                b"# Example: from requests import get\n"
+                b"def f(x):\n"
+                b"    return x  # note: import yaml\n")
+        assert stats_window._regex_top_level_imports(data) is None
+    
+    def test_string_falls_back_to_ast(self):
+        """Тест отказа от регулярного выражения для импорта в строке"""
+        assert stats_window._regex_top_level_imports(b"import os\ns = 'a: import json'\n") is None
+        assert stats_window._regex_top_level_imports(b'"""\n    import json\n"""\nimport os\n') is None
+    
+    def test_file_imports_match_ast(self, tmp_path):
+        """Тест совпадения результата с разбором AST"""
+        file_path = tmp_path / "module.py"
+        file_path.write_text("import os\n"
+                             "# TODO: import json\n"
+                             "# Example: from requests import get\n"
+                             "def f(x):\n"
+                             "    return x  # note: import yaml\n",
+                             encoding="utf-8")
+        
+        assert stats_window._file_top_level_imports(str(file_path)) == {'os'}
+        assert stats_window._file_top_level_imports(str(file_path), strict=True) == {'os'}